@@ -5,6 +5,18 @@ This module creates animated visualizations of the economic simulation using
 the Manim mathematical animation engine. It provides visual representations
 of agent behaviors, wealth distributions, and economic dynamics over time.
 
+Rendering is split into two passes. A headless data pass
+(src.trajectory.record_trajectory) runs the simulation and records compact
+per-frame arrays of balances, wealth colors and positions. The scene then
+builds one circle and one DecimalNumber per agent exactly once and drives
+them with updaters from a single frame ValueTracker, so render time scales
+with the number of frames rather than with per-step object churn.
+
+WealthDistributionScene is the population-scale mode: it renders the
+wealth distribution of a recorded run as a histogram plus a quantile point
+cloud (PMobject) whose sizes are fixed, so a 100k-agent run renders in about
+the same time as the 50-agent scene.
+
 The animation includes:
 - Visual representation of agents with wealth-based coloring
 - Real-time wealth updates and position changes
@@ -18,11 +30,18 @@ with the Manim command-line interface rather than as a standalone script.
 """
 from manim import *
 import numpy as np
+from typing import Optional
 from src.constants import *
-from src.models import Agent, Resource
-from src.simulation import run_simulation
+from src.trajectory import record_trajectory, load_trajectory, distribution_summary, interpolate_frame, WEALTH_POOR, WEALTH_MIDDLE, WEALTH_RICH
+
+ANIMATION_STEPS: int = 50
+SECONDS_PER_STEP: float = 0.8
+POPULATION_AGENTS: int = 100_000
 
 class EconomicSimulationScene(Scene):
+    # Optional .npz written by src.trajectory.save_trajectory; recorded on the fly if unset
+    trajectory_path: Optional[str] = None
+
     def construct(self):
         # Title
         title = Text("Agent-Based Economic Simulation", font_size=36)
@@ -30,26 +49,23 @@ class EconomicSimulationScene(Scene):
         self.play(title.animate.to_edge(UP))
         self.wait(1)
 
-        # Create simulation data
-        agents = [Agent(i) for i in range(NUM_AGENTS)]
-        resources = [Resource(i) for i in range(NUM_RESOURCES)]
-
-        if INITIAL_IMBALANCE:
-            for agent in agents:
-                if agent.agent_id < NUM_AGENTS * IMBALANCE_STRENGTH:
-                    agent.ctx_balance *= 2
-                else:
-                    agent.ctx_balance *= 0.5
-
-        # Create visual representations
-        agent_circles = VGroup()
-        wealth_texts = VGroup()
-        legend = VGroup()
+        # Data pass: record the whole run before rendering anything
+        if self.trajectory_path:
+            trajectory = load_trajectory(self.trajectory_path)
+        else:
+            trajectory = record_trajectory({}, num_steps=min(ANIMATION_STEPS, SIMULATION_STEPS))
+        balances = trajectory['balances']
+        alive = trajectory['alive']
+        wealth_colors = trajectory['colors']
+        positions = trajectory['positions']
+        num_steps = len(balances) - 1
 
         # Colors for different agent types
         colors = [BLUE, GREEN, RED, YELLOW, PURPLE]
+        bracket_colors = {WEALTH_POOR: RED, WEALTH_MIDDLE: YELLOW, WEALTH_RICH: GREEN}
 
         # Create legend
+        legend = VGroup()
         legend_title = Text("Agent Types:", font_size=20).to_edge(DOWN + LEFT)
         legend.add(legend_title)
         for i, agent_type in enumerate(["Producer", "Consumer", "Trader", "Banker", "Investor"]):
@@ -58,62 +74,54 @@ class EconomicSimulationScene(Scene):
             text.next_to(dot, RIGHT)
             legend.add(VGroup(dot, text).arrange(RIGHT).next_to(legend_title, DOWN, buff=0.2).shift(DOWN * i * 0.3))
 
-        # Create agent circles and wealth texts
-        for i, agent in enumerate(agents):
+        # Renderer: one reusable circle and counter per agent, driven by the frame tracker
+        frame = ValueTracker(0)
+        agent_circles = VGroup()
+        wealth_texts = VGroup()
+        for i in range(balances.shape[1]):
             circle = Circle(radius=0.3, color=colors[i % len(colors)], fill_opacity=0.6)
-            x_pos = np.random.uniform(-4, 4)
-            y_pos = np.random.uniform(-2, 2)
-            circle.move_to([x_pos, y_pos, 0])
-            agent_circles.add(circle)
-
-            wealth_text = Text(f"${agent.ctx_balance:.0f}", font_size=16)
+            circle.move_to([*positions[0, i], 0])
+            wealth_text = DecimalNumber(balances[0, i], num_decimal_places=0, font_size=16)
             wealth_text.next_to(circle, DOWN, buff=0.1)
+
+            def update_circle(mob, i=i):
+                t = frame.get_value()
+                step = min(int(np.ceil(t)), num_steps)
+                mob.move_to([*interpolate_frame(positions[:, i], t), 0])
+                if step > 0:
+                    mob.set_color(bracket_colors[int(wealth_colors[step, i])])
+                mob.set_opacity(0.6 if alive[step, i] else 0.0)
+
+            def update_wealth(mob, i=i, circle=circle):
+                t = frame.get_value()
+                step = min(int(np.ceil(t)), num_steps)
+                if alive[step, i]:
+                    mob.set_value(interpolate_frame(balances[:, i], t))
+                mob.next_to(circle, DOWN, buff=0.1)
+                mob.set_opacity(1.0 if alive[step, i] else 0.0)
+
+            circle.add_updater(update_circle)
+            wealth_text.add_updater(update_wealth)
+            agent_circles.add(circle)
             wealth_texts.add(wealth_text)
 
         self.play(Create(agent_circles), Create(wealth_texts), Create(legend))
         self.wait(2)
 
-        # Simulation loop
-        for step in range(min(50, SIMULATION_STEPS)):  # Show first 50 steps for animation
-            # Update simulation
-            from src.simulation import simulation_step
-            step_metrics = simulation_step(agents, resources, step, {})
-
-            # Update positions and wealth displays
-            animations = []
-            for i, (agent, circle, wealth_text) in enumerate(zip(agents, agent_circles, wealth_texts)):
-                # Move agents slightly
-                current_pos = circle.get_center()
-                move_vec = np.random.uniform(-0.5, 0.5, 2)
-                new_pos = [np.clip(current_pos[0] + move_vec[0], -6, 6),
-                          np.clip(current_pos[1] + move_vec[1], -3, 3),
-                          current_pos[2]]
-                animations.append(circle.animate.move_to(new_pos))
-
-                # Update wealth text
-                new_wealth = Text(f"${agent.ctx_balance:.0f}", font_size=16)
-                new_wealth.move_to(wealth_text.get_center())
-                animations.append(Transform(wealth_text, new_wealth))
-
-                # Update color based on wealth
-                if agent.ctx_balance > 1000:
-                    new_color = GREEN
-                elif agent.ctx_balance > 500:
-                    new_color = YELLOW
-                else:
-                    new_color = RED
-                animations.append(circle.animate.set_color(new_color))
-
-            self.play(*animations, run_time=0.5)
-
-            # Show step counter
-            step_text = Text(f"Step: {step + 1}", font_size=24).to_edge(DOWN + RIGHT)
-            self.add(step_text)
-            self.wait(0.3)
-            self.remove(step_text)
+        # Step counter
+        step_label = Text("Step:", font_size=24)
+        step_counter = Integer(0, font_size=24)
+        step_display = VGroup(step_label, step_counter).arrange(RIGHT).to_edge(DOWN + RIGHT)
+        step_counter.add_updater(lambda mob: mob.set_value(int(np.ceil(frame.get_value()))))
+        self.add(step_display)
+
+        # Simulation playback
+        self.play(frame.animate.set_value(num_steps), run_time=num_steps * SECONDS_PER_STEP, rate_func=linear)
 
         # Final statistics
-        self.play(FadeOut(agent_circles), FadeOut(wealth_texts), FadeOut(legend))
+        for mob in [*agent_circles, *wealth_texts, step_counter]:
+            mob.clear_updaters()
+        self.play(FadeOut(agent_circles), FadeOut(wealth_texts), FadeOut(legend), FadeOut(step_display))
 
         # Show final results
         results_title = Text("Final Results", font_size=36)
@@ -121,16 +129,17 @@ class EconomicSimulationScene(Scene):
         self.wait(1)
 
         # Calculate final statistics
-        final_wealths = [agent.ctx_balance for agent in agents]
+        final_wealths = balances[-1][alive[-1]]
         avg_wealth = np.mean(final_wealths)
         max_wealth = np.max(final_wealths)
         min_wealth = np.min(final_wealths)
+        num_bankruptcies = int(np.sum(alive[0]) - np.sum(alive[-1]))
 
         stats = VGroup(
             Text(f"Average Wealth: ${avg_wealth:.2f}", font_size=24),
             Text(f"Max Wealth: ${max_wealth:.2f}", font_size=24),
             Text(f"Min Wealth: ${min_wealth:.2f}", font_size=24),
-            Text(f"Total Transactions: {sim.total_transactions}", font_size=24)
+            Text(f"Bankruptcies: {num_bankruptcies}", font_size=24)
         ).arrange(DOWN, buff=0.3)
 
         self.play(Write(stats))
@@ -142,5 +151,87 @@ class EconomicSimulationScene(Scene):
         self.play(FadeOut(stats))
         self.wait(2)
 
+class WealthDistributionScene(Scene):
+    # Optional .npz written by src.trajectory.save_trajectory; recorded on the fly if unset
+    trajectory_path: Optional[str] = None
+    num_agents: int = POPULATION_AGENTS
+
+    def construct(self):
+        # Title
+        title = Text("Wealth Distribution", font_size=36).to_edge(UP)
+        self.play(Write(title))
+
+        # Data pass: only the balance array is needed at population scale
+        if self.trajectory_path:
+            trajectory = load_trajectory(self.trajectory_path)
+        else:
+            trajectory = record_trajectory({'num_agents': self.num_agents, 'engine': 'vectorized'}, num_steps=min(ANIMATION_STEPS, SIMULATION_STEPS), with_positions=False)
+        summary = distribution_summary(trajectory['balances'], trajectory['alive'])
+        edges = summary['edges']
+        density = summary['density']
+        quantiles = summary['quantiles']
+        levels = summary['quantile_levels']
+        num_steps = len(density) - 1
+
+        # Histogram (left) and sorted-balance point cloud (right)
+        hist_axes = Axes(
+            x_range=[edges[0], edges[-1], (edges[-1] - edges[0]) / 4],
+            y_range=[0, float(density.max()) * 1.1, float(density.max()) * 1.1 / 4],
+            x_length=5.5, y_length=4, tips=False
+        ).to_edge(LEFT).shift(DOWN * 0.3)
+        cloud_axes = Axes(
+            x_range=[0, 1, 0.25],
+            y_range=[edges[0], edges[-1], (edges[-1] - edges[0]) / 4],
+            x_length=5.5, y_length=4, tips=False
+        ).to_edge(RIGHT).shift(DOWN * 0.3)
+        labels = VGroup(
+            Text("Balance", font_size=18).next_to(hist_axes, DOWN),
+            Text("Population share", font_size=18).next_to(cloud_axes, DOWN)
+        )
+
+        frame = ValueTracker(0)
+        origin = hist_axes.c2p(edges[0], 0)
+        unit_x = hist_axes.c2p(edges[1], 0) - origin
+        unit_y = hist_axes.c2p(edges[0], 1) - origin
+        bars = VGroup(*[
+            Rectangle(width=np.linalg.norm(unit_x), height=0.001, stroke_width=0.5, fill_color=BLUE, fill_opacity=0.7)
+            for _ in range(len(edges) - 1)
+        ])
+
+        def update_bars(group):
+            heights = interpolate_frame(density, frame.get_value())
+            for b, bar in enumerate(group):
+                bar.stretch_to_fit_height(max(heights[b] * unit_y[1], 0.001))
+                bar.move_to(origin + unit_x * (b + 0.5), aligned_edge=DOWN)
+
+        cloud_origin = cloud_axes.c2p(0, edges[0])
+        cloud_x = cloud_axes.c2p(1, edges[0]) - cloud_origin
+        cloud_y = cloud_axes.c2p(0, edges[0] + 1) - cloud_origin
+
+        def cloud_points(t):
+            values = np.nan_to_num(interpolate_frame(quantiles, t), nan=edges[0]) - edges[0]
+            return cloud_origin + np.outer(levels, cloud_x) + np.outer(values, cloud_y)
+
+        cloud = PMobject(stroke_width=3)
+        cloud.add_points(cloud_points(0), color=YELLOW)
+        cloud.add_updater(lambda mob: mob.set_points(cloud_points(frame.get_value())))
+        update_bars(bars)
+        bars.add_updater(update_bars)
+
+        step_label = Text("Step:", font_size=24)
+        step_counter = Integer(0, font_size=24)
+        step_display = VGroup(step_label, step_counter).arrange(RIGHT).to_edge(DOWN + RIGHT)
+        step_counter.add_updater(lambda mob: mob.set_value(int(np.ceil(frame.get_value()))))
+        agent_label = Text(f"Agents: {int(summary['alive_count'][0]):,}", font_size=24).to_edge(DOWN + LEFT)
+
+        self.play(Create(hist_axes), Create(cloud_axes), FadeIn(labels), FadeIn(bars), FadeIn(cloud), FadeIn(step_display), FadeIn(agent_label))
+        self.play(frame.animate.set_value(num_steps), run_time=num_steps * SECONDS_PER_STEP, rate_func=linear)
+
+        for mob in (bars, cloud, step_counter):
+            mob.clear_updaters()
+        survivors = Text(f"Survivors: {int(summary['alive_count'][-1]):,}", font_size=24).next_to(agent_label, UP, aligned_edge=LEFT)
+        self.play(Write(survivors))
+        self.wait(2)
+
 if __name__ == "__main__":
-    pass  # This file is meant to be run with manim
\ No newline at end of file
+    pass  # This file is meant to be run with manim
@@ -0,0 +1,7 @@
+"""
+Agent-based economic simulation package.
+
+The package is importable without side effects: submodules, NumPy and
+optional dependencies are only loaded when a submodule is imported. Run
+``python -m src --help`` for the command line interface.
+"""
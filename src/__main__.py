@@ -0,0 +1,8 @@
+"""
+Command line entry point: ``python -m src [run|sweep|bench] ...``.
+"""
+import sys
+from .main import main
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,127 @@
+"""
+Benchmarks for simulation throughput and worker process startup.
+
+This module measures the two costs that dominate parameter sweeps: how fast
+a single simulation steps, and how long a freshly started worker process
+takes before it can run its first simulation. The latter depends heavily on
+the multiprocessing start method, since spawned workers re-import NumPy and
+the whole simulation module graph while forkserver workers are forked from
+a server that has already imported them (see
+experimentation.WORKER_PRELOAD_MODULES).
+
+It also compares the vectorized engine's two ways of computing the per-step
+Gini coefficient and median, exactly or through an InequalityTracker
+('inequality_bins'), so the tracker is only enabled where it is faster.
+
+Only the standard library is imported at module level so that the startup
+measurement is not skewed by this module itself.
+"""
+import multiprocessing
+import statistics
+import time
+from typing import Dict, Any, List, Optional
+
+def _worker_ready(connection) -> None:
+    """Worker entry point: imports the sweep worker module graph and reports when ready."""
+    from . import experimentation
+    connection.send(time.perf_counter())
+    connection.close()
+
+def measure_worker_startup(start_method: str, repeats: int = 5) -> Dict[str, float]:
+    """
+    Measures how long a worker process takes to start and import the sweep worker modules.
+
+    Args:
+        start_method (str): The multiprocessing start method to measure.
+        repeats (int): Number of workers to start.
+
+    Returns:
+        Dict[str, float]: Median, min and max startup seconds across repeats.
+    """
+    from .experimentation import worker_context
+    context = worker_context(start_method)
+    durations: List[float] = []
+    for _ in range(repeats):
+        receiver, sender = context.Pipe(duplex=False)
+        started = time.perf_counter()
+        process = context.Process(target=_worker_ready, args=(sender,))
+        process.start()
+        ready = receiver.recv()
+        process.join()
+        durations.append(ready - started)
+    return {'median': statistics.median(durations), 'min': min(durations), 'max': max(durations)}
+
+def time_simulation(params: Dict[str, Any], repeats: int = 3) -> Dict[str, float]:
+    """
+    Times run_simulation and reports simulation steps per second.
+
+    Args:
+        params (Dict[str, Any]): Simulation parameters, as accepted by run_simulation.
+        repeats (int): Number of runs to time.
+
+    Returns:
+        Dict[str, float]: Median seconds per run and steps per second.
+    """
+    from .constants import SIMULATION_STEPS
+    from .simulation import run_simulation
+    durations: List[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run_simulation(params)
+        durations.append(time.perf_counter() - started)
+    seconds = statistics.median(durations)
+    steps = params.get('simulation_steps', SIMULATION_STEPS)
+    return {'seconds_per_run': seconds, 'steps_per_second': steps / seconds if seconds else float('inf')}
+
+def time_inequality_metrics(params: Dict[str, Any], num_bins: int = 4096) -> Dict[str, float]:
+    """
+    Times the vectorized engine's per-step Gini and median, exactly and through the tracker.
+
+    Both are computed on the same population after every step of one run, so
+    the comparison excludes the rest of the step.
+
+    Args:
+        params (Dict[str, Any]): Simulation parameters for the vectorized engine.
+        num_bins (int): Bins of the tracker.
+
+    Returns:
+        Dict[str, float]: Median milliseconds per step of each path, the tracker's speedup,
+            and the largest Gini difference between them relative to the tracker's error bound.
+    """
+    import numpy as np
+    from .config import effective_config
+    from .helpers import calculate_gini_coefficient
+    from .inequality import InequalityTracker
+    from .network import build_trade_network
+    from .policy import PolicySchedule
+    from .vectorized import Population, ResourcePool, TypeTable, advance_step
+    config = effective_config(params)
+    rng = np.random.default_rng(config.get('seed'))
+    population = Population.initialize(config, rng)
+    resources, types = ResourcePool(config), TypeTable(config)
+    policy = PolicySchedule(params, config['simulation_steps'])
+    network = build_trade_network(config, rng=rng)
+    tracker = InequalityTracker([], num_bins=num_bins)
+    tracker.add(population.balance, population.agent_id)
+    exact_ms: List[float] = []
+    tracker_ms: List[float] = []
+    error_ratio = 0.0
+    for step in range(config['simulation_steps']):
+        advance_step(population, resources, types, config, step, policy, rng, network)
+        started = time.perf_counter()
+        gini = calculate_gini_coefficient(population.balance)
+        np.median(population.balance)
+        exact_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        tracker.assign(population.agent_id, population.balance)
+        tracked_gini = tracker.gini()
+        tracker.median()
+        tracker_ms.append((time.perf_counter() - started) * 1000)
+        error_ratio = max(error_ratio, abs(tracked_gini - gini) / max(tracker.gini_error_bound(), 1e-300))
+    exact, tracked = statistics.median(exact_ms), statistics.median(tracker_ms)
+    return {'exact_ms_per_step': exact, 'tracker_ms_per_step': tracked, 'speedup': exact / tracked if tracked else float('inf'), 'gini_error_ratio': error_ratio}
+
+def available_start_methods(requested: Optional[List[str]] = None) -> List[str]:
+    """Returns the requested start methods that this platform supports."""
+    supported = multiprocessing.get_all_start_methods()
+    return [method for method in (requested or supported) if method in supported]
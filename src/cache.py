@@ -0,0 +1,175 @@
+"""
+Content-addressed result cache for simulation runs.
+
+This module stores run_simulation results on local disk keyed by a hash of
+everything that determines them: the full effective configuration (every
+constant from the constants module with the run's overrides applied), the
+seed and a version hash of the simulation source code. Repeated and
+overlapping sweeps, for example the default configuration that appears in
+every single-axis sweep, therefore return instantly for points that have
+already been computed, and any code change invalidates old entries.
+
+Only seeded runs whose parameters serialize to JSON are cached: unseeded
+runs are not reproducible, and parameters such as callable schedules have no
+stable representation to key on. The cache directory is bounded in size and
+evicts least recently used entries; reads refresh an entry's modification
+time, which serves as its LRU stamp. The total size is tracked as entries are
+written, and the directory is only scanned when it exceeds the bound, at
+which point entries are evicted in one batch down to a lower watermark.
+"""
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from .config import effective_config
+from .simulation import run_simulation
+from .work_queue import to_jsonable
+
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+EVICT_TARGET_FRACTION: float = 0.75
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    """Returns a hash of every source file of the package, excluding its tests."""
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).parent
+    for path in sorted(package_dir.rglob("*.py")):
+        relative = path.relative_to(package_dir)
+        if relative.parts[0] == "tests":
+            continue
+        digest.update(relative.as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """
+    Computes the cache key for a run.
+
+    Args:
+        params (Dict[str, Any]): The run's parameters, including its 'seed'.
+
+    Returns:
+        str: A hex digest of the effective config, seed and code version.
+
+    Raises:
+        TypeError: If a parameter, such as a callable schedule, is not JSON-serializable.
+    """
+    payload = {'config': to_jsonable(effective_config(params)), 'code_version': code_version()}
+    encoded = json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+class ResultCache:
+    """
+    Represents a size-bounded on-disk LRU cache of simulation results.
+    """
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initializes the cache, creating its directory if needed.
+
+        Args:
+            directory (str): The cache directory.
+            max_bytes (int): Total size above which least recently used entries are evicted.
+        """
+        self.directory: Path = Path(directory)
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.total_bytes: int = sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """Returns the modification time, size and path of every entry."""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _path(self, key: str) -> Path:
+        """Returns the file that stores the given key."""
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached result for a key, or None, marking the entry as recently used."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Stores a result and evicts least recently used entries if over the size bound."""
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(to_jsonable(result), f)
+        try:
+            self.total_bytes -= path.stat().st_size
+        except FileNotFoundError:
+            pass
+        self.total_bytes += tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Removes least recently used entries until the cache fits within
+        EVICT_TARGET_FRACTION of max_bytes, so that the directory is only
+        scanned once per batch of writes rather than on every put.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TARGET_FRACTION
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self.total_bytes = total
+        return removed
+
+def cached_run_simulation(params: Dict[str, Any], cache: Optional[ResultCache]) -> Dict[str, Any]:
+    """
+    Runs the simulation through the result cache.
+
+    Unseeded runs are not reproducible and runs with parameters that cannot be
+    serialized into a cache key (such as callable schedules) always bypass the
+    cache.
+
+    Args:
+        params (Dict[str, Any]): Simulation parameters, as accepted by run_simulation.
+        cache (Optional[ResultCache]): The cache to use, or None to always run.
+
+    Returns:
+        Dict[str, Any]: The simulation results.
+    """
+    if cache is None or params.get('seed') is None:
+        return run_simulation(params)
+    try:
+        key = cache_key(params)
+    except TypeError:
+        return run_simulation(params)
+    result = cache.get(key)
+    if result is None:
+        result = run_simulation(params)
+        cache.put(key, result)
+    return result
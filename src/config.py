@@ -0,0 +1,24 @@
+"""
+Effective run configuration for the agent-based economic simulation.
+
+This module turns the defaults in the constants module into a params-style
+dictionary and applies a run's overrides to it. The array-backed engines
+read every setting from this dictionary instead of from module-level
+constants, so a run is fully described by its params.
+
+Key functionality includes:
+- The default configuration: every constant under its lowercase name
+- The effective configuration of a run: the defaults with its overrides applied
+"""
+from typing import Dict, Any
+from . import constants
+
+def default_config() -> Dict[str, Any]:
+    """Returns every simulation constant as a params-style dict with lowercase keys."""
+    return {name.lower(): value for name, value in vars(constants).items() if name.isupper()}
+
+def effective_config(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the default configuration with the given parameter overrides applied."""
+    config = default_config()
+    config.update(params)
+    return config
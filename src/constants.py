@@ -23,7 +23,38 @@ BANKRUPTCY_THRESHOLD: int = -50
 DYNAMIC_INCOME_MULTIPLIER: float = 0.1
 DYNAMIC_REGEN_MULTIPLIER: float = 0.001
 AGENT_INCOME_CEILING: float = 1.0
+DEMAND_MULTIPLIER: float = 0.1
 TAX_RATE: float = 0.02
 RESOURCE_CAPACITY_MULTIPLIER: float = 0.005
 INITIAL_IMBALANCE: bool = True
-IMBALANCE_STRENGTH: float = 0.5
\ No newline at end of file
+IMBALANCE_STRENGTH: float = 0.5
+ENGINE: str = "reference"
+PRECISION: str = "float64" # float dtype of the vectorized engine's state: "float64" or "float32"
+
+# --- Inequality Tracking ---
+INEQUALITY_BINS: int = 0 # bins of the vectorized engine's incremental per-step Gini/median; 0 computes them exactly
+
+# --- Agent Entry ---
+AGENT_ENTRY_RATE: float = 0.0 # expected new agents per step, as a fraction of num_agents
+
+# --- Trading Network ---
+TRADE_NETWORK: str = "none"
+TRADE_RATE: float = 0.01
+NETWORK_DEGREE: int = 6
+NETWORK_REWIRE_PROB: float = 0.1
+NETWORK_DEGREE_EXPONENT: float = 2.5
+
+# --- Regions ---
+NUM_REGIONS: int = 1
+REGION_FLOW_LIMIT: float = 0.1
+REGION_WORKERS: int = 0 # 0 uses one thread per CPU
+
+# --- Agent Types ---
+# Per-type parameter tables, indexed by type code. Type 0 is the baseline agent
+# of the reference engine; the default population consists of type 0 only.
+AGENT_TYPES: tuple = ("Producer", "Consumer", "Trader", "Banker", "Investor")
+AGENT_TYPE_SHARES: tuple = (1.0, 0.0, 0.0, 0.0, 0.0)
+AGENT_TYPE_INCOME_MULTIPLIER: tuple = (1.0, 0.8, 1.0, 1.4, 1.2)
+AGENT_TYPE_EXPENSE_MULTIPLIER: tuple = (1.0, 1.2, 0.9, 1.1, 0.8)
+AGENT_TYPE_DEMAND_ELASTICITY: tuple = (0.2, 0.3, 0.1, 0.15, 0.25)
+AGENT_TYPE_BANKRUPTCY_MULTIPLIER: tuple = (1.0, 0.6, 1.0, 2.0, 1.6) # of BANKRUPTCY_THRESHOLD
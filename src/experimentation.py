@@ -10,16 +10,28 @@ different conditions.
 The module includes:
 - Parameter range definitions for systematic testing
 - Experiment execution across parameter spaces
+- Coordinator/worker execution over a shared file-based work queue, with
+  work item IDs derived from each run's parameters so that a queue directory
+  can be reused across sweeps without mixing up their results
+- Optional reuse of previously computed seeded runs through a result cache
 - Result analysis and optimization identification
 - Logging of key findings and policy recommendations
 """
+import json
 import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
 import numpy as np
-from simulation import run_simulation
-from typing import Dict, Any, List
+from .cache import ResultCache, cached_run_simulation, cache_key
+from .work_queue import WorkQueue, DEFAULT_LEASE_SECONDS, to_jsonable
+from typing import Dict, Any, List, Optional, Sequence
 
-# --- Logging Configuration ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# --- Worker Processes ---
+# Modules a forkserver imports once so each forked worker starts with them loaded
+WORKER_PRELOAD_MODULES: List[str] = ['numpy', 'src.experimentation']
 
 # --- Parameter Experimentation ---
 param_ranges: Dict[str, np.ndarray] = {
@@ -31,22 +43,247 @@ param_ranges: Dict[str, np.ndarray] = {
 
 experiment_results: Dict[str, List[Dict[str, Any]]] = {}
 
-def run_experiments():
-    """Run all parameter experiments."""
-    logging.info("Starting parameter experimentation...")
+def work_item_id(prefix: str, params: Dict[str, Any], position: str) -> str:
+    """
+    Returns the work item ID of a run.
+
+    The ID ends in the run's cache key, a hash of its effective configuration,
+    seed and code version. A queue only skips items that already have a result
+    shard, so items of a different sweep, or of the same sweep after a code
+    change, never pick up each other's results. Runs of the same configuration
+    and seed share an ID, so they are run once per batch or queue directory.
+
+    Parameters that cannot be hashed, such as callable schedules, cannot be
+    sent through a work queue either. Such a run gets the positional ID
+    prefix-position instead, which is only unique within its batch and is
+    rejected by run_work_items when a queue_dir is given.
+
+    Args:
+        prefix (str): A readable prefix, such as the swept parameter name. Must not contain '.'.
+        params (Dict[str, Any]): The run's parameters, including its seed.
+        position (str): The run's position in its batch, used when params cannot be hashed.
+
+    Returns:
+        str: The work item ID.
+    """
+    try:
+        return f"{prefix}-{cache_key(params)[:24]}"
+    except TypeError:
+        return f"{prefix}-{position}"
 
+def build_work_items(base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[Optional[int]] = (None,)) -> List[Dict[str, Any]]:
+    """
+    Expands param_ranges into one work item per parameter point and seed.
+
+    Args:
+        base_params (Optional[Dict[str, Any]]): Parameters applied to every point before the swept one.
+        seeds (Sequence[Optional[int]]): Seeds to run each point with; None leaves a run unseeded.
+
+    Returns:
+        List[Dict[str, Any]]: Work items with an 'id', 'param_name', 'param_value' and full 'params'.
+    """
+    items = []
     for param_name, param_values in param_ranges.items():
-        # logging.info(f"Experimenting with {param_name}...")
-        experiment_results[param_name] = []
-        for value in param_values:
-            params: Dict[str, Any] = {param_name: value}
-            # logging.info(f"Running simulation with {param_name} = {value}")
-            results: Dict[str, Any] = run_simulation(params)
-            results['param_value'] = value
-            experiment_results[param_name].append(results)
-
-def analyze_results():
-    """Analyze and log the results."""
+        for index, value in enumerate(param_values):
+            for seed_index, seed in enumerate(seeds):
+                params: Dict[str, Any] = dict(base_params or {})
+                params[param_name] = value
+                if seed is not None:
+                    params['seed'] = seed
+                items.append(to_jsonable({
+                    'id': work_item_id(param_name, params, f"{index:04d}-{seed_index:04d}"),
+                    'param_name': param_name,
+                    'param_value': value,
+                    'params': params
+                }))
+    return items
+
+def run_experiments(base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[Optional[int]] = (None,), queue_dir: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS, poll_interval: float = 1.0, local_workers: int = 0, start_method: Optional[str] = None, cache_dir: Optional[str] = None):
+    """
+    Run all parameter experiments.
+
+    Without a queue_dir every point is simulated in this process. With a
+    queue_dir this process acts as the coordinator: it enqueues one work item
+    per point and seed, waits for workers (see run_worker) to produce result
+    shards while re-leasing items from crashed workers, and then merges the
+    shards into experiment_results.
+
+    Args:
+        base_params (Optional[Dict[str, Any]]): Parameters applied to every point before the swept one.
+        seeds (Sequence[Optional[int]]): Seeds to run each point with; None leaves a run unseeded.
+        queue_dir (Optional[str]): Shared work queue directory for distributed execution.
+        lease_seconds (float): Seconds without a heartbeat after which a claimed item is re-leased.
+        poll_interval (float): Seconds between coordinator progress checks.
+        local_workers (int): Worker processes to start on this machine once the items are enqueued.
+        start_method (Optional[str]): Multiprocessing start method for local workers (see worker_context).
+        cache_dir (Optional[str]): Result cache directory; seeded points already in it are not re-run.
+    """
+    logging.info("Starting parameter experimentation...")
+    items = build_work_items(base_params, seeds)
+    results_by_id = run_work_items(items, queue_dir, lease_seconds, poll_interval, local_workers, start_method, cache_dir)
+    experiment_results.clear()
+    for item in items:
+        results: Dict[str, Any] = dict(results_by_id[item['id']])
+        results['param_value'] = item['param_value']
+        experiment_results.setdefault(item['param_name'], []).append(results)
+
+def run_work_items(items: List[Dict[str, Any]], queue_dir: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS, poll_interval: float = 1.0, local_workers: int = 0, start_method: Optional[str] = None, cache_dir: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs a batch of work items, in this process or through a work queue.
+
+    Args:
+        items (List[Dict[str, Any]]): Work items with a unique 'id' and the run's 'params'.
+        queue_dir (Optional[str]): Shared work queue directory; None runs every item in this process.
+        lease_seconds (float): Seconds without a heartbeat after which a claimed item is re-leased.
+        poll_interval (float): Seconds between coordinator progress checks.
+        local_workers (int): Worker processes to start on this machine once the items are enqueued.
+        start_method (Optional[str]): Multiprocessing start method for local workers (see worker_context).
+        cache_dir (Optional[str]): Result cache directory; seeded items already in it are not re-run.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The results of each item, by item ID; items sharing an ID are run once.
+
+    Raises:
+        TypeError: If queue_dir is given and an item's params cannot be serialized to JSON,
+            for example because of a callable schedule.
+    """
+    if queue_dir is None:
+        cache = ResultCache(cache_dir) if cache_dir else None
+        results_by_id: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            if item['id'] not in results_by_id:
+                results_by_id[item['id']] = cached_run_simulation(item['params'], cache)
+        return results_by_id
+
+    for item in items:
+        try:
+            json.dumps(item['params'])
+        except TypeError as e:
+            raise TypeError(f"Work item {item['id']} cannot be sent through the work queue in {queue_dir}: {e}. "
+                            "Callable schedules only work in-process; pass them as lists or dicts, or run without queue_dir") from None
+    queue = WorkQueue(queue_dir, lease_seconds)
+    added = queue.enqueue(items)
+    logging.info(f"Enqueued {added} of {len(items)} work items in {queue_dir}")
+    workers = start_workers(queue_dir, local_workers, start_method, lease_seconds, cache_dir)
+    item_ids = [item['id'] for item in items]
+    while not queue.is_complete(item_ids):
+        queue.requeue_stale()
+        time.sleep(poll_interval)
+    for worker in workers:
+        worker.join()
+    return {shard['item']['id']: shard['result'] for shard in queue.load_results(item_ids)}
+
+def run_worker(queue_dir: str, worker_id: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS, poll_interval: float = 1.0, exit_when_idle: bool = True, cache_dir: Optional[str] = None) -> int:
+    """
+    Claims and runs work items from a shared queue until it is drained.
+
+    A background thread renews the lease on the current item while the
+    simulation runs, so long runs are not mistaken for crashed workers.
+
+    Args:
+        queue_dir (str): Shared work queue directory.
+        worker_id (Optional[str]): Identifier used in claim files; defaults to host and process id.
+        lease_seconds (float): Seconds without a heartbeat after which a claimed item is re-leased.
+        poll_interval (float): Seconds to wait before polling an empty queue again.
+        exit_when_idle (bool): Whether to return once no items are pending or leased.
+        cache_dir (Optional[str]): Result cache directory on this worker's machine.
+
+    Returns:
+        int: The number of items this worker completed.
+    """
+    worker_id = worker_id or f"{socket.gethostname().replace('.', '_')}-{os.getpid()}"
+    queue = WorkQueue(queue_dir, lease_seconds)
+    cache = ResultCache(cache_dir) if cache_dir else None
+    completed = 0
+    while True:
+        queue.requeue_stale()
+        claimed = queue.claim(worker_id)
+        if claimed is None:
+            if exit_when_idle and queue.num_claimed() == 0:
+                return completed
+            time.sleep(poll_interval)
+            continue
+        claim_path, item = claimed
+        done = threading.Event()
+
+        def renew_lease():
+            while not done.wait(lease_seconds / 3):
+                queue.heartbeat(claim_path)
+
+        heartbeat_thread = threading.Thread(target=renew_lease, daemon=True)
+        heartbeat_thread.start()
+        try:
+            results = cached_run_simulation(item['params'], cache)
+        finally:
+            done.set()
+            heartbeat_thread.join()
+        queue.complete(claim_path, item, results)
+        completed += 1
+
+def worker_context(start_method: Optional[str] = None) -> multiprocessing.context.BaseContext:
+    """
+    Returns a multiprocessing context for sweep workers.
+
+    For the forkserver start method the worker module graph (NumPy and the
+    simulation) is preloaded into the server, so each worker is forked with
+    it already imported instead of re-importing it like a spawned worker.
+
+    Args:
+        start_method (Optional[str]): 'spawn', 'forkserver', 'fork' or None for the platform default.
+
+    Returns:
+        multiprocessing.context.BaseContext: The configured context.
+    """
+    context = multiprocessing.get_context(start_method)
+    if context.get_start_method() == 'forkserver':
+        context.set_forkserver_preload(WORKER_PRELOAD_MODULES)
+    return context
+
+def start_workers(queue_dir: str, num_workers: int, start_method: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS, cache_dir: Optional[str] = None) -> List[multiprocessing.process.BaseProcess]:
+    """Starts num_workers local run_worker processes on a work queue and returns them."""
+    context = worker_context(start_method)
+    workers = [context.Process(target=run_worker, args=(queue_dir, f"local-{os.getpid()}-{i}", lease_seconds), kwargs={'cache_dir': cache_dir}) for i in range(num_workers)]
+    for worker in workers:
+        worker.start()
+    return workers
+
+def merge_results(queue_dir: str, base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[Optional[int]] = (None,)) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Merges the result shards of one sweep in a work queue into experiment_results.
+
+    Only the shards of the sweep's own work items are merged; shards of other
+    sweeps that used the same queue directory are ignored.
+
+    Args:
+        queue_dir (str): Shared work queue directory.
+        base_params (Optional[Dict[str, Any]]): The sweep's base parameters, as passed to run_experiments.
+        seeds (Sequence[Optional[int]]): The sweep's seeds, as passed to run_experiments.
+
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: experiment_results, with the sweep's points in order.
+    """
+    items = build_work_items(base_params, seeds)
+    results_by_id = {shard['item']['id']: shard['result'] for shard in WorkQueue(queue_dir).load_results([item['id'] for item in items])}
+    experiment_results.clear()
+    for item in items:
+        if item['id'] not in results_by_id:
+            continue
+        results: Dict[str, Any] = dict(results_by_id[item['id']])
+        results['param_value'] = item['param_value']
+        experiment_results.setdefault(item['param_name'], []).append(results)
+    return experiment_results
+
+def analyze_results(queue_dir: Optional[str] = None, base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[Optional[int]] = (None,)):
+    """
+    Analyze and log the results.
+
+    Args:
+        queue_dir (Optional[str]): If given, the sweep's result shards from this work queue are merged first.
+        base_params (Optional[Dict[str, Any]]): The sweep's base parameters, used to select its shards.
+        seeds (Sequence[Optional[int]]): The sweep's seeds, used to select its shards.
+    """
+    if queue_dir is not None:
+        merge_results(queue_dir, base_params, seeds)
     logging.info("Performing further analysis...")
 
     if 'tax_rate' in experiment_results:
@@ -62,5 +299,6 @@ def analyze_results():
     logging.info("Experimentation and analysis complete.")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     run_experiments()
     analyze_results()
\ No newline at end of file
@@ -0,0 +1,258 @@
+"""
+Golden-trajectory regression harness for alternative simulation engines.
+
+This module records seeded trajectories of the object-based reference loop
+(simulation.py) and checks any alternative engine against them, so that a
+faster engine can be adopted only once it reproduces the reference
+behaviour. The engines do not share random streams once resources are
+allocated (the reference loop shuffles agents with the random module, the
+array engines draw from NumPy), so a trajectory is compared in two ways:
+
+Key functionality includes:
+- Exact checks of the deterministic phases: the initial state of every seed,
+  and a whole run of DETERMINISTIC_PARAMS, where no agent demands resources
+  or pays random expenses, so allocation order no longer matters
+- Distributional checks of the shuffled phases: two-sample Kolmogorov-Smirnov
+  tests across seeds of per-step Gini, mean balance, mean price and total
+  load at CHECKPOINT_FRACTIONS of the run, and of the pooled final balances
+- The measured speedup of the candidate over the reference, with a few
+  reference runs timed alongside the candidate on the same machine
+
+Golden trajectories are saved as ``.npz`` files together with the code
+version they were recorded with, so a suite can reuse them instead of
+re-running the slow reference loop every time. Loading a golden recorded
+with a different code version logs a warning, or fails in strict mode,
+since the reference it captured may have changed since. Only the parameters
+the reference loop honours (see simulation.run_simulation, which records the
+golden with engine='reference') should be set in a golden recording.
+"""
+import json
+import logging
+import time
+import numpy as np
+from typing import Dict, Any, Optional, Sequence, Tuple, Callable
+
+from .cache import code_version
+from .trajectory import record_trajectory
+
+GOLDEN_PARAMS: Dict[str, Any] = {'simulation_steps': 100}
+GOLDEN_SEEDS: Tuple[int, ...] = tuple(range(20))
+# Scenario in which both engines are fully deterministic after initialization
+DETERMINISTIC_PARAMS: Dict[str, Any] = {'demand_multiplier': 0.0, 'agent_expense_rate': 0.0}
+# Largest relative difference (floored at an absolute scale of 1) accepted by the exact checks
+EXACT_TOLERANCE: float = 1e-9
+# Family-wise significance level of the KS tests, Bonferroni-corrected across tests
+KS_ALPHA: float = 0.01
+CHECKPOINT_FRACTIONS: Tuple[float, ...] = (0.25, 0.5, 0.75, 1.0)
+TRAJECTORY_KEYS: Tuple[str, ...] = ('balances', 'prices', 'loads', 'gini')
+# Seeds of the reference loop re-timed by validate_engine to measure the speedup
+TIMING_SEEDS: int = 3
+
+Recorder = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+def default_recorder(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Records a trajectory with record_trajectory, without the animation positions."""
+    return record_trajectory(params, with_positions=False)
+
+def _timed_run(recorder: Recorder, params: Dict[str, Any]) -> Tuple[Dict[str, np.ndarray], float]:
+    """Records one run and returns its golden arrays and the seconds it took."""
+    started = time.perf_counter()
+    trajectory = recorder(params)
+    seconds = time.perf_counter() - started
+    arrays = {key: np.asarray(trajectory[key], dtype=np.float64) for key in TRAJECTORY_KEYS if key != 'gini'}
+    arrays['gini'] = np.array([metrics['gini'] for metrics in trajectory['step_metrics']], dtype=np.float64)
+    return arrays, seconds
+
+def record_runs(params: Dict[str, Any], seeds: Sequence[int], recorder: Recorder = default_recorder) -> Dict[str, Any]:
+    """
+    Records one seeded trajectory per seed and a run of the deterministic scenario.
+
+    Args:
+        params (Dict[str, Any]): Simulation parameters, including the engine.
+        seeds (Sequence[int]): Seeds of the stochastic runs; the first also seeds the deterministic run.
+        recorder (Recorder): Returns a trajectory dict with 'balances', 'prices', 'loads' and
+            'step_metrics' for a params dict, as record_trajectory does.
+
+    Returns:
+        Dict[str, Any]: Per-seed arrays stacked along a leading seed axis under TRAJECTORY_KEYS,
+            the deterministic run under 'deterministic_<key>', and the seconds of every
+            stochastic run under 'seconds'.
+    """
+    runs, seconds = [], []
+    for seed in seeds:
+        arrays, elapsed = _timed_run(recorder, dict(params, seed=seed))
+        runs.append(arrays)
+        seconds.append(elapsed)
+    recorded: Dict[str, Any] = {key: np.stack([run[key] for run in runs]) for key in TRAJECTORY_KEYS}
+    deterministic, _ = _timed_run(recorder, dict(params, seed=seeds[0], **DETERMINISTIC_PARAMS))
+    recorded.update({f"deterministic_{key}": value for key, value in deterministic.items()})
+    recorded['seconds'] = np.array(seconds)
+    return recorded
+
+def record_golden(params: Optional[Dict[str, Any]] = None, seeds: Sequence[int] = GOLDEN_SEEDS) -> Dict[str, Any]:
+    """
+    Records golden trajectories with the reference engine.
+
+    Args:
+        params (Optional[Dict[str, Any]]): Parameters of the runs; defaults to GOLDEN_PARAMS.
+        seeds (Sequence[int]): Seeds of the stochastic runs.
+
+    Returns:
+        Dict[str, Any]: The arrays of record_runs plus 'params', 'seeds' and 'code_version'.
+    """
+    params = dict(GOLDEN_PARAMS if params is None else params, engine='reference')
+    golden = record_runs(params, seeds)
+    golden.update(params=params, seeds=np.array(seeds), code_version=code_version())
+    return golden
+
+def save_golden(path: str, golden: Dict[str, Any]) -> None:
+    """Saves golden trajectories to a compressed .npz file."""
+    arrays = {key: value for key, value in golden.items() if isinstance(value, np.ndarray)}
+    np.savez_compressed(path, params=np.array(json.dumps(golden['params'])), code_version=np.array(golden['code_version']), **arrays)
+
+def load_golden(path: str, strict: bool = False) -> Dict[str, Any]:
+    """
+    Loads golden trajectories saved by save_golden.
+
+    Args:
+        path (str): The .npz file.
+        strict (bool): Raise instead of warning if the golden was recorded with a different code version.
+
+    Returns:
+        Dict[str, Any]: The golden trajectories, as returned by record_golden.
+
+    Raises:
+        ValueError: If strict and the recorded code version differs from the current one.
+    """
+    with np.load(path) as data:
+        golden: Dict[str, Any] = {key: data[key] for key in data.files}
+    golden['params'] = json.loads(str(golden['params']))
+    golden['code_version'] = str(golden['code_version'])
+    if golden['code_version'] != code_version():
+        message = f"Golden {path} was recorded with code version {golden['code_version']}, but the current code version is {code_version()}"
+        if strict:
+            raise ValueError(message)
+        logging.warning(f"{message}; re-record it if the reference loop has changed")
+    return golden
+
+def exact_error(expected: np.ndarray, actual: np.ndarray) -> float:
+    """
+    Returns the largest difference between two arrays, relative to the expected magnitude floored at 1.
+
+    NaN entries (bankrupt agents) must coincide; a mismatch in shape or NaN pattern is an infinite error.
+    """
+    if expected.shape != actual.shape:
+        return float('inf')
+    missing = np.isnan(expected)
+    if not np.array_equal(missing, np.isnan(actual)):
+        return float('inf')
+    if missing.all():
+        return 0.0
+    difference = np.abs(expected[~missing] - actual[~missing]) / np.maximum(np.abs(expected[~missing]), 1.0)
+    return float(difference.max())
+
+def kolmogorov_survival(statistic: float) -> float:
+    """Returns P(K > statistic) for the Kolmogorov distribution."""
+    if statistic < 0.2:
+        return 1.0
+    terms = np.arange(1, 101)
+    series = 2.0 * np.sum((-1.0) ** (terms - 1) * np.exp(-2.0 * terms ** 2 * statistic ** 2))
+    return float(min(max(series, 0.0), 1.0))
+
+def ks_2samp(first: np.ndarray, second: np.ndarray) -> Tuple[float, float]:
+    """
+    Two-sample Kolmogorov-Smirnov test.
+
+    Args:
+        first (np.ndarray): The first sample.
+        second (np.ndarray): The second sample.
+
+    Returns:
+        Tuple[float, float]: The KS statistic (largest distance between the empirical CDFs)
+            and its asymptotic p-value, with the small-sample correction of Stephens (1970).
+    """
+    first, second = np.sort(np.ravel(first)), np.sort(np.ravel(second))
+    values = np.concatenate((first, second))
+    distance = np.abs(np.searchsorted(first, values, side='right') / len(first) - np.searchsorted(second, values, side='right') / len(second))
+    statistic = float(distance.max())
+    effective = np.sqrt(len(first) * len(second) / (len(first) + len(second)))
+    return statistic, kolmogorov_survival((effective + 0.12 + 0.11 / effective) * statistic)
+
+def distribution_samples(runs: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Extracts the per-seed samples compared by the distributional checks.
+
+    Args:
+        runs (Dict[str, Any]): Arrays as returned by record_runs.
+
+    Returns:
+        Dict[str, np.ndarray]: One sample per check name: across seeds at every checkpoint step,
+            plus the pooled balances of all surviving agents at the end of the run.
+    """
+    num_steps = runs['gini'].shape[1]
+    samples: Dict[str, np.ndarray] = {}
+    for fraction in CHECKPOINT_FRACTIONS:
+        step = max(int(round(fraction * num_steps)), 1)
+        samples[f"gini@{step}"] = runs['gini'][:, step - 1]
+        samples[f"mean_balance@{step}"] = np.nanmean(runs['balances'][:, step], axis=1)
+        samples[f"mean_price@{step}"] = runs['prices'][:, step].mean(axis=1)
+        samples[f"total_load@{step}"] = runs['loads'][:, step].sum(axis=1)
+    final = runs['balances'][:, -1]
+    samples['final_balances'] = final[~np.isnan(final)]
+    return samples
+
+def validate_engine(golden: Dict[str, Any], engine_params: Optional[Dict[str, Any]] = None, recorder: Recorder = default_recorder,
+                    exact_tolerance: float = EXACT_TOLERANCE, alpha: float = KS_ALPHA, timing_seeds: int = TIMING_SEEDS) -> Dict[str, Any]:
+    """
+    Checks an alternative engine against golden reference trajectories.
+
+    Args:
+        golden (Dict[str, Any]): Golden trajectories from record_golden or load_golden.
+        engine_params (Optional[Dict[str, Any]]): Parameters selecting the candidate, applied over
+            the golden parameters; defaults to the vectorized engine.
+        recorder (Recorder): Records a candidate trajectory; engines that record_trajectory does
+            not know can be validated by passing their own recorder.
+        exact_tolerance (float): Largest error accepted by the exact checks.
+        alpha (float): Family-wise significance level of the KS tests.
+        timing_seeds (int): Number of seeds on which the reference loop is re-timed for the
+            speedup. With 0, the seconds stored in the golden are used instead; they may come
+            from another machine or code version, which 'reference_timing' then reports.
+
+    Returns:
+        Dict[str, Any]: The 'exact' error per deterministic check, the KS 'statistic' and
+            'p_value' per 'distribution' check, 'exact_passed', 'distribution_passed' and
+            'passed', the median 'reference_seconds', 'candidate_seconds' and 'speedup' over
+            the timed seeds, and 'reference_timing' ('measured' or 'recorded').
+    """
+    params = dict(golden['params'], **({'engine': 'vectorized'} if engine_params is None else engine_params))
+    seeds = [int(seed) for seed in golden['seeds']]
+    candidate = record_runs(params, seeds, recorder)
+    exact: Dict[str, float] = {}
+    for key in ('balances', 'prices', 'loads'):
+        exact[f"initial_{key}"] = exact_error(golden[key][:, 0], candidate[key][:, 0])
+    for key in TRAJECTORY_KEYS:
+        exact[f"deterministic_{key}"] = exact_error(golden[f"deterministic_{key}"], candidate[f"deterministic_{key}"])
+    expected_samples, candidate_samples = distribution_samples(golden), distribution_samples(candidate)
+    distribution: Dict[str, Dict[str, float]] = {}
+    for name, expected in expected_samples.items():
+        statistic, p_value = ks_2samp(expected, candidate_samples[name])
+        distribution[name] = {'statistic': statistic, 'p_value': p_value}
+    corrected_alpha = alpha / len(distribution)
+    if timing_seeds > 0:
+        timed = seeds[:timing_seeds]
+        reference_seconds = float(np.median([_timed_run(default_recorder, dict(golden['params'], seed=seed))[1] for seed in timed]))
+        candidate_seconds = float(np.median(candidate['seconds'][:len(timed)]))
+    else:
+        reference_seconds, candidate_seconds = float(np.median(golden['seconds'])), float(np.median(candidate['seconds']))
+    report: Dict[str, Any] = {
+        'exact': exact,
+        'distribution': distribution,
+        'exact_passed': all(error <= exact_tolerance for error in exact.values()),
+        'distribution_passed': all(entry['p_value'] >= corrected_alpha for entry in distribution.values()),
+        'reference_seconds': reference_seconds,
+        'candidate_seconds': candidate_seconds,
+        'speedup': reference_seconds / candidate_seconds if candidate_seconds else float('inf'),
+        'reference_timing': 'measured' if timing_seeds > 0 else 'recorded'
+    }
+    report['passed'] = report['exact_passed'] and report['distribution_passed']
+    return report
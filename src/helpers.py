@@ -17,9 +17,9 @@ Key functionality includes:
 """
 import numpy as np
 import random
-from .constants import DEALLOCATION_RATE, TAX_RATE
+from .constants import DEALLOCATION_RATE, TAX_RATE, AGENT_INCOME_CEILING, AGENT_EXPENSE_RATE
 from .models import Agent
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 def update_resource_prices(resources: List[Any]) -> None:
     """Updates the prices of all resources."""
@@ -34,7 +34,7 @@ def get_resource_availability(resources: List[Any]) -> np.ndarray:
     """Returns an array of resource availability."""
     return np.array([r.capacity - r.current_load for r in resources])
 
-def get_agent_requests(agents: List[Agent], resource_prices: np.ndarray, resource_availability: np.ndarray) -> List[Tuple[Agent, int, float]]:
+def get_agent_requests(agents: List[Agent], resource_prices: np.ndarray, resource_availability: np.ndarray, demand_multiplier: Optional[float] = None) -> List[Tuple[Agent, int, float]]:
     """
     Gets resource requests from agents.
 
@@ -42,6 +42,7 @@ def get_agent_requests(agents: List[Agent], resource_prices: np.ndarray, resourc
         agents (List[Agent]): List of agents.
         resource_prices (np.ndarray): Array of resource prices.
         resource_availability (np.ndarray): Array of resource availability.
+        demand_multiplier (Optional[float]): Scheduled demand multiplier; defaults to each agent's own.
 
     Returns:
         List[Tuple[Agent, int, float]]: List of agent requests.
@@ -49,7 +50,7 @@ def get_agent_requests(agents: List[Agent], resource_prices: np.ndarray, resourc
     active_agents = [agent for agent in agents if not agent.is_bankrupt]
     all_requests = []
     for agent in active_agents:
-        agent_requests = agent.request_resources(resource_prices, resource_availability)
+        agent_requests = agent.request_resources(resource_prices, resource_availability, demand_multiplier)
         all_requests.extend([(agent, resource_id, amount) for resource_id, amount in agent_requests])
     random.shuffle(all_requests)
     return all_requests
@@ -79,20 +80,15 @@ def adjust_agent_needs(agents: List[Agent]) -> None:
     for agent in agents:
         agent.adjust_needs()
 
-def adjust_agent_demand_multiplier(agents: List[Agent], step_num: int) -> None:
-    """Adjusts the demand multiplier of all agents."""
-    for agent in agents:
-        agent.adjust_demand_multiplier(step_num)
-
-def add_agent_income(agents: List[Agent], avg_resource_price: float) -> None:
+def add_agent_income(agents: List[Agent], avg_resource_price: float, income_ceiling: float = AGENT_INCOME_CEILING) -> None:
     """Adds income to all agents."""
     for agent in agents:
-        agent.add_income(avg_resource_price)
+        agent.add_income(avg_resource_price, income_ceiling)
 
-def add_agent_expense(agents: List[Agent]) -> None:
+def add_agent_expense(agents: List[Agent], expense_rate: float = AGENT_EXPENSE_RATE) -> None:
     """Adds expense to all agents."""
     for agent in agents:
-        agent.add_expense()
+        agent.add_expense(expense_rate)
 
 def check_agent_bankruptcies(agents: List[Agent]) -> List[Agent]:
     """Checks for agent bankruptcies and returns a list of bankrupt agents."""
@@ -142,10 +138,11 @@ def get_total_economic_output(agents: List[Agent], resources: List[Any]) -> floa
 
 def calculate_gini_coefficient(balances: List[float]) -> float:
     """Calculates the Gini coefficient."""
-    balances = sorted(balances)
+    balances = np.sort(np.asarray(balances, dtype=float))
     n = len(balances)
     if n < 2:
         return 0.0
-    numerator = sum((i + 1) * balance for i, balance in enumerate(balances)) - sum((n - i) * balance for i, balance in enumerate(balances))
-    denominator = n * sum(balances)
+    ranks = np.arange(1, n + 1)
+    numerator = float(np.dot(2 * ranks - n - 1, balances))
+    denominator = n * float(np.sum(balances))
     return numerator / denominator if denominator else 0.0
\ No newline at end of file
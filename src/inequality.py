@@ -0,0 +1,416 @@
+"""
+Incremental inequality tracking for the agent-based economic simulation.
+
+This module maintains Gini coefficient and median balance estimates for an
+agent population without re-sorting every balance on every query. Balances
+are bucketed into a fixed number of bins and the per-bin counts and sums are
+kept in Fenwick (binary indexed) trees, so only agents whose balance actually
+moved need to be touched.
+
+Uniform policies such as taxation followed by an equal redistribution are
+affine transforms (balance -> scale * balance + shift) that preserve the
+ordering of agents. The tracker stores balances in an internal key space and
+folds such transforms into a single lazy affine map, so they cost O(1)
+regardless of the population size. Once repeated taxation has shrunk (or
+grown) the lazy scale by RENORMALIZE_SCALE, it is folded back into the keys
+in one O(n + B) rebuild, which keeps the map from underflowing on long runs.
+
+The array-backed engine uses the tracker for its per-step Gini and median
+when 'inequality_bins' is set (see vectorized.inequality_tracker). Income
+and expense noise move every balance every step there, so the engine calls
+assign, which re-bins the population in one O(n + B) pass instead of
+sorting it; sync is for callers where only some balances move.
+
+Key functionality includes:
+- O(log B) point updates, insertions and removals for B bins
+- Synchronization with a population whose agents are identified by slot
+- O(n + B) reassignment of a population whose balances all moved
+- O(1) affine updates for order-preserving population-wide policies
+- O(1) Gini coefficient queries with an explicit error bound
+- O(log B) median queries bounded by the width of a single bin
+"""
+import numpy as np
+from typing import Iterable, Optional
+
+DEFAULT_NUM_BINS: int = 1024
+RANGE_MARGIN: float = 0.5
+BATCH_REBUILD_FRACTION: float = 0.125
+# A lazy affine scale outside [RENORMALIZE_SCALE, 1 / RENORMALIZE_SCALE] is folded back into the keys
+RENORMALIZE_SCALE: float = 1e-6
+# Relative difference below which sync treats a tracked balance as unchanged (rounding of the affine map)
+SYNC_TOLERANCE: float = 1e-12
+
+class FenwickTree:
+    """
+    Binary indexed tree supporting point updates and prefix sums.
+    """
+    def __init__(self, size: int):
+        """
+        Initializes an empty Fenwick tree.
+
+        Args:
+            size (int): The number of slots in the tree.
+        """
+        self.size: int = size
+        self.tree: np.ndarray = np.zeros(size + 1)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> "FenwickTree":
+        """Builds a Fenwick tree from an array of slot values in O(size)."""
+        fenwick = cls(len(values))
+        cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+        index = np.arange(1, fenwick.size + 1)
+        fenwick.tree[1:] = cumulative[index] - cumulative[index - (index & -index)]
+        return fenwick
+
+    def add(self, index: int, delta: float) -> None:
+        """Adds delta to the slot at the given index."""
+        i = index + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> float:
+        """Returns the sum of the slots in [0, index)."""
+        total = 0.0
+        i = index
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, target: float) -> int:
+        """Returns the smallest index whose inclusive prefix sum exceeds target."""
+        position = 0
+        remaining = target
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.tree[nxt] <= remaining:
+                position = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return position
+
+class InequalityTracker:
+    """
+    Tracks the Gini coefficient and median of a set of balances incrementally.
+
+    Each tracked slot (typically an agent index) holds one balance. Balances
+    are mapped to keys with ``balance = scale * key + shift`` and the keys are
+    bucketed into equal-width bins. Within-bin ordering is not tracked, which
+    is the only source of error in the Gini coefficient and the median.
+    """
+    def __init__(self, balances: Iterable[float], num_bins: int = DEFAULT_NUM_BINS):
+        """
+        Initializes the tracker from an initial set of balances.
+
+        Args:
+            balances (Iterable[float]): The initial balance of every slot.
+            num_bins (int): The number of bins used to bucket balances.
+        """
+        self.num_bins: int = num_bins
+        self.scale: float = 1.0
+        self.shift: float = 0.0
+        self._keys: np.ndarray = np.asarray(list(balances), dtype=float).copy()
+        self._active: np.ndarray = np.ones(len(self._keys), dtype=bool)
+        self._num_slots: int = len(self._keys)
+        self._rebuild()
+
+    def __len__(self) -> int:
+        """Returns the number of active slots."""
+        return self._n
+
+    def _reserve(self, num_slots: int) -> None:
+        """Grows the slot arrays to hold at least num_slots slots, doubling their size to amortize copies."""
+        if num_slots <= len(self._keys):
+            return
+        grow = max(num_slots, 2 * len(self._keys)) - len(self._keys)
+        self._keys = np.concatenate((self._keys, np.zeros(grow)))
+        self._active = np.concatenate((self._active, np.zeros(grow, dtype=bool)))
+        self._bins = np.concatenate((self._bins, np.zeros(grow, dtype=np.int64)))
+
+    def _renormalize(self) -> None:
+        """Folds the lazy affine map into the keys and re-bins them."""
+        self._keys = self.scale * self._keys + self.shift
+        self.scale = 1.0
+        self.shift = 0.0
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Re-bins every active key, resetting the bin range around them."""
+        keys = self._keys[self._active]
+        if len(keys):
+            self._set_range(float(keys.min()), float(keys.max()))
+        else:
+            self._set_range(0.0, 1.0)
+        self._bins: np.ndarray = np.zeros(len(self._keys), dtype=np.int64)
+        self._bins[self._active] = self._bin_of(keys)
+        self._recount()
+
+    def _set_range(self, low: float, high: float) -> None:
+        """Spreads the bins over [low, high], widened by RANGE_MARGIN so that small moves stay in range."""
+        margin = max(high - low, abs(high), 1.0) * RANGE_MARGIN
+        self._low: float = low - margin
+        self._width: float = (high - low + 2 * margin) / self.num_bins
+
+    def _recount(self, keys: Optional[np.ndarray] = None, bins: Optional[np.ndarray] = None) -> None:
+        """Recomputes the bin aggregates and Fenwick trees from the keys and bins of every active slot in O(n + B)."""
+        if keys is None:
+            keys = self._keys[self._active]
+            bins = self._bins[self._active]
+        self._counts: np.ndarray = np.bincount(bins, minlength=self.num_bins).astype(float)
+        self._sums: np.ndarray = np.bincount(bins, weights=keys, minlength=self.num_bins)
+        self._count_tree: FenwickTree = FenwickTree.from_array(self._counts)
+        self._sum_tree: FenwickTree = FenwickTree.from_array(self._sums)
+        self._n: int = len(keys)
+        self._total: float = float(self._sums.sum())
+        counts_before = np.cumsum(self._counts) - self._counts
+        self._cross: float = float(np.sum(counts_before * self._sums))
+        self._within: float = float(np.sum(self._counts * self._sums))
+        self._count_squares: float = float(np.sum(self._counts * self._counts))
+
+    def _bin_of(self, keys: np.ndarray) -> np.ndarray:
+        """Returns the bin index of each key."""
+        return np.floor((keys - self._low) / self._width).astype(np.int64)
+
+    def _in_range(self, keys: np.ndarray) -> bool:
+        """Checks whether all keys fall inside the current bin range."""
+        bins = self._bin_of(keys)
+        return bool(np.all((bins >= 0) & (bins < self.num_bins)))
+
+    def _insert(self, key: float, b: int) -> None:
+        """Inserts one key into bin b, updating the rank aggregates in O(log B)."""
+        count_before = self._count_tree.prefix_sum(b)
+        sum_after = self._total - self._sum_tree.prefix_sum(b + 1)
+        self._cross += key * count_before + sum_after
+        self._within += self._sums[b] + key * self._counts[b] + key
+        self._count_squares += 2 * self._counts[b] + 1
+        self._counts[b] += 1
+        self._sums[b] += key
+        self._count_tree.add(b, 1.0)
+        self._sum_tree.add(b, key)
+        self._n += 1
+        self._total += key
+
+    def _delete(self, key: float, b: int) -> None:
+        """Deletes one key from bin b, updating the rank aggregates in O(log B)."""
+        self._counts[b] -= 1
+        self._sums[b] -= key
+        self._count_tree.add(b, -1.0)
+        self._sum_tree.add(b, -key)
+        self._n -= 1
+        self._total -= key
+        count_before = self._count_tree.prefix_sum(b)
+        sum_after = self._total - self._sum_tree.prefix_sum(b + 1)
+        self._cross -= key * count_before + sum_after
+        self._within -= self._sums[b] + key * self._counts[b] + key
+        self._count_squares -= 2 * self._counts[b] + 1
+
+    def apply_affine(self, scale: float, shift: float) -> None:
+        """
+        Applies balance -> scale * balance + shift to every active slot in O(1).
+
+        Args:
+            scale (float): The multiplicative factor. Must be positive so that
+                the ordering of balances is preserved.
+            shift (float): The additive offset.
+        """
+        if scale <= 0:
+            raise ValueError(f"Affine scale must be positive to preserve ordering, got {scale}")
+        self.scale *= scale
+        self.shift = self.shift * scale + shift
+        if not RENORMALIZE_SCALE <= self.scale <= 1 / RENORMALIZE_SCALE:
+            self._renormalize()
+
+    def update(self, indices: Iterable[int], balances: Iterable[float]) -> None:
+        """
+        Sets the balance of the given slots, re-binning only those slots.
+
+        Small batches are applied point by point in O(k log B); large batches
+        fall back to an O(n + B) recount.
+
+        Args:
+            indices (Iterable[int]): The slots whose balance changed.
+            balances (Iterable[float]): The new balance of each slot.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if not len(indices):
+            return
+        if not np.all(self._active[indices]):
+            raise KeyError("Cannot update slots that are not active")
+        self._rekey(indices, (np.asarray(balances, dtype=float) - self.shift) / self.scale)
+
+    def _rekey(self, indices: np.ndarray, keys: np.ndarray) -> None:
+        """Sets the keys of active slots; re-counts in O(n + B) if every active slot is re-keyed."""
+        new_bins = self._bin_of(keys)
+        if not np.all((new_bins >= 0) & (new_bins < self.num_bins)):
+            self._keys[indices] = keys
+            self._rebuild()
+            return
+        if len(indices) > BATCH_REBUILD_FRACTION * self.num_bins:
+            self._keys[indices] = keys
+            self._bins[indices] = new_bins
+            self._recount(*((keys, new_bins) if len(indices) == self._n else ()))
+            return
+        for i, key, b in zip(indices.tolist(), keys.tolist(), new_bins.tolist()):
+            self._delete(self._keys[i], int(self._bins[i]))
+            self._insert(key, b)
+            self._keys[i] = key
+            self._bins[i] = b
+
+    def remove(self, indices: Iterable[int]) -> None:
+        """Stops tracking the given slots, e.g. after bankruptcy."""
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = indices[self._active[indices]]
+        if len(indices) > BATCH_REBUILD_FRACTION * self.num_bins:
+            self._active[indices] = False
+            self._recount()
+            return
+        for i in indices.tolist():
+            self._delete(self._keys[i], int(self._bins[i]))
+            self._active[i] = False
+
+    def add(self, balances: Iterable[float], indices: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        Starts tracking new slots and returns their indices.
+
+        Args:
+            balances (Iterable[float]): The balance of each new slot.
+            indices (Optional[Iterable[int]]): Inactive slots to reuse, e.g. the IDs of entrants;
+                new slots after the last one are assigned if omitted.
+
+        Returns:
+            np.ndarray: The slot indices assigned to the new balances.
+        """
+        keys = (np.asarray(list(balances), dtype=float) - self.shift) / self.scale
+        if indices is None:
+            indices = np.arange(self._num_slots, self._num_slots + len(keys))
+        indices = np.asarray(indices, dtype=np.int64)
+        if not len(indices):
+            return indices
+        self._reserve(int(indices.max()) + 1)
+        self._num_slots = max(self._num_slots, int(indices.max()) + 1)
+        if np.any(self._active[indices]):
+            raise KeyError("Cannot add slots that are already active")
+        self._keys[indices] = keys
+        self._active[indices] = True
+        if not self._in_range(keys):
+            self._rebuild()
+            return indices
+        new_bins = self._bin_of(keys)
+        self._bins[indices] = new_bins
+        if len(indices) > BATCH_REBUILD_FRACTION * self.num_bins:
+            self._recount()
+            return indices
+        for key, b in zip(keys.tolist(), new_bins.tolist()):
+            self._insert(key, b)
+        return indices
+
+    def sync(self, indices: np.ndarray, balances: np.ndarray) -> None:
+        """
+        Brings the tracker in line with a population whose agents are identified by slot.
+
+        Slots missing from indices are removed, new ones are added and the
+        remaining slots are re-keyed only if their balance differs from what
+        the tracker holds, e.g. after an affine update has been applied.
+
+        Args:
+            indices (np.ndarray): The slot of every live agent, such as its agent ID.
+            balances (np.ndarray): The balance of every live agent.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        balances = np.asarray(balances, dtype=float)
+        if len(indices):
+            self._reserve(int(indices.max()) + 1)
+        live = np.zeros(len(self._active), dtype=bool)
+        live[indices] = True
+        gone = self._active > live
+        if gone.any():
+            self.remove(np.flatnonzero(gone))
+        new = ~self._active[indices]
+        if new.any():
+            self.add(balances[new], indices[new])
+            indices, balances = indices[~new], balances[~new]
+        difference = self._keys[indices]
+        difference *= self.scale
+        difference += self.shift
+        difference -= balances
+        limit = np.abs(balances)
+        np.maximum(limit, 1.0, out=limit)
+        changed = np.abs(difference, out=difference) > SYNC_TOLERANCE * limit
+        if changed.all():
+            self._rekey(indices, (balances - self.shift) / self.scale)
+        elif changed.any():
+            self._rekey(indices[changed], (balances[changed] - self.shift) / self.scale)
+
+    def assign(self, indices: np.ndarray, balances: np.ndarray) -> None:
+        """
+        Replaces the tracked slots and balances with those of a population in one O(n + B) pass.
+
+        Use this instead of apply_affine and sync when most balances moved since
+        the last call: it re-bins the balances directly, without comparing them
+        with the tracked ones first, and fits the bin range to them so that the
+        error bounds stay tight as the distribution drifts.
+
+        Args:
+            indices (np.ndarray): The slot of every live agent, such as its agent ID.
+            balances (np.ndarray): The balance of every live agent.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        keys = np.asarray(balances, dtype=float)
+        if len(indices):
+            self._reserve(int(indices.max()) + 1)
+            self._num_slots = max(self._num_slots, int(indices.max()) + 1)
+        self.scale = 1.0
+        self.shift = 0.0
+        self._active[:] = False
+        self._active[indices] = True
+        self._keys[indices] = keys
+        if not len(keys):
+            self._rebuild()
+            return
+        self._set_range(float(keys.min()), float(keys.max()))
+        bins = self._bin_of(keys)
+        np.minimum(bins, self.num_bins - 1, out=bins)
+        self._bins[indices] = bins
+        self._recount(keys, bins)
+
+    def balances(self) -> np.ndarray:
+        """Returns the exact balances of the active slots."""
+        return self.scale * self._keys[self._active] + self.shift
+
+    def gini(self) -> float:
+        """Returns the Gini coefficient of the tracked balances in O(1)."""
+        if self._n < 2:
+            return 0.0
+        numerator = self.scale * (2 * self._cross + self._within - self._n * self._total)
+        denominator = self._n * (self.scale * self._total + self.shift * self._n)
+        return numerator / denominator if denominator else 0.0
+
+    def gini_error_bound(self) -> float:
+        """Returns an upper bound on the absolute error of gini()."""
+        denominator = abs(self._n * (self.scale * self._total + self.shift * self._n))
+        if self._n < 2 or not denominator:
+            return 0.0
+        within_pairs = (self._count_squares - self._n) / 2
+        return within_pairs * self.scale * self._width / denominator
+
+    def _value_at_rank(self, rank: int) -> float:
+        """Estimates the balance at the given 0-based rank by interpolating within its bin."""
+        b = self._count_tree.search(rank)
+        rank_in_bin = rank - self._count_tree.prefix_sum(b)
+        key = self._low + self._width * (b + (rank_in_bin + 0.5) / self._counts[b])
+        return self.scale * key + self.shift
+
+    def median(self) -> float:
+        """Returns the median balance in O(log B), within one bin width of the exact value."""
+        if self._n == 0:
+            return float("nan")
+        lower = self._value_at_rank((self._n - 1) // 2)
+        upper = self._value_at_rank(self._n // 2)
+        return (lower + upper) / 2
+
+    def median_error_bound(self) -> float:
+        """Returns an upper bound on the absolute error of median()."""
+        return self.scale * self._width
@@ -11,22 +11,196 @@ The main function executes the full experimentation workflow:
 2. Simulation runs for each parameter combination
 3. Results collection and statistical analysis
 4. Identification of optimal economic policies
+
+It also provides the package command line (``python -m src``) with the
+subcommands ``run`` (a single simulation), ``sweep`` (the experimentation
+suite, optionally distributed over local or remote workers), ``sensitivity``
+(Morris screening or Sobol indices over the constants), ``bench``
+(simulation throughput and worker startup time), ``drift`` (float32
+against float64 results of the vectorized engine) and ``golden`` (an
+alternative engine against golden trajectories of the reference loop). Each subcommand imports
+only the modules it needs, so startup stays fast and optional dependencies
+such as the metrics server are never loaded unless requested.
 """
+import argparse
+import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence
+
+def _parse_params(pairs: Sequence[str]) -> Dict[str, Any]:
+    """Parses KEY=VALUE pairs into a params dict, decoding values as JSON where possible."""
+    params: Dict[str, Any] = {}
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got {pair!r}")
+        try:
+            params[key] = json.loads(value)
+        except json.JSONDecodeError:
+            params[key] = value
+    return params
+
+def _run_command(args: argparse.Namespace) -> None:
+    """Runs a single simulation and prints its summary results as JSON."""
+    from .simulation import run_simulation
+    from .work_queue import to_jsonable
+    params = _parse_params(args.param)
+    if args.serve_metrics is not None:
+        from .metrics_server import MetricsServer
+        with MetricsServer(port=args.serve_metrics) as server:
+            results = run_simulation(params, on_step=server.publish)
+    elif args.cache_dir:
+        from .cache import ResultCache, cached_run_simulation
+        results = cached_run_simulation(params, ResultCache(args.cache_dir))
+    else:
+        results = run_simulation(params)
+    print(json.dumps(to_jsonable(results), indent=2))
+
+def _sweep_command(args: argparse.Namespace) -> None:
+    """Runs the parameter sweep, locally or through a work queue, and analyzes it."""
+    from .experimentation import run_experiments, run_worker, analyze_results
+    base_params = _parse_params(args.param)
+    seeds: List[Optional[int]] = list(range(args.seeds)) if args.seeds else [None]
+    if args.worker:
+        run_worker(args.queue_dir, lease_seconds=args.lease_seconds, cache_dir=args.cache_dir)
+        return
+    run_experiments(base_params, seeds, queue_dir=args.queue_dir, lease_seconds=args.lease_seconds, local_workers=args.workers, start_method=args.start_method, cache_dir=args.cache_dir)
+    analyze_results()
+
+def _sensitivity_command(args: argparse.Namespace) -> None:
+    """Runs a global sensitivity analysis and prints the indices as JSON."""
+    from .sensitivity import SENSITIVITY_BASE_PARAMS, morris_screening, sobol_analysis, log_sensitivity
+    base_params = dict(SENSITIVITY_BASE_PARAMS, **_parse_params(args.param))
+    execution = dict(queue_dir=args.queue_dir, lease_seconds=args.lease_seconds, local_workers=args.workers, start_method=args.start_method, cache_dir=args.cache_dir)
+    seeds = list(range(args.seeds))
+    if args.method == "morris":
+        indices = morris_screening(args.vary, args.samples or 10, base_params=base_params, seeds=seeds, **execution)
+        log_sensitivity(indices, args.metric, "mu_star")
+    else:
+        indices = sobol_analysis(args.vary, args.samples or 64, base_params=base_params, seeds=seeds, **execution)
+        log_sensitivity(indices, args.metric, "total")
+    print(json.dumps(indices, indent=2))
+
+def _bench_command(args: argparse.Namespace) -> None:
+    """Reports simulation throughput and worker startup time per start method."""
+    from .benchmark import time_simulation, time_inequality_metrics, measure_worker_startup, available_start_methods
+    params = _parse_params(args.param)
+    if args.inequality:
+        metrics = time_inequality_metrics(dict(params, engine='vectorized'))
+        logging.info(f"per-step Gini/median: exact {metrics['exact_ms_per_step']:.2f} ms, tracker {metrics['tracker_ms_per_step']:.2f} ms ({metrics['speedup']:.1f}x)")
+        return
+    timing = time_simulation(params, args.repeats)
+    logging.info(f"run_simulation: {timing['seconds_per_run']:.3f}s per run, {timing['steps_per_second']:.1f} steps/s")
+    for method in available_start_methods(args.start_method):
+        startup = measure_worker_startup(method, args.repeats)
+        logging.info(f"worker startup ({method}): median {startup['median'] * 1000:.1f} ms (min {startup['min'] * 1000:.1f}, max {startup['max'] * 1000:.1f})")
+
+def _drift_command(args: argparse.Namespace) -> None:
+    """Compares float32 and float64 runs of the vectorized engine and exits non-zero on excess drift."""
+    from .vectorized import precision_drift
+    report = precision_drift(_parse_params(args.param), list(range(args.seeds)))
+    print(json.dumps(report, indent=2))
+    if not report['within_tolerance']:
+        raise SystemExit(1)
+
+def _golden_command(args: argparse.Namespace) -> None:
+    """Validates an engine against golden reference trajectories and exits non-zero on failure."""
+    import os
+    from .golden import GOLDEN_PARAMS, GOLDEN_SEEDS, record_golden, save_golden, load_golden, validate_engine
+    if args.golden and os.path.exists(args.golden) and not args.record:
+        golden = load_golden(args.golden)
+        if args.param and dict(dict(GOLDEN_PARAMS, **_parse_params(args.param)), engine='reference') != golden['params']:
+            raise SystemExit(f"{args.golden} was recorded with params {golden['params']}; pass --record to re-record it with -p")
+        if args.seeds is not None and args.seeds != len(golden['seeds']):
+            raise SystemExit(f"{args.golden} was recorded with {len(golden['seeds'])} seeds; pass --record to re-record it with --seeds")
+    else:
+        golden = record_golden(dict(GOLDEN_PARAMS, **_parse_params(args.param)), list(range(len(GOLDEN_SEEDS) if args.seeds is None else args.seeds)))
+        if args.golden:
+            save_golden(args.golden, golden)
+    report = validate_engine(golden, dict(engine=args.engine, **_parse_params(args.candidate_param)))
+    logging.info(f"{args.engine}: {report['speedup']:.1f}x faster than the reference loop ({report['candidate_seconds']:.3f}s vs {report['reference_seconds']:.3f}s per run, reference {report['reference_timing']})")
+    print(json.dumps(report, indent=2))
+    if not report['passed']:
+        raise SystemExit(1)
 
-from experimentation import run_experiments, analyze_results, experiment_results
-from constants import *
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the command line parser."""
+    parser = argparse.ArgumentParser(prog="python -m src", description="Agent-based economic simulation")
+    subparsers = parser.add_subparsers(dest="command")
 
-# --- Logging Configuration ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_parser = subparsers.add_parser("run", help="run a single simulation")
+    run_parser.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE", help="override a parameter, e.g. tax_rate=0.03")
+    # A cached result has no steps to stream, so the two options exclude each other
+    run_output = run_parser.add_mutually_exclusive_group()
+    run_output.add_argument("--serve-metrics", type=int, metavar="PORT", help="stream step metrics on this port while running")
+    run_output.add_argument("--cache-dir", help="reuse seeded results from this result cache directory")
+    run_parser.set_defaults(handler=_run_command)
 
-def main():
+    sweep_parser = subparsers.add_parser("sweep", help="run the parameter sweep")
+    sweep_parser.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE", help="base parameter applied to every point")
+    sweep_parser.add_argument("--seeds", type=int, default=0, help="number of seeds per point (default: one unseeded run)")
+    sweep_parser.add_argument("--queue-dir", help="shared work queue directory for distributed sweeps")
+    sweep_parser.add_argument("--workers", type=int, default=0, help="local worker processes to start on --queue-dir")
+    sweep_parser.add_argument("--worker", action="store_true", help="only act as a worker on --queue-dir")
+    sweep_parser.add_argument("--start-method", choices=["spawn", "forkserver", "fork"], help="multiprocessing start method for local workers")
+    sweep_parser.add_argument("--lease-seconds", type=float, default=60.0, help="seconds before an unrenewed claim is re-leased")
+    sweep_parser.add_argument("--cache-dir", help="reuse seeded results from this result cache directory")
+    sweep_parser.set_defaults(handler=_sweep_command)
+
+    sensitivity_parser = subparsers.add_parser("sensitivity", help="rank the constants by global sensitivity")
+    sensitivity_parser.add_argument("method", choices=["morris", "sobol"], help="Morris screening or Sobol indices")
+    sensitivity_parser.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE", help="base parameter applied to every run")
+    sensitivity_parser.add_argument("--vary", action="append", metavar="NAME", help="constant to vary (default: all in SENSITIVITY_BOUNDS)")
+    sensitivity_parser.add_argument("--samples", type=int, default=0, help="Morris trajectories or Sobol base samples (default: 10 or 64)")
+    sensitivity_parser.add_argument("--seeds", type=int, default=1, help="number of seeds per design point")
+    sensitivity_parser.add_argument("--metric", default="gini_coefficient", help="output metric to log the ranking for")
+    sensitivity_parser.add_argument("--queue-dir", help="shared work queue directory for distributed runs")
+    sensitivity_parser.add_argument("--workers", type=int, default=0, help="local worker processes to start on --queue-dir")
+    sensitivity_parser.add_argument("--start-method", choices=["spawn", "forkserver", "fork"], help="multiprocessing start method for local workers")
+    sensitivity_parser.add_argument("--lease-seconds", type=float, default=60.0, help="seconds before an unrenewed claim is re-leased")
+    sensitivity_parser.add_argument("--cache-dir", help="reuse seeded results from this result cache directory")
+    sensitivity_parser.set_defaults(handler=_sensitivity_command)
+
+    bench_parser = subparsers.add_parser("bench", help="measure simulation speed and worker startup")
+    bench_parser.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE", help="override a parameter for the timed runs")
+    bench_parser.add_argument("--repeats", type=int, default=3, help="repetitions per measurement")
+    bench_parser.add_argument("--inequality", action="store_true", help="compare the exact and tracked per-step Gini/median instead")
+    bench_parser.add_argument("--start-method", action="append", choices=["spawn", "forkserver", "fork"], help="start methods to measure (default: all available)")
+    bench_parser.set_defaults(handler=_bench_command)
+
+    drift_parser = subparsers.add_parser("drift", help="check float32 results against float64")
+    drift_parser.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE", help="override a parameter for the compared runs")
+    drift_parser.add_argument("--seeds", type=int, default=3, help="number of seeds to compare")
+    drift_parser.set_defaults(handler=_drift_command)
+
+    golden_parser = subparsers.add_parser("golden", help="validate an engine against golden reference trajectories")
+    golden_parser.add_argument("--engine", default="vectorized", help="engine to validate")
+    golden_parser.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE", help="override a parameter of the golden runs")
+    golden_parser.add_argument("-c", "--candidate-param", action="append", default=[], metavar="KEY=VALUE", help="override a parameter of the candidate only")
+    golden_parser.add_argument("--seeds", type=int, help="number of seeds to record (default: 20)")
+    golden_parser.add_argument("--golden", metavar="PATH", help="golden .npz file to load, or to save a new recording to")
+    golden_parser.add_argument("--record", action="store_true", help="re-record --golden even if it exists")
+    golden_parser.set_defaults(handler=_golden_command)
+    return parser
+
+def main(argv: Optional[Sequence[str]] = None):
     """
     Main entry point for the parameter experimentation.
-    """
-    run_experiments()
-    analyze_results()
 
-if __name__ == "__main__":
-    main()
\ No newline at end of file
+    Args:
+        argv (Optional[Sequence[str]]): Command line arguments. Without a
+            subcommand the full experimentation suite is run.
+    """
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = build_parser()
+    args = parser.parse_args(list(argv or []))
+    if args.command is None:
+        from .experimentation import run_experiments, analyze_results
+        run_experiments()
+        analyze_results()
+        return
+    if args.command == "sweep" and (args.worker or args.workers) and not args.queue_dir:
+        parser.error("--worker and --workers require --queue-dir")
+    if args.command == "sensitivity" and args.workers and not args.queue_dir:
+        parser.error("--workers requires --queue-dir")
+    args.handler(args)
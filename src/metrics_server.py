@@ -0,0 +1,275 @@
+"""
+Live metrics server for monitoring long simulation runs.
+
+This module provides an optional local HTTP/WebSocket endpoint that publishes
+the metrics dict produced by every simulation step while the run is still in
+progress. The server runs an asyncio event loop on its own daemon thread, so
+the simulation loop only ever performs a constant-time, non-blocking append
+to a bounded drop-oldest buffer. A slow or stalled consumer therefore loses
+its oldest messages instead of slowing the simulation down.
+
+Endpoints:
+- ``GET /metrics``: Prometheus text exposition of step counters, steps per
+  second, agents alive and the latest step metrics
+- ``GET /latest``: the latest step metrics as JSON
+- ``GET /stream``: a WebSocket that pushes every step's metrics as JSON text
+  frames
+
+Typical usage:
+    with MetricsServer(port=8000) as server:
+        run_simulation(params, on_step=server.publish)
+"""
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional, Deque, Set, Tuple
+from .work_queue import to_jsonable
+
+DEFAULT_MAX_QUEUE: int = 256
+RATE_WINDOW: int = 64
+WEBSOCKET_GUID: str = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+GAUGE_METRICS: Tuple[str, ...] = ("gini", "median_balance", "price_variance", "economic_output", "bankruptcy_rate", "tax_redistribution")
+
+def _put_drop_oldest(queue: "asyncio.Queue[str]", message: str) -> bool:
+    """Puts a message on a bounded queue, discarding the oldest entry if it is full. Returns True if one was dropped."""
+    dropped = False
+    if queue.full():
+        queue.get_nowait()
+        dropped = True
+    queue.put_nowait(message)
+    return dropped
+
+def _websocket_frame(payload: bytes) -> bytes:
+    """Encodes a payload as a single unmasked WebSocket text frame."""
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x81, length))
+    elif length < 1 << 16:
+        header = bytes((0x81, 126)) + length.to_bytes(2, "big")
+    else:
+        header = bytes((0x81, 127)) + length.to_bytes(8, "big")
+    return header + payload
+
+class MetricsServer:
+    """
+    Publishes simulation step metrics over HTTP and WebSocket from a background thread.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, max_queue: int = DEFAULT_MAX_QUEUE):
+        """
+        Initializes the server without starting it.
+
+        Args:
+            host (str): The interface to bind.
+            port (int): The port to bind; 0 picks a free port (see the port attribute after start).
+            max_queue (int): Capacity of the publish buffer and of each WebSocket client's queue.
+        """
+        self.host: str = host
+        self.port: int = port
+        self.max_queue: int = max_queue
+        self.steps_total: int = 0
+        self.dropped_total: int = 0
+        self.agents_alive: Optional[int] = None
+        self.latest: Dict[str, Any] = {}
+        self._buffer: Deque[Dict[str, Any]] = collections.deque(maxlen=max_queue)
+        # Guards dropped_total and the publish buffer, which the simulation and loop threads both update
+        self._lock = threading.Lock()
+        self._timestamps: Deque[float] = collections.deque(maxlen=RATE_WINDOW)
+        self._clients: Set["asyncio.Queue[str]"] = set()
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._connections: Set["asyncio.Task[None]"] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    def __enter__(self) -> "MetricsServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> "MetricsServer":
+        """Starts the event loop thread and waits until the server is listening."""
+        self._thread = threading.Thread(target=self._run_loop, name="metrics-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        logging.info(f"Metrics server listening on http://{self.host}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        """Stops the server and joins its thread."""
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def publish(self, metrics: Dict[str, Any]) -> None:
+        """
+        Publishes one step's metrics. Safe to call from the simulation thread; never blocks.
+
+        Args:
+            metrics (Dict[str, Any]): The metrics dict returned by simulation_step.
+        """
+        self.steps_total += 1
+        self._timestamps.append(time.perf_counter())
+        self.latest = metrics
+        if "agents_alive" in metrics:
+            self.agents_alive = metrics["agents_alive"]
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped_total += 1
+            self._buffer.append(metrics)
+        loop = self._loop
+        if loop is not None and self._wakeup is not None:
+            try:
+                loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                pass
+
+    def steps_per_second(self) -> float:
+        """Returns the publish rate over the most recent steps."""
+        timestamps = list(self._timestamps)
+        if len(timestamps) < 2 or timestamps[-1] == timestamps[0]:
+            return 0.0
+        return (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+
+    def prometheus_text(self) -> str:
+        """Renders the current counters and gauges in the Prometheus text exposition format."""
+        lines = [
+            "# HELP sim_steps_total Simulation steps published.",
+            "# TYPE sim_steps_total counter",
+            f"sim_steps_total {self.steps_total}",
+            "# HELP sim_metrics_dropped_total Step messages dropped because a buffer was full.",
+            "# TYPE sim_metrics_dropped_total counter",
+            f"sim_metrics_dropped_total {self.dropped_total}",
+            "# HELP sim_steps_per_second Recent simulation step rate.",
+            "# TYPE sim_steps_per_second gauge",
+            f"sim_steps_per_second {self.steps_per_second():.6g}",
+        ]
+        if self.agents_alive is not None:
+            lines += [
+                "# HELP sim_agents_alive Agents remaining in the simulation.",
+                "# TYPE sim_agents_alive gauge",
+                f"sim_agents_alive {self.agents_alive}",
+            ]
+        latest = self.latest
+        for name in GAUGE_METRICS:
+            if name in latest:
+                lines += [f"# TYPE sim_{name} gauge", f"sim_{name} {float(latest[name]):.10g}"]
+        return "\n".join(lines) + "\n"
+
+    def _run_loop(self) -> None:
+        """Runs the asyncio event loop on the server thread."""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._serve())
+        except OSError as e:
+            self._error = e
+        finally:
+            self._ready.set()
+            self._loop.close()
+            self._loop = None
+
+    async def _serve(self) -> None:
+        """Listens for connections and fans out published messages until stopped."""
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        broadcaster = asyncio.ensure_future(self._broadcast())
+        await self._stopping.wait()
+        server.close()
+        # Finish every task before _run_loop closes the loop, so none is left pending on it
+        tasks = [broadcaster, *self._connections]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for writer in list(self._writers):
+            writer.close()
+        await server.wait_closed()
+
+    async def _broadcast(self) -> None:
+        """Moves messages from the publish buffer to every connected WebSocket client's queue."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._buffer:
+                with self._lock:
+                    metrics = self._buffer.popleft()
+                message = json.dumps(to_jsonable(metrics))
+                dropped = sum(_put_drop_oldest(client, message) for client in self._clients)
+                if dropped:
+                    with self._lock:
+                        self.dropped_total += dropped
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Parses one HTTP request and dispatches it to the matching endpoint."""
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        self._writers.add(writer)
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            path = request_line[1] if len(request_line) > 1 else "/"
+            if path == "/stream" and headers.get("upgrade", "").lower() == "websocket":
+                await self._stream(reader, writer, headers)
+            elif path == "/metrics":
+                await self._respond(writer, 200, "text/plain; version=0.0.4", self.prometheus_text())
+            elif path == "/latest":
+                await self._respond(writer, 200, "application/json", json.dumps(to_jsonable(self.latest)))
+            else:
+                await self._respond(writer, 404, "text/plain", "not found\n")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, content_type: str, body: str) -> None:
+        """Writes a complete HTTP response."""
+        payload = body.encode()
+        reason = "OK" if status == 200 else "Not Found"
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+        await writer.drain()
+
+    async def _stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: Dict[str, str]) -> None:
+        """Completes the WebSocket handshake and pushes step messages until the client disconnects."""
+        accept = base64.b64encode(hashlib.sha1((headers.get("sec-websocket-key", "") + WEBSOCKET_GUID).encode()).digest()).decode()
+        writer.write(f"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n".encode())
+        await writer.drain()
+        queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=self.max_queue)
+        self._clients.add(queue)
+        disconnected = asyncio.ensure_future(reader.read())
+        message: Optional["asyncio.Future[str]"] = None
+        try:
+            while not disconnected.done():
+                message = asyncio.ensure_future(queue.get())
+                await asyncio.wait({message, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+                if not message.done():
+                    break
+                writer.write(_websocket_frame(message.result().encode()))
+                await writer.drain()
+        finally:
+            self._clients.discard(queue)
+            pending = [future for future in (message, disconnected) if future is not None and not future.done()]
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -22,8 +22,8 @@ The Resource class represents economic resources with:
 import numpy as np
 import random
 import logging
-from .constants import INITIAL_CTX_BALANCE, NUM_RESOURCES, BASE_RESOURCE_COST, RESOURCE_CAPACITY, PRICE_ELASTICITY, MAX_RESOURCE_CAPACITY, RESOURCE_REGEN_RATE, DYNAMIC_REGEN_MULTIPLIER, RESOURCE_CAPACITY_MULTIPLIER, BANKRUPTCY_THRESHOLD, AGENT_INCOME, DYNAMIC_INCOME_MULTIPLIER, AGENT_INCOME_CEILING, AGENT_EXPENSE_RATE, MIN_AGENT_BALANCE
-from typing import List, Tuple, Dict, Any
+from .constants import INITIAL_CTX_BALANCE, NUM_RESOURCES, BASE_RESOURCE_COST, RESOURCE_CAPACITY, PRICE_ELASTICITY, MAX_RESOURCE_CAPACITY, RESOURCE_REGEN_RATE, DYNAMIC_REGEN_MULTIPLIER, RESOURCE_CAPACITY_MULTIPLIER, BANKRUPTCY_THRESHOLD, AGENT_INCOME, DYNAMIC_INCOME_MULTIPLIER, AGENT_INCOME_CEILING, AGENT_EXPENSE_RATE, MIN_AGENT_BALANCE, DEMAND_MULTIPLIER
+from typing import List, Tuple, Dict, Any, Optional
 
 class Agent:
     """
@@ -39,26 +39,29 @@ class Agent:
         self.agent_id: int = agent_id
         self.ctx_balance: float = INITIAL_CTX_BALANCE
         self.resource_demand_preference: np.ndarray = np.random.uniform(size=NUM_RESOURCES).astype(np.float32)
-        self.demand_multiplier: float = 0.1
+        self.demand_multiplier: float = DEMAND_MULTIPLIER
         self.is_bankrupt: bool = False
         logging.debug(f"Agent {self.agent_id} created with initial balance {self.ctx_balance} and resource needs {self.resource_demand_preference}")
 
-    def request_resources(self, resource_prices: np.ndarray, resource_availability: np.ndarray) -> List[Tuple[int, float]]:
+    def request_resources(self, resource_prices: np.ndarray, resource_availability: np.ndarray, demand_multiplier: Optional[float] = None) -> List[Tuple[int, float]]:
         """
         Requests resources based on demand and availability.
 
         Args:
             resource_prices (np.ndarray): Array of resource prices.
             resource_availability (np.ndarray): Array of resource availability.
+            demand_multiplier (Optional[float]): Scheduled demand multiplier; defaults to the agent's own.
 
         Returns:
             List[Tuple[int, float]]: List of resource requests (resource ID, amount).
         """
         if self.is_bankrupt:
             return []
+        if demand_multiplier is None:
+            demand_multiplier = self.demand_multiplier
         requests = []
         for i in range(NUM_RESOURCES):
-            demand = self.resource_demand_preference[i] * (1.0 - resource_prices[i] / (BASE_RESOURCE_COST * 5)) * self.demand_multiplier
+            demand = self.resource_demand_preference[i] * (1.0 - resource_prices[i] / (BASE_RESOURCE_COST * 5)) * demand_multiplier
             demand = np.clip(demand, 0.0, resource_availability[i])
             if self.ctx_balance >= resource_prices[i] * demand and self.ctx_balance > MIN_AGENT_BALANCE:
                 requests.append((i, demand))
@@ -69,18 +72,14 @@ class Agent:
         change = np.random.uniform(size=NUM_RESOURCES, low=-0.1, high=0.1).astype(np.float32)
         self.resource_demand_preference = np.clip(self.resource_demand_preference + change, 0.0, 1.0)
 
-    def adjust_demand_multiplier(self, step_num: int) -> None:
-        """Adjusts the agent's demand multiplier (currently does nothing)."""
-        pass
-
-    def add_income(self, avg_resource_price: float) -> None:
-        """Adds income to the agent."""
-        income = min(AGENT_INCOME + DYNAMIC_INCOME_MULTIPLIER * avg_resource_price, AGENT_INCOME_CEILING)
+    def add_income(self, avg_resource_price: float, income_ceiling: float = AGENT_INCOME_CEILING) -> None:
+        """Adds income to the agent, capped at income_ceiling."""
+        income = min(AGENT_INCOME + DYNAMIC_INCOME_MULTIPLIER * avg_resource_price, income_ceiling)
         self.ctx_balance += income
 
-    def add_expense(self) -> None:
-        """Adds expense to the agent."""
-        self.ctx_balance -= AGENT_EXPENSE_RATE * (1 + random.uniform(-0.2, 0.2))
+    def add_expense(self, expense_rate: float = AGENT_EXPENSE_RATE) -> None:
+        """Adds expense to the agent, varying by up to 20% around expense_rate."""
+        self.ctx_balance -= expense_rate * (1 + random.uniform(-0.2, 0.2))
 
     def tax(self, tax_amount: float) -> None:
         """Taxes the agent."""
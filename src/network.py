@@ -0,0 +1,206 @@
+"""
+Sparse agent-to-agent trading network for the simulation.
+
+This module adds direct agent-to-agent interaction to the economy. Agents
+are the nodes of a sparse weighted interaction graph stored in compressed
+sparse row (CSR) form, and every step each solvent agent spends a fraction
+of its balance with its living neighbors, split in proportion to the edge
+weights. The whole exchange is two sparse matrix-vector products over the
+balance array, so its cost is linear in the number of edges and graphs
+with millions of edges are traded in a fraction of a second per step.
+Trading moves wealth between agents but never creates or destroys it.
+
+Key functionality includes:
+- CSRGraph: a NumPy-only CSR adjacency with matvec and transposed matvec
+- Small-world graphs (Watts-Strogatz ring lattice with random rewiring)
+- Scale-free graphs (Chung-Lu graphs with power-law expected degrees)
+- trade_transfers: the per-step net transfer of every agent
+- build_trade_network: the graph configured by a run's params
+
+The graph is indexed by agent ID and built once per run; agents removed by
+bankruptcy stay in the graph but neither send nor receive anything.
+"""
+import numpy as np
+from typing import Dict, Any, Optional
+
+from .constants import TRADE_NETWORK, NETWORK_DEGREE, NETWORK_REWIRE_PROB, NETWORK_DEGREE_EXPONENT, NUM_AGENTS
+
+NETWORK_TYPES = ("none", "small_world", "scale_free")
+
+class CSRGraph:
+    """
+    Represents a weighted directed graph in compressed sparse row form.
+    """
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, weights: np.ndarray):
+        """
+        Initializes a graph from its CSR arrays.
+
+        Args:
+            indptr (np.ndarray): (num_nodes + 1,) offsets of each node's edges in indices.
+            indices (np.ndarray): (num_edges,) target node of each edge, grouped by source node.
+            weights (np.ndarray): (num_edges,) weight of each edge.
+        """
+        self.indptr: np.ndarray = indptr
+        self.indices: np.ndarray = indices
+        self.weights: np.ndarray = weights
+        self.num_nodes: int = len(indptr) - 1
+        # Source node of each edge, for the transposed product
+        self.rows: np.ndarray = np.repeat(np.arange(self.num_nodes, dtype=indices.dtype), np.diff(indptr))
+
+    @classmethod
+    def from_edges(cls, sources: np.ndarray, targets: np.ndarray, num_nodes: int, weights: Optional[np.ndarray] = None, symmetric: bool = True) -> "CSRGraph":
+        """
+        Builds a graph from an edge list, dropping self-loops and merging duplicate edges.
+
+        Args:
+            sources (np.ndarray): Source node of each edge.
+            targets (np.ndarray): Target node of each edge.
+            num_nodes (int): The number of nodes.
+            weights (Optional[np.ndarray]): Edge weights; 1 for every edge if omitted.
+            symmetric (bool): Whether to add the reverse of every edge.
+
+        Returns:
+            CSRGraph: The graph; the weights of merged duplicate edges are summed.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if symmetric:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            if weights is not None:
+                weights = np.concatenate((weights, weights))
+        keep = sources != targets
+        keys = sources[keep] * num_nodes + targets[keep]
+        if weights is None:
+            # Unit weights only need a plain sort; merged weights are the run lengths
+            keys = np.sort(keys)
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            merged_weights = np.diff(np.r_[starts, len(keys)]).astype(float)
+        else:
+            order = np.argsort(keys)
+            keys = keys[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            merged_weights = np.add.reduceat(np.asarray(weights, dtype=float)[keep][order], starts) if len(keys) else np.zeros(0)
+        keys = keys[starts]
+        index_dtype = np.int32 if num_nodes < 2 ** 31 else np.int64
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(keys // num_nodes, minlength=num_nodes))
+        return cls(indptr, (keys % num_nodes).astype(index_dtype), merged_weights)
+
+    @property
+    def num_edges(self) -> int:
+        """The number of directed edges."""
+        return len(self.indices)
+
+    def degree(self) -> np.ndarray:
+        """Returns the out-degree of every node."""
+        return np.diff(self.indptr)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Returns A @ x, the weighted sum of x over each node's out-neighbors."""
+        sums = np.zeros(self.num_nodes)
+        # Rows are contiguous, so a segmented sum over the non-empty rows is enough
+        nonempty = self.indptr[:-1] < self.indptr[1:]
+        if self.num_edges:
+            sums[nonempty] = np.add.reduceat(self.weights * x[self.indices], self.indptr[:-1][nonempty])
+        return sums
+
+    def rmatvec(self, x: np.ndarray) -> np.ndarray:
+        """Returns A.T @ x, the weighted sum of x over each node's in-neighbors."""
+        return np.bincount(self.indices, weights=self.weights * x[self.rows], minlength=self.num_nodes)
+
+def small_world_graph(num_nodes: int, degree: int, rewire_prob: float, rng: np.random.Generator) -> CSRGraph:
+    """
+    Generates an undirected Watts-Strogatz small-world graph.
+
+    Args:
+        num_nodes (int): The number of nodes.
+        degree (int): Mean degree; each node starts linked to its degree // 2 nearest ring neighbors on each side.
+        rewire_prob (float): Probability that each lattice edge is rewired to a uniformly random target.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        CSRGraph: The graph, with unit weights.
+    """
+    half = max(degree // 2, 1)
+    sources = np.repeat(np.arange(num_nodes), half)
+    targets = (sources + np.tile(np.arange(1, half + 1), num_nodes)) % num_nodes
+    rewire = rng.uniform(size=len(targets)) < rewire_prob
+    targets[rewire] = rng.integers(0, num_nodes, size=int(rewire.sum()))
+    return CSRGraph.from_edges(sources, targets, num_nodes)
+
+def scale_free_graph(num_nodes: int, degree: int, exponent: float, rng: np.random.Generator) -> CSRGraph:
+    """
+    Generates an undirected Chung-Lu graph with power-law expected degrees.
+
+    Each node draws a Pareto weight with the given degree exponent and the
+    endpoints of num_nodes * degree / 2 edges are sampled in proportion to
+    those weights, so the degree distribution has a power-law tail like a
+    preferential-attachment graph while every edge is drawn in one batch.
+
+    Args:
+        num_nodes (int): The number of nodes.
+        degree (int): Mean degree.
+        exponent (float): Exponent of the degree distribution's tail; must be greater than 2.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        CSRGraph: The graph, with unit weights.
+    """
+    if exponent <= 2:
+        raise ValueError(f"Degree exponent must be greater than 2, got {exponent}")
+    cumulative_weights = np.cumsum(rng.pareto(exponent - 1, size=num_nodes) + 1.0)
+    num_edges = num_nodes * degree // 2
+    # Inverse-CDF sampling with sorted uniforms keeps the lookups cache friendly
+    sources = np.searchsorted(cumulative_weights, np.sort(rng.uniform(0, cumulative_weights[-1], size=num_edges)), side='right')
+    targets = np.searchsorted(cumulative_weights, np.sort(rng.uniform(0, cumulative_weights[-1], size=num_edges)), side='right')
+    return CSRGraph.from_edges(sources, rng.permutation(targets), num_nodes)
+
+def build_trade_network(params: Dict[str, Any], num_agents: Optional[int] = None, rng: Optional[np.random.Generator] = None) -> Optional[CSRGraph]:
+    """
+    Builds the trading network configured by a run's params.
+
+    Args:
+        params (Dict[str, Any]): Simulation parameters; 'trade_network' selects 'none',
+            'small_world' or 'scale_free', configured by 'network_degree',
+            'network_rewire_prob' and 'network_degree_exponent'.
+        num_agents (Optional[int]): The number of agents; defaults to the run's num_agents.
+        rng (Optional[np.random.Generator]): The random number generator; seeded from params if omitted.
+
+    Returns:
+        Optional[CSRGraph]: The graph over agent IDs, or None if trading is disabled.
+    """
+    network_type = params.get('trade_network', TRADE_NETWORK)
+    if network_type not in NETWORK_TYPES:
+        raise ValueError(f"Unknown trade network {network_type!r}, expected one of {NETWORK_TYPES}")
+    if network_type == "none":
+        return None
+    num_agents = params.get('num_agents', NUM_AGENTS) if num_agents is None else num_agents
+    rng = np.random.default_rng(params.get('seed')) if rng is None else rng
+    degree = params.get('network_degree', NETWORK_DEGREE)
+    if network_type == "small_world":
+        return small_world_graph(num_agents, degree, params.get('network_rewire_prob', NETWORK_REWIRE_PROB), rng)
+    return scale_free_graph(num_agents, degree, params.get('network_degree_exponent', NETWORK_DEGREE_EXPONENT), rng)
+
+def trade_transfers(graph: CSRGraph, balance: np.ndarray, alive: np.ndarray, trade_rate: float) -> np.ndarray:
+    """
+    Computes one step of trading over the network.
+
+    Every living agent with a positive balance spends trade_rate of it with
+    its living neighbors, split in proportion to the edge weights. Agents
+    without living neighbors keep their budget.
+
+    Args:
+        graph (CSRGraph): The trading network over agent IDs.
+        balance (np.ndarray): (num_nodes,) balances by agent ID.
+        alive (np.ndarray): (num_nodes,) bool mask of agents still in the simulation.
+        trade_rate (float): Fraction of its balance each agent spends per step.
+
+    Returns:
+        np.ndarray: (num_nodes,) net transfer of every agent; sums to zero.
+    """
+    alive_weight = alive.astype(float)
+    reachable = graph.matvec(alive_weight)
+    trades = reachable > 0
+    spend = np.where(trades, trade_rate * np.maximum(balance, 0.0) * alive_weight, 0.0)
+    share = np.divide(spend, reachable, out=np.zeros_like(spend), where=trades)
+    return graph.rmatvec(share) * alive_weight - spend
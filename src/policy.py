@@ -0,0 +1,112 @@
+"""
+Time-varying economic policy schedules for the simulation.
+
+This module lets the policy parameters of a run change over the course of
+the simulation instead of holding one static value. Each schedule is
+compiled once, before the run starts, into an array with one value per
+step, so the simulation loop only indexes into precomputed arrays and a
+dynamic policy costs no more per step than a constant one.
+
+Scheduled parameters (see POLICY_DEFAULTS):
+- tax_rate: fraction of each agent's balance collected and redistributed
+- agent_expense_rate: mean per-step agent expense
+- agent_income_ceiling: upper bound on per-step agent income
+- demand_multiplier: scale of every agent's resource demand
+- trade_rate: fraction of its balance each agent spends on the trading network
+- agent_entry_rate: expected new agents per step as a fraction of num_agents
+  (array-backed engine only)
+
+A schedule in params may be given as:
+- a number: a constant value for the whole run
+- a list of [step, value] pairs: a step function that switches to each value
+  at its step and uses the parameter's default before the first one
+- a dict {"points": [[step, value], ...], "interpolation": "step" | "linear"}:
+  a step function as above, or a linear interpolation between the points
+  that holds the first and last values outside them
+- a 1-D NumPy array: explicit per-step values, the last one held to the end
+- a callable: called once with the array of step numbers, returning an array
+  of values (or a value) for those steps, e.g. ``lambda t: 0.02 + 0.01 * np.sin(t / 10)``
+
+Numbers, pairs and dicts are plain JSON, so scheduled runs can be sent through
+the work queue and stored in the result cache like any other parameters.
+"""
+import numpy as np
+from typing import Dict, Any
+
+from .constants import TAX_RATE, AGENT_EXPENSE_RATE, AGENT_INCOME_CEILING, DEMAND_MULTIPLIER, TRADE_RATE, AGENT_ENTRY_RATE
+
+POLICY_DEFAULTS: Dict[str, float] = {
+    'tax_rate': TAX_RATE,
+    'agent_expense_rate': AGENT_EXPENSE_RATE,
+    'agent_income_ceiling': AGENT_INCOME_CEILING,
+    'demand_multiplier': DEMAND_MULTIPLIER,
+    'trade_rate': TRADE_RATE,
+    'agent_entry_rate': AGENT_ENTRY_RATE
+}
+INTERPOLATION_MODES = ("step", "linear")
+
+def _compile_points(points: Any, interpolation: str, steps: np.ndarray, default: float) -> np.ndarray:
+    """Evaluates a sorted list of [step, value] points at every step."""
+    if interpolation not in INTERPOLATION_MODES:
+        raise ValueError(f"Unknown interpolation {interpolation!r}, expected one of {INTERPOLATION_MODES}")
+    points = sorted((float(step), float(value)) for step, value in points)
+    if not points:
+        raise ValueError("A piecewise schedule needs at least one [step, value] point")
+    point_steps = np.array([step for step, _ in points])
+    point_values = np.array([value for _, value in points])
+    if interpolation == "linear":
+        return np.interp(steps, point_steps, point_values)
+    indices = np.searchsorted(point_steps, steps, side='right') - 1
+    return np.where(indices >= 0, point_values[np.maximum(indices, 0)], default)
+
+def compile_schedule(schedule: Any, num_steps: int, default: float) -> np.ndarray:
+    """
+    Compiles one policy schedule into per-step values.
+
+    Args:
+        schedule (Any): A number, list of [step, value] pairs, points dict, per-step array or
+            callable, as described in the module docstring.
+        num_steps (int): The number of steps in the run.
+        default (float): The parameter's value where a step function has not started yet.
+
+    Returns:
+        np.ndarray: A float64 array with one value per step.
+    """
+    steps = np.arange(num_steps)
+    if callable(schedule):
+        values = np.asarray(schedule(steps), dtype=float)
+        return np.broadcast_to(values, (num_steps,)).copy()
+    if isinstance(schedule, np.ndarray):
+        if schedule.ndim != 1 or not len(schedule):
+            raise ValueError("A per-step schedule array must be 1-D and non-empty")
+        values = schedule[:num_steps].astype(float)
+        return np.concatenate((values, np.full(num_steps - len(values), values[-1])))
+    if isinstance(schedule, dict):
+        return _compile_points(schedule['points'], schedule.get('interpolation', "step"), steps, default)
+    if isinstance(schedule, (list, tuple)):
+        return _compile_points(schedule, "step", steps, default)
+    return np.full(num_steps, float(schedule))
+
+class PolicySchedule:
+    """
+    Represents the compiled per-step values of every policy parameter of a run.
+    """
+    def __init__(self, params: Dict[str, Any], num_steps: int):
+        """
+        Compiles the policy schedules in params.
+
+        Args:
+            params (Dict[str, Any]): Simulation parameters; policy parameters that are
+                missing take their constant default for the whole run.
+            num_steps (int): The number of steps in the run. Later steps reuse the last values.
+        """
+        self.num_steps: int = max(num_steps, 1)
+        self.arrays: Dict[str, np.ndarray] = {
+            name: compile_schedule(params.get(name, default), self.num_steps, default)
+            for name, default in POLICY_DEFAULTS.items()
+        }
+
+    def at(self, step_num: int) -> Dict[str, float]:
+        """Returns the value of every policy parameter at a step."""
+        index = min(step_num, self.num_steps - 1)
+        return {name: float(values[index]) for name, values in self.arrays.items()}
@@ -0,0 +1,296 @@
+"""
+Global sensitivity analysis of the simulation over its constants.
+
+This module measures how strongly each tunable constant drives the outputs
+of run_simulation when all of them vary together, rather than one at a time
+around the defaults as in the parameter sweep. Every constant is varied over
+a range given in SENSITIVITY_BOUNDS, and two methods are provided:
+
+- Morris screening: elementary effects along random one-at-a-time
+  trajectories through a level grid of the parameter space. r trajectories
+  cost r * (k + 1) runs for k parameters and rank the parameters by mu*, the
+  mean absolute effect, with sigma flagging nonlinearity and interactions.
+- Sobol indices: first-order and total-effect variance shares from Saltelli's
+  sample-reuse scheme. Two base samples A and B plus one matrix per parameter
+  that mixes them give both indices of all k parameters from N * (k + 2) runs
+  (Saltelli 2010 first-order and Jansen total-effect estimators).
+
+All design points of an analysis are submitted as a single batch of work
+items through the experimentation module, so they run locally, on local
+worker processes or across machines sharing a work queue, and points already
+in a result cache are not re-run. Runs are seeded and every design point uses
+the same seeds, so the outputs are deterministic functions of the constants.
+
+Key functionality includes:
+- SENSITIVITY_BOUNDS: the default range of every tunable constant
+- morris_sample / morris_indices: Morris trajectories and elementary effects
+- saltelli_sample / sobol_indices: the Saltelli design and Sobol estimators
+- morris_screening / sobol_analysis: complete analyses over run_simulation
+"""
+import logging
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .experimentation import run_work_items, work_item_id
+from .work_queue import DEFAULT_LEASE_SECONDS, to_jsonable
+
+# --- Parameter Ranges ---
+# Lower and upper bound of every constant varied by the analyses
+SENSITIVITY_BOUNDS: Dict[str, Tuple[float, float]] = {
+    'num_agents': (25, 100),
+    'num_resources': (2, 6),
+    'initial_ctx_balance': (50, 150),
+    'resource_capacity': (250, 750),
+    'base_resource_cost': (0.5, 2.0),
+    'price_elasticity': (0.01, 0.1),
+    'deallocation_rate': (0.01, 0.1),
+    'agent_income': (0.25, 1.0),
+    'resource_regen_rate': (0.005, 0.02),
+    'max_resource_capacity': (750, 1500),
+    'agent_expense_rate': (0.1, 0.5),
+    'min_agent_balance': (0, 20),
+    'bankruptcy_threshold': (-100, -10),
+    'dynamic_income_multiplier': (0.05, 0.2),
+    'dynamic_regen_multiplier': (0.0005, 0.002),
+    'agent_income_ceiling': (0.5, 2.0),
+    'demand_multiplier': (0.05, 0.2),
+    'tax_rate': (0.0, 0.05),
+    'resource_capacity_multiplier': (0.001, 0.01),
+    'imbalance_strength': (0.0, 1.0)
+}
+# Constants that only take whole values; samples are rounded to the nearest integer
+INTEGER_PARAMETERS: Tuple[str, ...] = ('num_agents', 'num_resources')
+# Outputs of run_simulation that are analyzed
+OUTPUT_METRICS: Tuple[str, ...] = ('avg_final_balance', 'gini_coefficient', 'num_bankruptcies', 'avg_final_resource_price')
+# The reference engine reads most constants at import time; the array-backed engine takes all of them from params
+SENSITIVITY_BASE_PARAMS: Dict[str, Any] = {'engine': 'vectorized'}
+
+def scale_samples(unit_samples: np.ndarray, names: Sequence[str], bounds: Optional[Dict[str, Tuple[float, float]]] = None) -> List[Dict[str, Any]]:
+    """
+    Maps points of the unit hypercube to parameter overrides.
+
+    Args:
+        unit_samples (np.ndarray): (num_points, len(names)) samples in [0, 1].
+        names (Sequence[str]): The parameter of each column.
+        bounds (Optional[Dict[str, Tuple[float, float]]]): Parameter ranges; defaults to SENSITIVITY_BOUNDS.
+
+    Returns:
+        List[Dict[str, Any]]: One params dict per point.
+    """
+    bounds = bounds or SENSITIVITY_BOUNDS
+    lower = np.array([bounds[name][0] for name in names], dtype=float)
+    upper = np.array([bounds[name][1] for name in names], dtype=float)
+    values = lower + unit_samples * (upper - lower)
+    points = []
+    for row in values:
+        points.append({name: int(round(value)) if name in INTEGER_PARAMETERS else float(value) for name, value in zip(names, row)})
+    return points
+
+def morris_sample(num_params: int, num_trajectories: int, num_levels: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generates Morris trajectories on a num_levels grid of the unit hypercube.
+
+    Each trajectory starts at a random grid point and moves every parameter
+    once, in random order, by delta = num_levels / (2 * (num_levels - 1)) up
+    or down, so consecutive points differ in exactly one parameter.
+
+    Args:
+        num_params (int): The number of parameters k.
+        num_trajectories (int): The number of trajectories r.
+        num_levels (int): The number of grid levels p; must be even.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        np.ndarray: (r * (k + 1), k) points, trajectory by trajectory.
+    """
+    if num_levels < 2 or num_levels % 2:
+        raise ValueError(f"Number of levels must be even and at least 2, got {num_levels}")
+    delta = num_levels / (2 * (num_levels - 1))
+    base = rng.integers(0, num_levels // 2, size=(num_trajectories, num_params)) / (num_levels - 1)
+    direction = rng.choice([-1.0, 1.0], size=(num_trajectories, num_params))
+    order = np.argsort(rng.uniform(size=(num_trajectories, num_params)), axis=1)
+    trajectories = np.empty((num_trajectories, num_params + 1, num_params))
+    trajectories[:, 0] = np.where(direction > 0, base, base + delta)
+    rows = np.arange(num_trajectories)
+    for step in range(num_params):
+        trajectories[:, step + 1] = trajectories[:, step]
+        moved = order[:, step]
+        trajectories[rows, step + 1, moved] += direction[rows, moved] * delta
+    return trajectories.reshape(-1, num_params)
+
+def morris_indices(samples: np.ndarray, outputs: np.ndarray, num_trajectories: int) -> Dict[str, np.ndarray]:
+    """
+    Computes Morris statistics from the outputs along each trajectory.
+
+    Args:
+        samples (np.ndarray): (r * (k + 1), k) points from morris_sample.
+        outputs (np.ndarray): (r * (k + 1), num_outputs) model outputs at those points.
+        num_trajectories (int): The number of trajectories r.
+
+    Returns:
+        Dict[str, np.ndarray]: 'mu', 'mu_star' and 'sigma', each (k, num_outputs): the mean,
+            mean absolute value and standard deviation of the elementary effects per unit range.
+    """
+    num_params = samples.shape[1]
+    points = samples.reshape(num_trajectories, num_params + 1, num_params)
+    values = outputs.reshape(num_trajectories, num_params + 1, -1)
+    moves = np.diff(points, axis=1)
+    moved = np.abs(moves).argmax(axis=2)
+    step_size = np.take_along_axis(moves, moved[:, :, None], axis=2)
+    effects = np.empty((num_trajectories, num_params, values.shape[2]))
+    rows = np.arange(num_trajectories)[:, None]
+    effects[rows, moved] = np.diff(values, axis=1) / step_size
+    return {
+        'mu': effects.mean(axis=0),
+        'mu_star': np.abs(effects).mean(axis=0),
+        'sigma': effects.std(axis=0, ddof=1) if num_trajectories > 1 else np.zeros(effects.shape[1:])
+    }
+
+def saltelli_sample(num_params: int, num_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generates Saltelli's design for first-order and total Sobol indices.
+
+    Args:
+        num_params (int): The number of parameters k.
+        num_samples (int): The base sample size N.
+        rng (np.random.Generator): The random number generator.
+
+    Returns:
+        np.ndarray: (N * (k + 2), k) points in the unit hypercube: the base samples A and B
+            followed by AB_1 ... AB_k, where AB_i is A with column i taken from B.
+    """
+    a = rng.uniform(size=(num_samples, num_params))
+    b = rng.uniform(size=(num_samples, num_params))
+    ab = np.repeat(a[None], num_params, axis=0)
+    columns = np.arange(num_params)
+    ab[columns, :, columns] = b[:, columns].T
+    return np.concatenate((a, b, ab.reshape(-1, num_params)))
+
+def sobol_indices(outputs: np.ndarray, num_params: int) -> Dict[str, np.ndarray]:
+    """
+    Estimates first-order and total Sobol indices from outputs on a Saltelli design.
+
+    Args:
+        outputs (np.ndarray): (N * (k + 2), num_outputs) model outputs at the saltelli_sample points.
+        num_params (int): The number of parameters k.
+
+    Returns:
+        Dict[str, np.ndarray]: 'first_order' and 'total', each (k, num_outputs); zero for outputs
+            that do not vary.
+    """
+    values = outputs.reshape(num_params + 2, -1, outputs.shape[1])
+    f_a, f_b, f_ab = values[0], values[1], values[2:]
+    variance = np.var(np.concatenate((f_a, f_b)), axis=0)
+    first_order = np.mean(f_b * (f_ab - f_a), axis=1)
+    total = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1)
+    return {
+        'first_order': np.divide(first_order, variance, out=np.zeros_like(first_order), where=variance > 0),
+        'total': np.divide(total, variance, out=np.zeros_like(total), where=variance > 0)
+    }
+
+def evaluate_points(points: List[Dict[str, Any]], base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[int] = (0,), **execution) -> np.ndarray:
+    """
+    Runs the simulation at every design point as one batch of work items.
+
+    Identical design points share a work item ID, so each is run once per
+    seed. Base parameters with callable schedules run in this process only.
+
+    Args:
+        points (List[Dict[str, Any]]): Parameter overrides of each design point.
+        base_params (Optional[Dict[str, Any]]): Parameters applied to every point; defaults to SENSITIVITY_BASE_PARAMS.
+        seeds (Sequence[int]): Seeds every point is run with; outputs are averaged over them.
+        **execution: Passed to run_work_items (queue_dir, local_workers, cache_dir, ...).
+
+    Returns:
+        np.ndarray: (len(points), len(OUTPUT_METRICS)) outputs of each point.
+    """
+    base_params = SENSITIVITY_BASE_PARAMS if base_params is None else base_params
+    items = []
+    for index, point in enumerate(points):
+        for seed_index, seed in enumerate(seeds):
+            params = dict(base_params, **point, seed=seed)
+            items.append(to_jsonable({
+                'id': work_item_id("sensitivity", params, f"{index:06d}-{seed_index:04d}"),
+                'params': params
+            }))
+    results_by_id = run_work_items(items, **execution)
+    outputs = np.array([[results_by_id[item['id']][metric] for metric in OUTPUT_METRICS] for item in items], dtype=float)
+    return outputs.reshape(len(points), len(seeds), -1).mean(axis=1)
+
+def _by_parameter(names: Sequence[str], statistics: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Arranges (k, num_outputs) statistics as {parameter: {metric: {statistic: value}}}."""
+    return {
+        name: {
+            metric: {statistic: float(values[i, j]) for statistic, values in statistics.items()}
+            for j, metric in enumerate(OUTPUT_METRICS)
+        }
+        for i, name in enumerate(names)
+    }
+
+def morris_screening(names: Optional[Sequence[str]] = None, num_trajectories: int = 10, num_levels: int = 4, base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[int] = (0,), bounds: Optional[Dict[str, Tuple[float, float]]] = None, sample_seed: Optional[int] = 0, queue_dir: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS, poll_interval: float = 1.0, local_workers: int = 0, start_method: Optional[str] = None, cache_dir: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Screens the constants with Morris elementary effects.
+
+    Args:
+        names (Optional[Sequence[str]]): Parameters to vary; defaults to every key of bounds.
+        num_trajectories (int): The number of trajectories; the analysis costs
+            num_trajectories * (len(names) + 1) * len(seeds) runs.
+        num_levels (int): The number of grid levels per parameter.
+        base_params (Optional[Dict[str, Any]]): Parameters applied to every run; defaults to SENSITIVITY_BASE_PARAMS.
+        seeds (Sequence[int]): Seeds every design point is run with.
+        bounds (Optional[Dict[str, Tuple[float, float]]]): Parameter ranges; defaults to SENSITIVITY_BOUNDS.
+        sample_seed (Optional[int]): Seed of the design's random number generator.
+        queue_dir, lease_seconds, poll_interval, local_workers, start_method, cache_dir: Execution
+            options, as accepted by run_experiments.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: 'mu', 'mu_star' and 'sigma' of every output metric, by parameter.
+    """
+    bounds = bounds or SENSITIVITY_BOUNDS
+    names = list(names or bounds)
+    samples = morris_sample(len(names), num_trajectories, num_levels, np.random.default_rng(sample_seed))
+    logging.info(f"Morris screening of {len(names)} parameters: {len(samples) * len(seeds)} runs")
+    outputs = evaluate_points(scale_samples(samples, names, bounds), base_params, seeds, queue_dir=queue_dir, lease_seconds=lease_seconds, poll_interval=poll_interval, local_workers=local_workers, start_method=start_method, cache_dir=cache_dir)
+    return _by_parameter(names, morris_indices(samples, outputs, num_trajectories))
+
+def sobol_analysis(names: Optional[Sequence[str]] = None, num_samples: int = 64, base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[int] = (0,), bounds: Optional[Dict[str, Tuple[float, float]]] = None, sample_seed: Optional[int] = 0, queue_dir: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE_SECONDS, poll_interval: float = 1.0, local_workers: int = 0, start_method: Optional[str] = None, cache_dir: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Estimates first-order and total Sobol indices of the constants.
+
+    Args:
+        names (Optional[Sequence[str]]): Parameters to vary; defaults to every key of bounds.
+        num_samples (int): The base sample size N; the analysis costs N * (len(names) + 2) * len(seeds) runs.
+        base_params (Optional[Dict[str, Any]]): Parameters applied to every run; defaults to SENSITIVITY_BASE_PARAMS.
+        seeds (Sequence[int]): Seeds every design point is run with.
+        bounds (Optional[Dict[str, Tuple[float, float]]]): Parameter ranges; defaults to SENSITIVITY_BOUNDS.
+        sample_seed (Optional[int]): Seed of the design's random number generator.
+        queue_dir, lease_seconds, poll_interval, local_workers, start_method, cache_dir: Execution
+            options, as accepted by run_experiments.
+
+    Returns:
+        Dict[str, Dict[str, Dict[str, float]]]: 'first_order' and 'total' indices of every output metric, by parameter.
+    """
+    bounds = bounds or SENSITIVITY_BOUNDS
+    names = list(names or bounds)
+    samples = saltelli_sample(len(names), num_samples, np.random.default_rng(sample_seed))
+    logging.info(f"Sobol analysis of {len(names)} parameters: {len(samples) * len(seeds)} runs")
+    outputs = evaluate_points(scale_samples(samples, names, bounds), base_params, seeds, queue_dir=queue_dir, lease_seconds=lease_seconds, poll_interval=poll_interval, local_workers=local_workers, start_method=start_method, cache_dir=cache_dir)
+    return _by_parameter(names, sobol_indices(outputs, len(names)))
+
+def log_sensitivity(indices: Dict[str, Dict[str, Dict[str, float]]], metric: str, statistic: str) -> List[Tuple[str, float]]:
+    """
+    Logs the parameters ranked by one statistic of one output metric.
+
+    Args:
+        indices (Dict[str, Dict[str, Dict[str, float]]]): The result of morris_screening or sobol_analysis.
+        metric (str): The output metric, e.g. 'gini_coefficient'.
+        statistic (str): The statistic to rank by, e.g. 'mu_star' or 'total'.
+
+    Returns:
+        List[Tuple[str, float]]: (parameter, value) pairs, most influential first.
+    """
+    ranking = sorted(((name, stats[metric][statistic]) for name, stats in indices.items()), key=lambda pair: -abs(pair[1]))
+    logging.info(f"Sensitivity of {metric} by {statistic}:")
+    for name, value in ranking:
+        logging.info(f"  {name}: {value:.4g}")
+    return ranking
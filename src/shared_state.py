@@ -0,0 +1,280 @@
+"""
+Shared-memory simulation state for parallel workers and live readers.
+
+This module keeps the array-backed simulation state (agent IDs, balances,
+demand preferences, type codes and the resource arrays) in a single
+multiprocessing.shared_memory block instead of process-private memory.
+Other processes attach to the block by name through a small picklable
+handle and see the same arrays zero-copy, so moving state between
+processes never pickles agent objects and the state exists only once in
+memory, however many processes look at it.
+
+Key functionality includes:
+- SharedArrays: named, aligned NumPy arrays laid out in one shared memory block
+- SharedSimulation: a vectorized run whose state lives in shared memory
+- SharedStateReader: a read-only view of a live run from another process,
+  with consistent snapshots taken under a sequence lock
+- attach_population: zero-copy Population/ResourcePool views for workers
+
+The writer increments a sequence counter before and after every step, so a
+reader can tell whether its copy was taken while a step was in progress and
+retry. Agents removed by bankruptcy are compacted in place, new agents enter
+in the freed slots, and the number of live agents is published with every step.
+"""
+import os
+import sys
+import time
+import numpy as np
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+from .config import effective_config
+from .network import build_trade_network
+from .policy import PolicySchedule
+from .vectorized import Population, ResourcePool, TypeTable, inequality_tracker, state_dtype, vectorized_step
+
+ALIGNMENT: int = 64
+POPULATION_ARRAYS: Tuple[str, ...] = ('agent_id', 'balance', 'preference', 'type_code')
+RESOURCE_ARRAYS: Tuple[str, ...] = ('capacity', 'load', 'price')
+# Header fields: sequence counter (odd while a step is being written), step number, live agents
+HEADER_SEQUENCE: int = 0
+HEADER_STEP: int = 1
+HEADER_COUNT: int = 2
+
+# Names of the blocks created by this process, which stay registered with its resource tracker
+_created_blocks: set = set()
+
+class SharedArrays:
+    """
+    Represents a set of named NumPy arrays stored in one shared memory block.
+    """
+    def __init__(self, shm: shared_memory.SharedMemory, layout: List[Tuple[str, Tuple[int, ...], str, int]], owner: bool):
+        """
+        Wraps a shared memory block with a known layout.
+
+        Args:
+            shm (shared_memory.SharedMemory): The shared memory block.
+            layout (List[Tuple[str, Tuple[int, ...], str, int]]): (name, shape, dtype, offset) of each array.
+            owner (bool): Whether this process created the block and unlinks it on close.
+        """
+        self.shm: shared_memory.SharedMemory = shm
+        self.layout: List[Tuple[str, Tuple[int, ...], str, int]] = layout
+        self.owner: bool = owner
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for name, shape, dtype, offset in layout
+        }
+
+    @classmethod
+    def create(cls, specs: Dict[str, Tuple[Tuple[int, ...], Any]]) -> "SharedArrays":
+        """
+        Allocates a new zero-filled block for the given arrays.
+
+        Args:
+            specs (Dict[str, Tuple[Tuple[int, ...], Any]]): The shape and dtype of each named array.
+
+        Returns:
+            SharedArrays: The new arrays, owned by this process.
+        """
+        layout = []
+        offset = 0
+        for name, (shape, dtype) in specs.items():
+            dtype = np.dtype(dtype)
+            layout.append((name, tuple(int(n) for n in shape), dtype.str, offset))
+            size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+            offset += -(-size // ALIGNMENT) * ALIGNMENT
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        _created_blocks.add(shm.name)
+        shared = cls(shm, layout, owner=True)
+        for values in shared.arrays.values():
+            values.fill(0)
+        return shared
+
+    @classmethod
+    def attach(cls, handle: Dict[str, Any]) -> "SharedArrays":
+        """
+        Attaches to a block created by another process.
+
+        Args:
+            handle (Dict[str, Any]): The block's handle, as returned by SharedArrays.handle.
+
+        Returns:
+            SharedArrays: Views of the block's arrays; closing them leaves the block in place.
+        """
+        # Attaching registers a POSIX block with this process's resource tracker, which would
+        # unlink it when this process exits; only the creating process should do that
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=handle['name'], track=handle['name'] in _created_blocks)
+        else:
+            shm = shared_memory.SharedMemory(name=handle['name'])
+            if os.name == "posix" and shm.name not in _created_blocks:
+                # The tracker keys blocks by their POSIX name, which has a leading slash
+                resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+        return cls(shm, [tuple(entry) for entry in handle['layout']], owner=False)
+
+    @property
+    def handle(self) -> Dict[str, Any]:
+        """A small picklable description of the block that other processes can attach to."""
+        return {'name': self.shm.name, 'layout': self.layout}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def close(self) -> None:
+        """Releases this process's views and, if it owns the block, frees the block."""
+        self.arrays.clear()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            _created_blocks.discard(self.shm.name)
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def state_specs(num_agents: int, num_resources: int, dtype: Any = np.float64) -> Dict[str, Tuple[Tuple[int, ...], Any]]:
+    """Returns the shared array specs for a run's population and resources, with float state in dtype."""
+    return {
+        'header': ((3,), np.int64),
+        'agent_id': ((num_agents,), np.int64),
+        'balance': ((num_agents,), dtype),
+        'preference': ((num_agents, num_resources), dtype),
+        'type_code': ((num_agents,), np.int8),
+        'capacity': ((num_resources,), dtype),
+        'load': ((num_resources,), dtype),
+        'price': ((num_resources,), dtype)
+    }
+
+def attach_population(shared: SharedArrays) -> Tuple[Population, ResourcePool]:
+    """
+    Returns zero-copy views of the live population and resources in a shared block.
+
+    Args:
+        shared (SharedArrays): A block laid out by state_specs.
+
+    Returns:
+        Tuple[Population, ResourcePool]: Views of the first header-count agents and of the resources.
+    """
+    count = int(shared['header'][HEADER_COUNT])
+    population = Population(*(shared[name] for name in POPULATION_ARRAYS), count=count)
+    resources = ResourcePool.__new__(ResourcePool)
+    for name in RESOURCE_ARRAYS:
+        setattr(resources, name, shared[name])
+    return population, resources
+
+class SharedSimulation:
+    """
+    Represents a vectorized simulation run whose state lives in shared memory.
+    """
+    def __init__(self, params: Dict[str, Any]):
+        """
+        Initializes the run and moves its state into a new shared memory block.
+
+        Args:
+            params (Dict[str, Any]): Simulation parameters, as accepted by run_simulation.
+        """
+        self.config: Dict[str, Any] = effective_config(params)
+        self.rng: np.random.Generator = np.random.default_rng(self.config.get('seed'))
+        population = Population.initialize(self.config, self.rng)
+        resources = ResourcePool(self.config)
+        self.shared: SharedArrays = SharedArrays.create(state_specs(len(population), self.config['num_resources'], state_dtype(self.config)))
+        for name in POPULATION_ARRAYS:
+            self.shared[name][...] = getattr(population, name)
+        for name in RESOURCE_ARRAYS:
+            self.shared[name][...] = getattr(resources, name)
+        self.shared['header'][HEADER_COUNT] = len(population)
+        self.population, self.resources = attach_population(self.shared)
+        self.types: TypeTable = TypeTable(self.config)
+        self.policy: PolicySchedule = PolicySchedule(params, self.config['simulation_steps'])
+        self.network = build_trade_network(self.config, rng=self.rng)
+        self.tracker = inequality_tracker(self.config, self.population)
+        self.step_num: int = 0
+
+    @property
+    def handle(self) -> Dict[str, Any]:
+        """The handle readers and workers attach to."""
+        return self.shared.handle
+
+    def step(self) -> Dict[str, Any]:
+        """Runs one step in place in shared memory and publishes it; returns the step metrics."""
+        header = self.shared['header']
+        header[HEADER_SEQUENCE] += 1
+        metrics = vectorized_step(self.population, self.resources, self.types, self.config, self.step_num, self.policy, self.rng, self.network, self.tracker)
+        header[HEADER_COUNT] = len(self.population)
+        header[HEADER_STEP] = self.step_num
+        header[HEADER_SEQUENCE] += 1
+        self.step_num += 1
+        return metrics
+
+    def run(self, on_step: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Runs the remaining steps of the run and returns the last step's metrics."""
+        metrics = {}
+        while self.step_num < self.config['simulation_steps']:
+            metrics = self.step()
+            if on_step is not None:
+                on_step(metrics)
+        return metrics
+
+    def close(self) -> None:
+        """Frees the shared memory block."""
+        self.population = self.resources = None
+        self.shared.close()
+
+    def __enter__(self) -> "SharedSimulation":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class SharedStateReader:
+    """
+    Represents a read-only view of a live simulation from another process.
+    """
+    def __init__(self, handle: Dict[str, Any]):
+        """
+        Attaches to a running simulation's shared state.
+
+        Args:
+            handle (Dict[str, Any]): The SharedSimulation.handle of the run.
+        """
+        self.shared: SharedArrays = SharedArrays.attach(handle)
+
+    def snapshot(self, max_wait: float = 1.0) -> Dict[str, Any]:
+        """
+        Copies a consistent snapshot of the live state, retrying while a step is being written.
+
+        Args:
+            max_wait (float): Seconds to keep retrying before giving up.
+
+        Returns:
+            Dict[str, Any]: The 'step', live agents' arrays and resource arrays, copied out of shared memory.
+
+        Raises:
+            TimeoutError: If no consistent snapshot could be taken within max_wait.
+        """
+        header = self.shared['header']
+        deadline = time.monotonic() + max_wait
+        while True:
+            sequence = int(header[HEADER_SEQUENCE])
+            if sequence % 2 == 0:
+                count = int(header[HEADER_COUNT])
+                snapshot: Dict[str, Any] = {name: self.shared[name][:count].copy() for name in POPULATION_ARRAYS}
+                snapshot.update({name: self.shared[name].copy() for name in RESOURCE_ARRAYS})
+                snapshot['step'] = int(header[HEADER_STEP])
+                if int(header[HEADER_SEQUENCE]) == sequence:
+                    return snapshot
+            if time.monotonic() > deadline:
+                raise TimeoutError("Timed out waiting for a consistent snapshot")
+            time.sleep(0)
+
+    def close(self) -> None:
+        """Detaches from the shared state."""
+        self.shared.close()
+
+    def __enter__(self) -> "SharedStateReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -9,7 +9,8 @@ evolution over time.
 The simulation engine handles:
 - Agent actions (resource requests, consumption, payments)
 - Resource dynamics (pricing, allocation, regeneration)
-- Economic policies (taxation, wealth redistribution)
+- Economic policies (taxation, wealth redistribution), optionally scheduled over time
+- Agent-to-agent trading over a sparse interaction network
 - Agent maintenance (income, expenses, needs adjustment)
 - Bankruptcy detection and agent lifecycle management
 - Comprehensive metrics tracking and reporting
@@ -17,19 +18,22 @@ The simulation engine handles:
 The module provides both step-by-step simulation control and complete
 simulation runs with configurable parameters for experimentation.
 """
+import random
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional, Callable
 
-from .constants import NUM_RESOURCES, TAX_RATE, NUM_AGENTS
-from .helpers import update_resource_prices, get_resource_prices, get_resource_availability, get_agent_requests, allocate_resources, deallocate_resources, regenerate_resources, adjust_agent_needs, adjust_agent_demand_multiplier, add_agent_income, add_agent_expense, check_agent_bankruptcies, tax_agents, redistribute_wealth, adjust_resource_capacity, get_agent_balances, get_total_economic_output, calculate_gini_coefficient, get_resource_load_and_prices
+from .constants import NUM_RESOURCES, NUM_AGENTS, SIMULATION_STEPS, INITIAL_IMBALANCE, IMBALANCE_STRENGTH, ENGINE, NUM_REGIONS
+from .helpers import update_resource_prices, get_resource_prices, get_resource_availability, get_agent_requests, allocate_resources, deallocate_resources, regenerate_resources, adjust_agent_needs, add_agent_income, add_agent_expense, check_agent_bankruptcies, tax_agents, redistribute_wealth, adjust_resource_capacity, get_agent_balances, get_total_economic_output, calculate_gini_coefficient, get_resource_load_and_prices
 from .models import Agent, Resource
+from .network import CSRGraph, build_trade_network, trade_transfers
+from .policy import PolicySchedule
 
-def _apply_agent_actions(agents: List[Agent], resources: List[Resource], step_num: int, params: Dict[str, Any]) -> Tuple[List[Agent], List[Resource]]:
+def _apply_agent_actions(agents: List[Agent], resources: List[Resource], step_num: int, params: Dict[str, Any], policy: Dict[str, float]) -> Tuple[List[Agent], List[Resource]]:
     """Applies agent actions, including requesting, consuming, and paying for resources."""
     update_resource_prices(resources)
     resource_prices = get_resource_prices(resources)
     resource_availability = get_resource_availability(resources)
-    all_requests = get_agent_requests(agents, resource_prices, resource_availability)
+    all_requests = get_agent_requests(agents, resource_prices, resource_availability, policy['demand_multiplier'])
     allocate_resources(resources, all_requests)
     return agents, resources
 
@@ -42,20 +46,32 @@ def _apply_resource_dynamics(agents: List[Agent], resources: List[Resource], par
     adjust_resource_capacity(resources, total_economic_output)
     return resources
 
-def _apply_economic_policies(agents: List[Agent], resources: List[Resource], params: Dict[str, Any]) -> Tuple[List[Agent], float]:
+def _apply_economic_policies(agents: List[Agent], resources: List[Resource], params: Dict[str, Any], policy: Dict[str, float]) -> Tuple[List[Agent], float]:
     """Applies economic policies, including taxation and wealth redistribution."""
-    tax_rate = params.get('tax_rate', TAX_RATE)
-    total_taxes = tax_agents(agents, tax_rate, resources)
+    total_taxes = tax_agents(agents, policy['tax_rate'], resources)
     redistribute_wealth(agents, total_taxes, resources)
     return agents, total_taxes
 
-def _apply_agent_maintenance(agents: List[Agent], resources: List[Resource], step_num: int, params: Dict[str, Any]) -> List[Agent]:
-    """Applies agent maintenance, including adjusting needs, demand, income, and expenses."""
+def _apply_trading(agents: List[Agent], network: Optional[CSRGraph], policy: Dict[str, float]) -> List[Agent]:
+    """Applies agent-to-agent trading over the network, if the run has one."""
+    if network is None:
+        return agents
+    agent_ids = [agent.agent_id for agent in agents]
+    balance = np.zeros(network.num_nodes)
+    alive = np.zeros(network.num_nodes, dtype=bool)
+    balance[agent_ids] = get_agent_balances(agents)
+    alive[agent_ids] = True
+    transfers = trade_transfers(network, balance, alive, policy['trade_rate'])
+    for agent, transfer in zip(agents, transfers[agent_ids]):
+        agent.ctx_balance += transfer
+    return agents
+
+def _apply_agent_maintenance(agents: List[Agent], resources: List[Resource], step_num: int, params: Dict[str, Any], policy: Dict[str, float]) -> List[Agent]:
+    """Applies agent maintenance, including adjusting needs, income, and expenses."""
     adjust_agent_needs(agents)
-    adjust_agent_demand_multiplier(agents, step_num)
     avg_resource_price = np.mean(get_resource_prices(resources))
-    add_agent_income(agents, avg_resource_price)
-    add_agent_expense(agents)
+    add_agent_income(agents, avg_resource_price, policy['agent_income_ceiling'])
+    add_agent_expense(agents, policy['agent_expense_rate'])
     return agents
 
 def _handle_bankruptcies(agents: List[Agent]) -> List[Agent]:
@@ -64,7 +80,7 @@ def _handle_bankruptcies(agents: List[Agent]) -> List[Agent]:
     agents[:] = [agent for agent in agents if agent not in bankrupt_agents]
     return agents
 
-def simulation_step(agents: List[Agent], resources: List[Resource], step_num: int, params: Dict[str, Any]) -> Dict[str, Any]:
+def simulation_step(agents: List[Agent], resources: List[Resource], step_num: int, params: Dict[str, Any], policy: Optional[PolicySchedule] = None, network: Optional[CSRGraph] = None) -> Dict[str, Any]:
     """
     Runs a single step of the simulation.
 
@@ -73,20 +89,26 @@ def simulation_step(agents: List[Agent], resources: List[Resource], step_num: in
         resources (List[Resource]): List of resources.
         step_num (int): The current step number.
         params (Dict[str, Any]): Dictionary of simulation parameters.
+        policy (Optional[PolicySchedule]): The run's compiled policy schedules. If omitted, the
+            schedules in params are compiled for this step only.
+        network (Optional[CSRGraph]): The run's trading network over agent IDs, or None for no trading.
 
     Returns:
         Dict[str, Any]: A dictionary containing metrics for the current step.
     """
-    agents, resources = _apply_agent_actions(agents, resources, step_num, params)
+    if policy is None:
+        policy = PolicySchedule(params, step_num + 1)
+    step_policy = policy.at(step_num)
+    agents, resources = _apply_agent_actions(agents, resources, step_num, params, step_policy)
     resources = _apply_resource_dynamics(agents, resources, params)
-    agents, total_taxes_redistributed = _apply_economic_policies(agents, resources, params)
-    agents = _apply_agent_maintenance(agents, resources, step_num, params)
+    agents, total_taxes_redistributed = _apply_economic_policies(agents, resources, params, step_policy)
+    agents = _apply_trading(agents, network, step_policy)
+    agents = _apply_agent_maintenance(agents, resources, step_num, params, step_policy)
     agents = _handle_bankruptcies(agents)
 
     resource_prices = get_resource_prices(resources)
-    resource_prices_debug, resource_loads_debug = get_resource_load_and_prices(resources)
-    current_gini = calculate_gini_coefficient(get_agent_balances(agents))
     agent_balances = get_agent_balances(agents)
+    current_gini = calculate_gini_coefficient(agent_balances)
 
     return {
         "step": step_num,
@@ -94,79 +116,86 @@ def simulation_step(agents: List[Agent], resources: List[Resource], step_num: in
         "median_balance": np.median(agent_balances),
         "resource_utilization": [r.current_load/r.capacity for r in resources],
         "price_variance": np.var(resource_prices),
-        "bankruptcy_rate": len(agents)/NUM_AGENTS,
+        "bankruptcy_rate": len(agents)/params.get('num_agents', NUM_AGENTS),
         "tax_redistribution": total_taxes_redistributed,
-        "economic_output": get_total_economic_output(agents, resources)
+        "economic_output": get_total_economic_output(agents, resources),
+        "agents_alive": len(agents)
     }
 
-def run_simulation(params: Dict[str, Any]) -> Dict[str, Any]:
+def initialize_agents(num_agents: int, initial_imbalance: bool, imbalance_strength: float) -> List[Agent]:
+    """
+    Creates the initial agent population.
+
+    Args:
+        num_agents (int): The number of agents to create.
+        initial_imbalance (bool): Whether to start with an unequal wealth distribution.
+        imbalance_strength (float): Fraction of agents that start with double the initial balance;
+            the rest start with half of it.
+
+    Returns:
+        List[Agent]: The new agents, with IDs 0 to num_agents - 1.
+    """
+    agents = [Agent(i) for i in range(num_agents)]
+    if initial_imbalance:
+        for agent in agents:
+            if agent.agent_id < num_agents * imbalance_strength:
+                agent.ctx_balance *= 2
+            else:
+                agent.ctx_balance *= 0.5
+    return agents
+
+def run_simulation(params: Dict[str, Any], on_step: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
     """
     Runs the simulation with the given parameters.
 
     Args:
         params (Dict[str, Any]): A dictionary of parameters to override the default constants.
+            An optional 'seed' entry seeds both random number generators so the run is reproducible.
+            Policy parameters may be time-varying schedules (see the policy module).
+            'engine': 'vectorized' runs the array-backed engine with agent types (see the vectorized module).
+            'num_regions' above 1 runs a multi-region economy on that engine (see the regions module).
+        on_step (Optional[Callable[[Dict[str, Any]], None]]): Called with each step's metrics, e.g. MetricsServer.publish.
 
     Returns:
         Dict[str, Any]: A dictionary containing the results of the simulation.
     """
-    from constants import PRICE_ELASTICITY, RESOURCE_REGEN_RATE, INITIAL_IMBALANCE, IMBALANCE_STRENGTH, SIMULATION_STEPS, NUM_AGENTS, AGENT_EXPENSE_RATE
-    original_price_elasticity = PRICE_ELASTICITY
-    original_resource_regen_rate = RESOURCE_REGEN_RATE
-    original_initial_imbalance = INITIAL_IMBALANCE
-    original_imbalance_strength = IMBALANCE_STRENGTH
-    original_simulation_steps = SIMULATION_STEPS
-    original_num_agents = NUM_AGENTS
-    original_agent_expense_rate = AGENT_EXPENSE_RATE
-
+    if params.get('num_regions', NUM_REGIONS) > 1:
+        from .regions import run_regional_simulation
+        return run_regional_simulation(params, on_step)
+    if params.get('engine', ENGINE) == 'vectorized':
+        from .vectorized import run_vectorized_simulation
+        return run_vectorized_simulation(params, on_step)
+    seed = params.get('seed')
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
     num_agents = params.get('num_agents', NUM_AGENTS)
     simulation_steps = params.get('simulation_steps', SIMULATION_STEPS)
-    price_elasticity = params.get('price_elasticity', PRICE_ELASTICITY)
-    resource_regen_rate = params.get('resource_regen_rate', RESOURCE_REGEN_RATE)
-    tax_rate = params.get('tax_rate', TAX_RATE)
     initial_imbalance = params.get('initial_imbalance', INITIAL_IMBALANCE)
     imbalance_strength = params.get('imbalance_strength', IMBALANCE_STRENGTH)
-    agent_expense_rate = params.get('agent_expense_rate', AGENT_EXPENSE_RATE)
-
-    PRICE_ELASTICITY = price_elasticity
-    RESOURCE_REGEN_RATE = resource_regen_rate
-    INITIAL_IMBALANCE = initial_imbalance
-    IMBALANCE_STRENGTH = imbalance_strength
-    SIMULATION_STEPS = simulation_steps
-    NUM_AGENTS = num_agents
-    AGENT_EXPENSE_RATE = agent_expense_rate
-    agents_list = [Agent(i) for i in range(num_agents)]
-    resources_list = [Resource(i) for i in range(NUM_RESOURCES)]
 
-    if INITIAL_IMBALANCE:
-        for agent in agents_list:
-            if agent.agent_id < NUM_AGENTS * IMBALANCE_STRENGTH:
-                agent.ctx_balance *= 2
-            else:
-                agent.ctx_balance *= 0.5
+    agents_list = initialize_agents(num_agents, initial_imbalance, imbalance_strength)
+    resources_list = [Resource(i) for i in range(NUM_RESOURCES)]
+    policy = PolicySchedule(params, simulation_steps)
+    network = build_trade_network(params, num_agents)
 
     agent_balances_history = []
     resource_prices_history = []
     step_metrics = {}
 
-    for step in range(SIMULATION_STEPS):
-        step_metrics = simulation_step(agents_list, resources_list, step, params)
+    for step in range(simulation_steps):
+        step_metrics = simulation_step(agents_list, resources_list, step, params, policy, network)
+        if on_step is not None:
+            on_step(step_metrics)
         agent_balances_history.append(get_agent_balances(agents_list))
         resource_prices_history.append(get_resource_prices(resources_list))
 
     final_balances = get_agent_balances(agents_list)
     avg_final_balance = np.mean(final_balances)
     gini_coefficient = calculate_gini_coefficient(final_balances)
-    num_bankruptcies = original_num_agents - len(agents_list)
+    num_bankruptcies = num_agents - len(agents_list)
     avg_final_resource_price = np.mean(resource_prices_history[-1]) if resource_prices_history else np.nan
 
-    PRICE_ELASTICITY = original_price_elasticity
-    RESOURCE_REGEN_RATE = original_resource_regen_rate
-    INITIAL_IMBALANCE = original_initial_imbalance
-    IMBALANCE_STRENGTH = original_imbalance_strength
-    SIMULATION_STEPS = original_simulation_steps
-    NUM_AGENTS = original_num_agents
-    AGENT_EXPENSE_RATE = original_agent_expense_rate
-
     return {
         'avg_final_balance': avg_final_balance,
         'gini_coefficient': gini_coefficient,
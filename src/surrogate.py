@@ -0,0 +1,371 @@
+"""
+Surrogate emulator of run_simulation for instant what-if queries.
+
+This module fits a Gaussian process regression model to simulation results
+that have already been computed, such as a sweep from run_experiments or the
+result shards of a work queue, and answers queries from the model instead of
+from new runs. A prediction is a few dot products with the training set, so
+a query takes microseconds, and every prediction comes with a standard
+deviation that says how far the model can be trusted at that point.
+
+Where the uncertainty is too high the surrogate falls back to the simulation
+itself: query runs the real simulation at the point and adds the result to
+the training set, refine runs batches of simulations where the model is least
+certain, and feasible_values checks the uncertain points of a what-if scan
+with real runs before answering. Real runs go through the batched execution
+path of the sensitivity module, so they can use workers and the result cache.
+
+Key functionality includes:
+- GaussianProcess: NumPy-only GP regression with an anisotropic RBF kernel
+  and hyperparameters fitted by maximizing the marginal likelihood
+- Surrogate: per-metric GPs over named parameters, built from stored results
+- Uncertainty-driven requests for real simulations (query, refine)
+- What-if scans such as the tax rates that keep bankruptcies below a limit
+"""
+import itertools
+import numpy as np
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .config import effective_config
+from .sensitivity import SENSITIVITY_BOUNDS, OUTPUT_METRICS, evaluate_points, scale_samples
+from .work_queue import WorkQueue, to_jsonable
+
+# --- Gaussian Process ---
+LENGTH_SCALE_GRID: np.ndarray = np.logspace(-1.5, 1.0, 11)
+NOISE_GRID: np.ndarray = np.logspace(-6, 0, 7)
+JITTER: float = 1e-8
+# Default largest standard deviation of a prediction, relative to the spread of the training outputs
+DEFAULT_TOLERANCE: float = 0.1
+
+class GaussianProcess:
+    """
+    Represents a Gaussian process regression model on inputs scaled to the unit hypercube.
+    """
+    def __init__(self, length_scales: Optional[np.ndarray] = None, noise: Optional[float] = None):
+        """
+        Initializes an unfitted model.
+
+        Args:
+            length_scales (Optional[np.ndarray]): Kernel length scale of each input; fitted if omitted.
+            noise (Optional[float]): Noise variance relative to the output variance; fitted if omitted.
+        """
+        self.length_scales: Optional[np.ndarray] = length_scales
+        self.noise: Optional[float] = noise
+        self.fixed: bool = length_scales is not None and noise is not None
+
+    @staticmethod
+    def _kernel(a: np.ndarray, b: np.ndarray, length_scales: np.ndarray) -> np.ndarray:
+        """Returns the RBF kernel matrix between the rows of a and b."""
+        a = a / length_scales
+        b = b / length_scales
+        distances = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2 * a @ b.T
+        return np.exp(-0.5 * np.maximum(distances, 0.0))
+
+    @classmethod
+    def log_marginal_likelihood(cls, x: np.ndarray, y: np.ndarray, length_scales: np.ndarray, noise: float) -> float:
+        """Returns the log marginal likelihood of standardized outputs y under the given hyperparameters."""
+        kernel = cls._kernel(x, x, length_scales) + (noise + JITTER) * np.eye(len(x))
+        try:
+            cholesky = np.linalg.cholesky(kernel)
+        except np.linalg.LinAlgError:
+            return -np.inf
+        alpha = np.linalg.solve(cholesky.T, np.linalg.solve(cholesky, y))
+        return float(-0.5 * y @ alpha - np.log(np.diag(cholesky)).sum() - 0.5 * len(x) * np.log(2 * np.pi))
+
+    def _fit_hyperparameters(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Maximizes the marginal likelihood: an isotropic grid search, then coordinate sweeps per input."""
+        score = lambda scales, noise: self.log_marginal_likelihood(x, y, scales, noise)
+        num_inputs = x.shape[1]
+        best = max(((np.full(num_inputs, scale), noise) for scale, noise in itertools.product(LENGTH_SCALE_GRID, NOISE_GRID)), key=lambda h: score(*h))
+        length_scales, noise = best
+        best_score = score(length_scales, noise)
+        for _ in range(2):
+            for i in range(num_inputs):
+                for scale in LENGTH_SCALE_GRID:
+                    candidate = length_scales.copy()
+                    candidate[i] = scale
+                    candidate_score = score(candidate, noise)
+                    if candidate_score > best_score:
+                        length_scales, best_score = candidate, candidate_score
+            for candidate_noise in NOISE_GRID:
+                candidate_score = score(length_scales, candidate_noise)
+                if candidate_score > best_score:
+                    noise, best_score = candidate_noise, candidate_score
+        self.length_scales, self.noise = length_scales, float(noise)
+
+    def fit(self, x: np.ndarray, y: np.ndarray) -> "GaussianProcess":
+        """
+        Fits the model to training data.
+
+        Args:
+            x (np.ndarray): (n, d) training inputs in the unit hypercube.
+            y (np.ndarray): (n,) training outputs.
+
+        Returns:
+            GaussianProcess: The fitted model.
+        """
+        self.x: np.ndarray = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.y_mean: float = float(y.mean())
+        self.y_scale: float = float(y.std()) or 1.0
+        standardized = (y - self.y_mean) / self.y_scale
+        if not self.fixed:
+            self._fit_hyperparameters(self.x, standardized)
+        kernel = self._kernel(self.x, self.x, self.length_scales) + (self.noise + JITTER) * np.eye(len(self.x))
+        # The explicit inverse turns every prediction into dot products
+        self.kernel_inverse: np.ndarray = np.linalg.inv(kernel)
+        self.alpha: np.ndarray = self.kernel_inverse @ standardized
+        self.scaled_x: np.ndarray = self.x / self.length_scales
+        return self
+
+    def predict(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predicts the outputs at new inputs.
+
+        Args:
+            x (np.ndarray): (m, d) inputs in the unit hypercube.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (m,) predictive means and standard deviations of the
+                noise-free output.
+        """
+        cross = self._kernel(np.atleast_2d(x), self.x, self.length_scales)
+        mean = cross @ self.alpha
+        variance = 1.0 - np.einsum('ij,jk,ik->i', cross, self.kernel_inverse, cross)
+        return self.y_mean + self.y_scale * mean, self.y_scale * np.sqrt(np.maximum(variance, 0.0))
+
+    def predict_one(self, x: np.ndarray) -> Tuple[float, float]:
+        """Predicts the output at a single input; the fast path for interactive queries."""
+        difference = self.scaled_x - x / self.length_scales
+        cross = np.exp(-0.5 * np.einsum('ij,ij->i', difference, difference))
+        variance = 1.0 - cross @ self.kernel_inverse @ cross
+        return self.y_mean + self.y_scale * float(cross @ self.alpha), self.y_scale * float(np.sqrt(max(variance, 0.0)))
+
+class Surrogate:
+    """
+    Represents an emulator of run_simulation's output metrics over a set of named parameters.
+    """
+    def __init__(self, names: Sequence[str], metrics: Sequence[str] = OUTPUT_METRICS, bounds: Optional[Dict[str, Tuple[float, float]]] = None, base_params: Optional[Dict[str, Any]] = None, seeds: Sequence[int] = (0,), **execution):
+        """
+        Initializes an empty surrogate.
+
+        Args:
+            names (Sequence[str]): The parameters the surrogate is a function of.
+            metrics (Sequence[str]): The run_simulation outputs it emulates.
+            bounds (Optional[Dict[str, Tuple[float, float]]]): Parameter ranges; defaults to SENSITIVITY_BOUNDS.
+            base_params (Optional[Dict[str, Any]]): Parameters of every real simulation it requests;
+                these should match the runs it is trained on.
+            seeds (Sequence[int]): Seeds of the real simulations it requests.
+            **execution: Execution options of the real simulations, as accepted by run_work_items.
+        """
+        self.names: List[str] = list(names)
+        self.metrics: List[str] = list(metrics)
+        self.bounds: Dict[str, Tuple[float, float]] = bounds or SENSITIVITY_BOUNDS
+        self.lower: np.ndarray = np.array([self.bounds[name][0] for name in self.names], dtype=float)
+        self.width: np.ndarray = np.array([self.bounds[name][1] - self.bounds[name][0] for name in self.names], dtype=float)
+        self.base_params: Dict[str, Any] = dict(base_params or {})
+        self.seeds: List[int] = list(seeds)
+        self.execution: Dict[str, Any] = execution
+        self.x: np.ndarray = np.zeros((0, len(self.names)))
+        self.y: np.ndarray = np.zeros((0, len(self.metrics)))
+        self.models: Dict[str, GaussianProcess] = {}
+        self.num_simulations: int = 0
+
+    @classmethod
+    def from_experiment_results(cls, experiment_results: Dict[str, List[Dict[str, Any]]], base_params: Optional[Dict[str, Any]] = None, **kwargs) -> "Surrogate":
+        """
+        Trains a surrogate on the results of run_experiments.
+
+        Each swept point holds its parameter at the swept value and every
+        other parameter of the sweep at its base or default value.
+
+        Args:
+            experiment_results (Dict[str, List[Dict[str, Any]]]): experimentation.experiment_results.
+            base_params (Optional[Dict[str, Any]]): The base_params the sweep was run with.
+            **kwargs: Passed to Surrogate.
+
+        Returns:
+            Surrogate: The trained surrogate over the swept parameters.
+        """
+        surrogate = cls(list(experiment_results), base_params=base_params, **kwargs)
+        config = effective_config(surrogate.base_params)
+        points, outputs = [], []
+        for param_name, results in experiment_results.items():
+            for result in results:
+                points.append(dict({name: config[name] for name in surrogate.names}, **{param_name: result['param_value']}))
+                outputs.append([result[metric] for metric in surrogate.metrics])
+        return surrogate.add(points, np.array(outputs, dtype=float))
+
+    @classmethod
+    def from_work_queue(cls, queue_dir: str, names: Sequence[str], base_params: Optional[Dict[str, Any]] = None, **kwargs) -> "Surrogate":
+        """
+        Trains a surrogate on the result shards of a work queue that belong to it.
+
+        A queue directory can hold the shards of several sweeps and analyses, so
+        only runs whose configuration equals base_params in everything except
+        names and the seed are used.
+
+        Args:
+            queue_dir (str): The work queue directory of a sweep or sensitivity analysis.
+            names (Sequence[str]): The parameters the surrogate is a function of; parameters missing
+                from a run are taken at their default value.
+            base_params (Optional[Dict[str, Any]]): The base parameters the runs share.
+            **kwargs: Passed to Surrogate.
+
+        Returns:
+            Surrogate: The trained surrogate.
+        """
+        surrogate = cls(names, base_params=base_params, **kwargs)
+        ignored = set(surrogate.names) | {'seed'}
+        base_config = {key: value for key, value in to_jsonable(effective_config(surrogate.base_params)).items() if key not in ignored}
+        points, outputs = [], []
+        for shard in WorkQueue(queue_dir).load_results():
+            config = to_jsonable(effective_config(shard['item']['params']))
+            if {key: value for key, value in config.items() if key not in ignored} != base_config:
+                continue
+            points.append({name: config[name] for name in surrogate.names})
+            outputs.append([shard['result'][metric] for metric in surrogate.metrics])
+        return surrogate.add(points, np.array(outputs, dtype=float))
+
+    def _unit(self, point: Dict[str, Any]) -> np.ndarray:
+        """Scales a point's parameters to the unit hypercube."""
+        return (np.array([point[name] for name in self.names], dtype=float) - self.lower) / self.width
+
+    def add(self, points: List[Dict[str, Any]], outputs: np.ndarray) -> "Surrogate":
+        """
+        Adds results to the training set and refits the models.
+
+        Args:
+            points (List[Dict[str, Any]]): The parameters of each result.
+            outputs (np.ndarray): (len(points), len(metrics)) metric values of each result.
+
+        Returns:
+            Surrogate: This surrogate.
+        """
+        if len(points):
+            self.x = np.vstack((self.x, [self._unit(point) for point in points]))
+            self.y = np.vstack((self.y, np.asarray(outputs, dtype=float).reshape(len(points), -1)))
+        for j, metric in enumerate(self.metrics):
+            valid = np.isfinite(self.y[:, j])
+            if valid.any():
+                self.models[metric] = GaussianProcess().fit(self.x[valid], self.y[valid, j])
+        return self
+
+    def predict(self, point: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+        """
+        Predicts the metrics at a point without running the simulation.
+
+        Args:
+            point (Dict[str, Any]): A value for every parameter in names.
+
+        Returns:
+            Dict[str, Tuple[float, float]]: The predicted (mean, standard deviation) of each metric.
+        """
+        x = self._unit(point)
+        return {metric: model.predict_one(x) for metric, model in self.models.items()}
+
+    def predict_many(self, points: List[Dict[str, Any]]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Predicts the (mean, standard deviation) arrays of each metric at many points."""
+        x = np.array([self._unit(point) for point in points])
+        return {metric: model.predict(x) for metric, model in self.models.items()}
+
+    def relative_std(self, std: np.ndarray, metric: str) -> np.ndarray:
+        """Returns standard deviations relative to the spread of a metric's training outputs."""
+        return std / self.models[metric].y_scale
+
+    def simulate(self, points: List[Dict[str, Any]]) -> np.ndarray:
+        """Runs the real simulation at the points as one batch, adds the results and returns them."""
+        outputs = evaluate_points(points, self.base_params, self.seeds, **self.execution)
+        outputs = outputs[:, [OUTPUT_METRICS.index(metric) for metric in self.metrics]]
+        self.num_simulations += len(points) * len(self.seeds)
+        self.add(points, outputs)
+        return outputs
+
+    def query(self, point: Dict[str, Any], tolerance: Optional[float] = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+        """
+        Answers a what-if query, running the simulation only if the surrogate is too uncertain.
+
+        Args:
+            point (Dict[str, Any]): A value for every parameter in names.
+            tolerance (Optional[float]): Largest acceptable standard deviation relative to the spread
+                of the training outputs; None always answers from the surrogate.
+
+        Returns:
+            Dict[str, Any]: The (mean, standard deviation) of each metric, with a standard deviation
+                of 0 for simulated results, and 'simulated', whether a real run was needed.
+        """
+        predictions = self.predict(point)
+        if tolerance is None or all(self.relative_std(std, metric) <= tolerance for metric, (_, std) in predictions.items()):
+            return dict(predictions, simulated=False)
+        outputs = self.simulate([point])[0]
+        return dict({metric: (float(value), 0.0) for metric, value in zip(self.metrics, outputs)}, simulated=True)
+
+    def refine(self, max_runs: int = 16, batch_size: int = 4, tolerance: float = DEFAULT_TOLERANCE, num_candidates: int = 2048, seed: Optional[int] = 0) -> int:
+        """
+        Runs real simulations where the surrogate is least certain until it is certain enough.
+
+        Args:
+            max_runs (int): The largest number of design points to simulate.
+            batch_size (int): Points simulated per batch between refits.
+            tolerance (float): Relative standard deviation below which no more runs are requested.
+            num_candidates (int): Random candidate points scored per batch.
+            seed (Optional[int]): Seed of the candidate generator.
+
+        Returns:
+            int: The number of design points simulated.
+        """
+        rng = np.random.default_rng(seed)
+        simulated = 0
+        while simulated < max_runs:
+            candidates = scale_samples(rng.uniform(size=(num_candidates, len(self.names))), self.names, self.bounds)
+            predictions = self.predict_many(candidates)
+            uncertainty = np.max([self.relative_std(std, metric) for metric, (_, std) in predictions.items()], axis=0)
+            order = np.argsort(-uncertainty)[:min(batch_size, max_runs - simulated)]
+            order = order[uncertainty[order] > tolerance]
+            if not len(order):
+                break
+            self.simulate([candidates[i] for i in order])
+            simulated += len(order)
+        return simulated
+
+    def feasible_values(self, name: str, metric: str, upper: Optional[float] = None, lower: Optional[float] = None, fixed: Optional[Dict[str, Any]] = None, num_points: int = 101, confidence: float = 2.0, tolerance: Optional[float] = DEFAULT_TOLERANCE, max_runs: int = 8) -> np.ndarray:
+        """
+        Finds the values of one parameter for which a metric stays within limits.
+
+        For example, the tax rates that keep bankruptcies below 5:
+        ``surrogate.feasible_values('tax_rate', 'num_bankruptcies', upper=5)``.
+        The parameter is scanned over its range with the others held fixed,
+        the most uncertain scan points are simulated (up to max_runs) and a
+        value is feasible if the metric's confidence band lies within the limits.
+
+        Args:
+            name (str): The parameter to scan.
+            metric (str): The metric to constrain.
+            upper (Optional[float]): Upper limit of the metric.
+            lower (Optional[float]): Lower limit of the metric.
+            fixed (Optional[Dict[str, Any]]): Values of the other parameters; defaults to the base configuration.
+            num_points (int): Number of scan points.
+            confidence (float): Width of the confidence band in standard deviations.
+            tolerance (Optional[float]): Relative standard deviation above which scan points are simulated.
+            max_runs (int): The largest number of scan points to simulate.
+
+        Returns:
+            np.ndarray: The feasible values of the parameter.
+        """
+        config = effective_config(self.base_params)
+        point = {other: config[other] for other in self.names}
+        point.update(fixed or {})
+        values = np.linspace(*self.bounds[name], num_points)
+        points = [dict(point, **{name: value}) for value in values]
+        mean, std = self.predict_many(points)[metric]
+        if tolerance is not None:
+            uncertain = np.flatnonzero(self.relative_std(std, metric) > tolerance)
+            if len(uncertain):
+                self.simulate([points[i] for i in uncertain[np.argsort(-std[uncertain])][:max_runs]])
+                mean, std = self.predict_many(points)[metric]
+        feasible = np.ones(num_points, dtype=bool)
+        if upper is not None:
+            feasible &= mean + confidence * std <= upper
+        if lower is not None:
+            feasible &= mean - confidence * std >= lower
+        return values[feasible]
@@ -0,0 +1,34 @@
+"""
+Unit tests for the benchmark module.
+
+This module contains tests for the throughput and worker startup
+measurements used by the ``bench`` subcommand. It verifies that both
+measurements run end to end and report sensible values, and that the
+tracked per-step Gini/median is not slower than the exact one.
+"""
+import unittest
+from src.benchmark import time_simulation, time_inequality_metrics, measure_worker_startup, available_start_methods
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_time_simulation(self):
+        timing = time_simulation({'num_agents': 5, 'simulation_steps': 4}, repeats=1)
+        self.assertGreater(timing['seconds_per_run'], 0)
+        self.assertGreater(timing['steps_per_second'], 0)
+
+    def test_tracked_inequality_is_not_slower(self):
+        metrics = time_inequality_metrics({'engine': 'vectorized', 'seed': 0, 'num_agents': 300_000, 'simulation_steps': 5})
+        self.assertLessEqual(metrics['tracker_ms_per_step'], metrics['exact_ms_per_step'])
+        self.assertLessEqual(metrics['gini_error_ratio'], 1.0)
+
+    def test_measure_worker_startup(self):
+        startup = measure_worker_startup("spawn", repeats=1)
+        self.assertGreater(startup['median'], 0)
+        self.assertLessEqual(startup['min'], startup['max'])
+
+    def test_available_start_methods(self):
+        self.assertIn("spawn", available_start_methods())
+        self.assertEqual(available_start_methods(["spawn", "no-such-method"]), ["spawn"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Unit tests for the cache module.
+
+This module contains tests for the content-addressed result cache. It
+verifies that cache keys depend on the effective configuration and seed
+rather than on how the parameters were spelled, that seeded runs are served
+from disk on repeat, and that the cache stays within its size bound.
+
+Tests cover:
+- Key stability across parameter order, NumPy types and explicit defaults
+- Key changes with the seed and with overridden parameters
+- Cache hits for repeated seeded runs and bypass for unseeded runs
+- Rejection of non-serializable parameters, which bypass the cache
+- A code version covering every source module of the package
+- Least recently used eviction in batches, with incremental size tracking
+"""
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+from unittest import mock
+from src import cache as cache_module
+from src.cache import ResultCache, cache_key, cached_run_simulation, code_version
+from src.constants import TAX_RATE
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmp_dir.name)
+        self.params = {'num_agents': 10, 'simulation_steps': 5, 'seed': 3}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_is_stable(self):
+        reordered = {'seed': np.int64(3), 'simulation_steps': 5, 'num_agents': 10}
+        self.assertEqual(cache_key(self.params), cache_key(reordered))
+        self.assertEqual(cache_key(self.params), cache_key(dict(self.params, tax_rate=TAX_RATE)))
+
+    def test_key_changes_with_seed_and_params(self):
+        key = cache_key(self.params)
+        self.assertNotEqual(key, cache_key(dict(self.params, seed=4)))
+        self.assertNotEqual(key, cache_key(dict(self.params, tax_rate=0.04)))
+
+    def test_seeded_run_is_cached(self):
+        first = cached_run_simulation(self.params, self.cache)
+        second = cached_run_simulation(self.params, self.cache)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+        self.assertAlmostEqual(first['avg_final_balance'], second['avg_final_balance'])
+        self.assertEqual(len(first['step_metrics']), len(second['step_metrics']))
+
+    def test_unseeded_run_bypasses_cache(self):
+        params = {'num_agents': 10, 'simulation_steps': 5}
+        cached_run_simulation(params, self.cache)
+        self.assertEqual((self.cache.misses, self.cache.hits), (0, 0))
+        self.assertEqual(list(os.scandir(self.tmp_dir.name)), [])
+
+    def test_non_serializable_params_bypass_cache(self):
+        params = dict(self.params, tax_rate=lambda steps: 0.02 + 0 * steps)
+        with self.assertRaises(TypeError):
+            cache_key(params)
+        cached_run_simulation(params, self.cache)
+        self.assertEqual((self.cache.misses, self.cache.hits), (0, 0))
+        self.assertEqual(list(os.scandir(self.tmp_dir.name)), [])
+
+    def test_code_version_covers_every_module(self):
+        original = cache_module.Path.read_bytes
+        read = []
+        def recording_read_bytes(path):
+            read.append(path.name)
+            return original(path)
+        code_version.cache_clear()
+        try:
+            with mock.patch.object(cache_module.Path, 'read_bytes', recording_read_bytes):
+                code_version()
+        finally:
+            code_version.cache_clear()
+        for module_name in ("trajectory.py", "shared_state.py", "golden.py", "cache.py", "__init__.py"):
+            self.assertIn(module_name, read)
+        self.assertNotIn("test_cache.py", read)
+
+    def test_lru_eviction(self):
+        cache = ResultCache(self.tmp_dir.name, max_bytes=320)
+        payload = {'data': 'x' * 100}
+        cache.put('a', payload)
+        cache.put('b', payload)
+        old_time = time.time() - 60
+        os.utime(cache._path('a'), (old_time, old_time - 1))
+        os.utime(cache._path('b'), (old_time, old_time))
+        self.assertIsNotNone(cache.get('a'))
+        cache.put('c', payload)
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(cache.total_bytes, sum(entry.stat().st_size for entry in os.scandir(self.tmp_dir.name)))
+
+    def test_eviction_runs_in_batches(self):
+        cache = ResultCache(self.tmp_dir.name, max_bytes=1000)
+        payload = {'data': 'x' * 100}
+        with mock.patch.object(cache, 'evict', wraps=cache.evict) as evict:
+            for index in range(30):
+                cache.put(f"entry{index:02d}", payload)
+        self.assertLess(evict.call_count, 10)
+        self.assertLessEqual(cache.total_bytes, 1000)
+        self.assertEqual(ResultCache(self.tmp_dir.name).total_bytes, cache.total_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
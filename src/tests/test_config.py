@@ -0,0 +1,31 @@
+"""
+Unit tests for the config module.
+
+This module contains tests for the effective run configuration. It checks
+that every constant appears under its lowercase name and that a run's
+overrides replace the defaults without changing them for later runs.
+
+Tests cover:
+- Default configuration keys and values
+- Overrides in the effective configuration
+"""
+import unittest
+from src import constants
+from src.config import default_config, effective_config
+
+class TestConfig(unittest.TestCase):
+
+    def test_default_config(self):
+        config = default_config()
+        self.assertEqual(config['num_agents'], constants.NUM_AGENTS)
+        self.assertEqual(config['tax_rate'], constants.TAX_RATE)
+        self.assertTrue(all(key.islower() for key in config))
+
+    def test_effective_config_applies_overrides(self):
+        config = effective_config({'tax_rate': 0.5})
+        self.assertEqual(config['tax_rate'], 0.5)
+        self.assertIn('num_agents', config)
+        self.assertEqual(effective_config({})['tax_rate'], constants.TAX_RATE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,10 +4,22 @@ Unit tests for the experimentation module.
 This module contains tests to verify that the parameter experimentation
 framework is properly initialized and accessible. It ensures that the
 experiment configuration and parameter ranges are correctly defined
-and can be imported without errors.
+and can be imported without errors, and that a sweep distributed over
+several local worker processes produces the same set of results as a
+single-process sweep, including when a worker crashes mid-item, and that
+sweeps with different parameters sharing a queue directory keep their
+results apart. Sweeps with callable policy schedules run in-process and are
+rejected with a clear error by the work queue.
 """
+import multiprocessing
+import os
+import tempfile
+import time
 import unittest
-import experimentation
+from src import experimentation
+from src.work_queue import WorkQueue
+
+SMALL_RUN = {'num_agents': 10, 'simulation_steps': 5}
 
 class TestExperimentation(unittest.TestCase):
 
@@ -17,5 +29,58 @@ class TestExperimentation(unittest.TestCase):
         except Exception as e:
             self.fail(f"experimentation.py raised {type(e).__name__}: {e}")
 
+    def test_build_work_items(self):
+        items = experimentation.build_work_items(SMALL_RUN, seeds=[0, 1])
+        num_points = sum(len(values) for values in experimentation.param_ranges.values())
+        self.assertEqual(len(items), 2 * num_points)
+        self.assertEqual(len({item['id'] for item in items}), len(items))
+        self.assertEqual(items[1]['params']['seed'], 1)
+        self.assertEqual(items[0]['params']['num_agents'], 10)
+
+    def test_work_item_ids_encode_params(self):
+        ids = {item['id'] for item in experimentation.build_work_items(SMALL_RUN, seeds=[0])}
+        self.assertEqual(ids, {item['id'] for item in experimentation.build_work_items(dict(SMALL_RUN), seeds=[0])})
+        self.assertFalse(ids & {item['id'] for item in experimentation.build_work_items(dict(SMALL_RUN, num_agents=20), seeds=[0])})
+        self.assertFalse(ids & {item['id'] for item in experimentation.build_work_items(SMALL_RUN, seeds=[1])})
+
+    def test_sweep_with_callable_schedule(self):
+        base_params = dict(SMALL_RUN, demand_multiplier=lambda steps: 0.1 + 0.0 * steps)
+        items = experimentation.build_work_items(base_params, seeds=[0])
+        self.assertEqual(len({item['id'] for item in items}), len(items))
+        experimentation.run_experiments(base_params, seeds=[0])
+        self.assertEqual(len(experimentation.experiment_results['tax_rate']), len(experimentation.param_ranges['tax_rate']))
+        self.assertEqual(experimentation.experiment_results['tax_rate'][-1]['param_value'], 0.05)
+        with tempfile.TemporaryDirectory() as queue_dir:
+            with self.assertRaisesRegex(TypeError, "work queue"):
+                experimentation.run_experiments(base_params, seeds=[0], queue_dir=queue_dir)
+            self.assertEqual(WorkQueue(queue_dir).num_pending(), 0)
+
+    def test_distributed_sweep_with_crashed_worker(self):
+        with tempfile.TemporaryDirectory() as queue_dir:
+            queue = WorkQueue(queue_dir, lease_seconds=1.0)
+            items = experimentation.build_work_items(SMALL_RUN, seeds=[0])
+            queue.enqueue(items)
+            claim_path, _ = queue.claim("crashed-worker")
+            stale_time = time.time() - 10.0
+            os.utime(claim_path, (stale_time, stale_time))
+
+            workers = [multiprocessing.Process(target=experimentation.run_worker, args=(queue_dir, f"worker-{i}", 1.0, 0.05)) for i in range(3)]
+            for worker in workers:
+                worker.start()
+            experimentation.run_experiments(SMALL_RUN, seeds=[0], queue_dir=queue_dir, lease_seconds=1.0, poll_interval=0.05)
+            for worker in workers:
+                worker.join(timeout=30)
+                self.assertEqual(worker.exitcode, 0)
+
+            self.assertEqual(set(experimentation.experiment_results), set(experimentation.param_ranges))
+            for param_name, param_values in experimentation.param_ranges.items():
+                results = experimentation.experiment_results[param_name]
+                self.assertEqual([r['param_value'] for r in results], list(param_values))
+                self.assertIn('num_bankruptcies', results[0])
+            experimentation.analyze_results(queue_dir, SMALL_RUN, seeds=[0])
+            self.assertEqual(set(experimentation.experiment_results), set(experimentation.param_ranges))
+            experimentation.merge_results(queue_dir, dict(SMALL_RUN, num_agents=20), seeds=[0])
+            self.assertEqual(experimentation.experiment_results, {})
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
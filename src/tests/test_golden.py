@@ -0,0 +1,102 @@
+"""
+Unit tests for the golden module.
+
+This module contains tests for the golden-trajectory regression harness. The
+KS test and the exact error measure are checked on known samples, and small
+golden recordings of the reference loop are used to validate the vectorized
+engine and to reject a candidate that behaves differently.
+
+Tests cover:
+- KS statistic and p-value on identical, disjoint and shifted samples
+- Exact error scaling and NaN (bankruptcy) pattern mismatches
+- Golden recording shapes and the .npz round trip
+- Warnings and strict failures for goldens of another code version
+- Validation of the vectorized engine, with its measured or recorded speedup
+- Rejection of a candidate with different behaviour
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src import golden as golden_module
+from src.golden import record_golden, save_golden, load_golden, validate_engine, ks_2samp, exact_error, TRAJECTORY_KEYS
+
+SMALL_GOLDEN = {'num_agents': 20, 'simulation_steps': 20}
+SMALL_SEEDS = tuple(range(8))
+
+class TestGolden(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.golden = record_golden(SMALL_GOLDEN, SMALL_SEEDS)
+
+    def test_ks_2samp(self):
+        rng = np.random.default_rng(0)
+        sample = rng.normal(size=200)
+        self.assertEqual(ks_2samp(sample, sample), (0.0, 1.0))
+        statistic, p_value = ks_2samp(np.arange(5.0), np.arange(5.0) + 10)
+        self.assertEqual(statistic, 1.0)
+        self.assertLess(p_value, 0.01)
+        self.assertGreater(ks_2samp(sample, rng.normal(size=300))[1], 0.01)
+        self.assertLess(ks_2samp(sample, rng.normal(1.0, size=300))[1], 1e-6)
+
+    def test_exact_error(self):
+        expected = np.array([0.5, 200.0, np.nan])
+        self.assertEqual(exact_error(expected, expected.copy()), 0.0)
+        self.assertAlmostEqual(exact_error(expected, np.array([0.6, 202.0, np.nan])), 0.1)
+        self.assertEqual(exact_error(expected, np.array([0.5, 200.0, 1.0])), float('inf'))
+        self.assertEqual(exact_error(expected, expected[:2]), float('inf'))
+
+    def test_record_and_round_trip(self):
+        self.assertEqual(self.golden['params']['engine'], 'reference')
+        self.assertEqual(self.golden['balances'].shape, (8, 21, 20))
+        self.assertEqual(self.golden['gini'].shape, (8, 20))
+        self.assertEqual(self.golden['deterministic_prices'].shape[0], 21)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "golden.npz")
+            save_golden(path, self.golden)
+            loaded = load_golden(path)
+        self.assertEqual(loaded['params'], self.golden['params'])
+        self.assertEqual(loaded['code_version'], self.golden['code_version'])
+        for key in TRAJECTORY_KEYS:
+            np.testing.assert_array_equal(loaded[key], self.golden[key])
+
+    def test_load_golden_checks_code_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "golden.npz")
+            save_golden(path, dict(self.golden, code_version="0" * 16))
+            with self.assertLogs(level='WARNING'):
+                loaded = load_golden(path)
+            self.assertEqual(loaded['code_version'], "0" * 16)
+            with self.assertRaises(ValueError):
+                load_golden(path, strict=True)
+
+    def test_vectorized_engine_passes(self):
+        report = validate_engine(self.golden)
+        self.assertTrue(report['exact_passed'], report['exact'])
+        self.assertTrue(report['distribution_passed'], report['distribution'])
+        self.assertTrue(report['passed'])
+        self.assertGreater(report['speedup'], 0.0)
+        self.assertEqual(report['reference_timing'], 'measured')
+        self.assertIn('gini@20', report['distribution'])
+
+    def test_speedup_times_the_reference(self):
+        stale = dict(self.golden, seconds=np.full(len(SMALL_SEEDS), 1000.0))
+        with mock.patch.object(golden_module, '_timed_run', wraps=golden_module._timed_run) as timed_run:
+            report = validate_engine(stale, timing_seeds=2)
+        reference_runs = [call for call in timed_run.call_args_list if call.args[1]['engine'] == 'reference']
+        self.assertEqual(len(reference_runs), 2)
+        self.assertLess(report['reference_seconds'], 1000.0)
+        recorded = validate_engine(stale, timing_seeds=0)
+        self.assertEqual(recorded['reference_timing'], 'recorded')
+        self.assertEqual(recorded['reference_seconds'], 1000.0)
+
+    def test_different_engine_fails(self):
+        report = validate_engine(self.golden, {'engine': 'vectorized', 'agent_income': 2.0})
+        self.assertFalse(report['exact_passed'])
+        self.assertFalse(report['distribution_passed'])
+        self.assertFalse(report['passed'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,8 +18,8 @@ Tests cover:
 import unittest
 import numpy as np
 from typing import List, Any
-from helpers import update_resource_prices, get_resource_prices, get_resource_availability, get_agent_requests, allocate_resources, deallocate_resources, regenerate_resources, adjust_agent_needs, adjust_agent_demand_multiplier, add_agent_income, add_agent_expense, check_agent_bankruptcies, tax_agents, redistribute_wealth, adjust_resource_capacity, get_agent_balances, get_resource_load_and_prices, get_total_economic_output, calculate_gini_coefficient
-from models import Agent, Resource
+from src.helpers import update_resource_prices, get_resource_prices, get_resource_availability, get_agent_requests, allocate_resources, deallocate_resources, regenerate_resources, adjust_agent_needs, add_agent_income, add_agent_expense, check_agent_bankruptcies, tax_agents, redistribute_wealth, adjust_resource_capacity, get_agent_balances, get_resource_load_and_prices, get_total_economic_output, calculate_gini_coefficient
+from src.models import Agent, Resource
 
 class TestHelpers(unittest.TestCase):
 
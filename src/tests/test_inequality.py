@@ -0,0 +1,129 @@
+"""
+Unit tests for the inequality module.
+
+This module contains tests for the Fenwick tree and the incremental
+inequality tracker. Each test compares the tracker's Gini coefficient and
+median against an exact computation over the same balances and checks that
+the difference stays within the tracker's reported error bounds.
+
+Tests cover:
+- Fenwick tree prefix sums and rank search
+- Gini and median accuracy on an initial population
+- Order-preserving affine updates (taxation and redistribution)
+- Point updates, removals and insertions
+- Range rebuilds when balances leave the binned interval
+- Renormalization of the affine scale over a long run of taxation steps
+- Slot reuse and synchronization with a population identified by slot
+- Reassignment of a population whose balances all moved
+"""
+import unittest
+import numpy as np
+from src.inequality import FenwickTree, InequalityTracker
+
+def exact_gini(balances: np.ndarray) -> float:
+    balances = np.sort(balances)
+    n = len(balances)
+    ranks = np.arange(1, n + 1)
+    return float(np.dot(2 * ranks - n - 1, balances)) / (n * float(np.sum(balances)))
+
+class TestInequality(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.balances = self.rng.uniform(50, 200, size=500)
+        self.tracker = InequalityTracker(self.balances)
+
+    def assertTracks(self, balances: np.ndarray):
+        self.assertEqual(len(self.tracker), len(balances))
+        self.assertLessEqual(abs(self.tracker.gini() - exact_gini(balances)), self.tracker.gini_error_bound() + 1e-12)
+        self.assertLessEqual(abs(self.tracker.median() - np.median(balances)), self.tracker.median_error_bound() + 1e-12)
+
+    def test_fenwick_prefix_sum_and_search(self):
+        values = np.array([3.0, 0.0, 2.0, 5.0, 1.0])
+        fenwick = FenwickTree.from_array(values)
+        for i in range(len(values) + 1):
+            self.assertAlmostEqual(fenwick.prefix_sum(i), values[:i].sum())
+        fenwick.add(1, 4.0)
+        self.assertAlmostEqual(fenwick.prefix_sum(2), 7.0)
+        self.assertEqual(fenwick.search(0), 0)
+        self.assertEqual(fenwick.search(3), 1)
+        self.assertEqual(fenwick.search(8), 2)
+
+    def test_initial_population(self):
+        self.assertTracks(self.balances)
+        np.testing.assert_allclose(np.sort(self.tracker.balances()), np.sort(self.balances))
+
+    def test_affine_update(self):
+        tax_rate = 0.02
+        redistribution = float(np.sum(self.balances)) * tax_rate / len(self.balances)
+        self.tracker.apply_affine(1 - tax_rate, redistribution)
+        self.assertTracks(self.balances * (1 - tax_rate) + redistribution)
+
+    def test_affine_update_rejects_order_reversal(self):
+        with self.assertRaises(ValueError):
+            self.tracker.apply_affine(-1.0, 0.0)
+
+    def test_point_updates(self):
+        indices = self.rng.choice(len(self.balances), size=20, replace=False)
+        self.balances[indices] += self.rng.uniform(-10, 10, size=20)
+        self.tracker.update(indices, self.balances[indices])
+        self.assertTracks(self.balances)
+
+    def test_batch_update_matches_point_updates(self):
+        indices = np.arange(len(self.balances))
+        self.balances -= self.rng.uniform(0, 5, size=len(self.balances))
+        self.tracker.update(indices, self.balances)
+        self.assertTracks(self.balances)
+
+    def test_remove_and_add(self):
+        self.tracker.remove([0, 1, 2])
+        remaining = self.balances[3:]
+        self.assertTracks(remaining)
+        new_slots = self.tracker.add([75.0, 125.0])
+        self.assertEqual(list(new_slots), [len(self.balances), len(self.balances) + 1])
+        self.assertTracks(np.concatenate((remaining, [75.0, 125.0])))
+
+    def test_out_of_range_update_rebuilds(self):
+        self.balances[0] = 1e6
+        self.tracker.update([0], [1e6])
+        self.assertTracks(self.balances)
+
+    def test_long_affine_run_renormalizes(self):
+        for _ in range(40000):
+            self.balances = self.balances * 0.98 + 2.0
+            self.tracker.apply_affine(0.98, 2.0)
+        self.assertGreaterEqual(self.tracker.scale, 1e-6)
+        self.assertTrue(np.all(np.isfinite(self.tracker.balances())))
+        self.assertTracks(self.balances)
+
+    def test_add_reuses_inactive_slots(self):
+        self.tracker.remove([4, 7])
+        self.assertEqual(list(self.tracker.add([60.0, 90.0], [7, 4])), [7, 4])
+        self.balances[[7, 4]] = [60.0, 90.0]
+        self.assertTracks(self.balances)
+        with self.assertRaises(KeyError):
+            self.tracker.add([10.0], [0])
+
+    def test_sync(self):
+        indices = np.arange(len(self.balances))
+        keep = indices[indices % 5 != 0]
+        balances = self.balances.copy()
+        balances[keep[:10]] += 15.0
+        slots = np.concatenate((keep, [len(self.balances) + 3]))
+        balances = np.concatenate((balances[keep], [140.0]))
+        self.tracker.sync(slots, balances)
+        self.assertTracks(balances)
+        self.tracker.sync(slots, balances - 1.0)
+        self.assertTracks(balances - 1.0)
+
+    def test_assign(self):
+        slots = np.arange(len(self.balances) + 5)[5:]
+        moved = self.balances * 0.98 + self.rng.uniform(-1, 1, size=len(self.balances))
+        self.tracker.assign(slots, moved)
+        self.assertTracks(moved)
+        self.assertEqual(self.tracker.scale, 1.0)
+        self.tracker.assign(slots[:10], moved[:10] * 100)
+        self.assertTracks(moved[:10] * 100)
+
+if __name__ == '__main__':
+    unittest.main()
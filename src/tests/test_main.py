@@ -4,10 +4,18 @@ Unit tests for the main module.
 This module contains tests to verify that the main entry point function
 executes without errors. It ensures that the parameter experimentation
 workflow can be initiated successfully and that all dependencies are
-properly configured and accessible.
+properly configured and accessible. It also checks the command line
+subcommands and that importing the entry point stays free of heavy imports.
 """
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
-import main
+from src import main
 
 class TestMain(unittest.TestCase):
 
@@ -17,5 +25,40 @@ class TestMain(unittest.TestCase):
         except Exception as e:
             self.fail(f"main.py raised {type(e).__name__}: {e}")
 
+    def test_parse_params(self):
+        params = main._parse_params(["tax_rate=0.03", "num_agents=10", "initial_imbalance=false", "label=baseline"])
+        self.assertEqual(params, {'tax_rate': 0.03, 'num_agents': 10, 'initial_imbalance': False, 'label': 'baseline'})
+
+    def test_run_subcommand(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            main.main(["run", "-p", "num_agents=5", "-p", "simulation_steps=2", "-p", "seed=0"])
+        results = json.loads(output.getvalue())
+        self.assertEqual(results['step_metrics']['step'], 1)
+
+    def test_run_rejects_metrics_with_cache(self):
+        with contextlib.redirect_stderr(io.StringIO()) as error, self.assertRaises(SystemExit):
+            main.main(["run", "--serve-metrics", "0", "--cache-dir", "cache"])
+        self.assertIn("not allowed with", error.getvalue())
+
+    def test_golden_rejects_params_of_another_recording(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "golden.npz")
+            args = ["golden", "--golden", path, "--seeds", "4", "-p", "num_agents=10", "-p", "simulation_steps=8"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                main.main(args)
+                main.main(args)
+            with self.assertRaises(SystemExit) as raised:
+                main.main(["golden", "--golden", path, "-p", "num_agents=20"])
+            self.assertIn("--record", str(raised.exception.code))
+            with self.assertRaises(SystemExit) as raised:
+                main.main(["golden", "--golden", path, "--seeds", "6"])
+            self.assertIn("--record", str(raised.exception.code))
+
+    def test_entry_point_import_is_lazy(self):
+        code = "import sys, src.main; print(sorted(m for m in ('numpy', 'manim', 'asyncio') if m in sys.modules))"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
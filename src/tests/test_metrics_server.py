@@ -0,0 +1,117 @@
+"""
+Unit tests for the metrics_server module.
+
+This module contains tests for the live metrics server. It verifies that
+published step metrics are exposed over HTTP as JSON and Prometheus text,
+streamed to WebSocket clients, and that the bounded publish buffer drops
+the oldest messages instead of blocking the publisher.
+
+Tests cover:
+- Drop-oldest buffering without a running consumer
+- Exact drop counts when several threads publish at once
+- Prometheus counters and gauges
+- The /latest JSON endpoint
+- WebSocket handshake and step streaming
+- Stopping cleanly while a WebSocket client is still connected
+- Publishing from run_simulation through the on_step callback
+"""
+import asyncio
+import base64
+import gc
+import json
+import socket
+import sys
+import threading
+import time
+import unittest
+import urllib.request
+from src.metrics_server import MetricsServer, _put_drop_oldest
+from src.simulation import run_simulation
+
+def read_websocket_message(sock: socket.socket) -> str:
+    header = sock.recv(2)
+    length = header[1] & 0x7F
+    if length == 126:
+        length = int.from_bytes(sock.recv(2), "big")
+    payload = b""
+    while len(payload) < length:
+        payload += sock.recv(length - len(payload))
+    return payload.decode()
+
+class TestMetricsServer(unittest.TestCase):
+
+    def test_publish_drops_oldest_when_full(self):
+        server = MetricsServer(max_queue=3)
+        for step in range(5):
+            server.publish({"step": step, "gini": 0.1})
+        self.assertEqual(server.steps_total, 5)
+        self.assertEqual(server.dropped_total, 2)
+        self.assertEqual([m["step"] for m in server._buffer], [2, 3, 4])
+
+    def test_concurrent_publish_counts_every_drop(self):
+        server = MetricsServer(max_queue=8)
+        def publish_many():
+            for step in range(2000):
+                server.publish({'step': step})
+        threads = [threading.Thread(target=publish_many) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(server.dropped_total, 4 * 2000 - 8)
+
+    def test_put_drop_oldest(self):
+        queue = asyncio.Queue(maxsize=2)
+        self.assertFalse(_put_drop_oldest(queue, "a"))
+        self.assertFalse(_put_drop_oldest(queue, "b"))
+        self.assertTrue(_put_drop_oldest(queue, "c"))
+        self.assertEqual([queue.get_nowait(), queue.get_nowait()], ["b", "c"])
+
+    def test_http_endpoints(self):
+        with MetricsServer() as server:
+            server.publish({"step": 0, "gini": 0.25, "median_balance": 100.0, "agents_alive": 42})
+            base_url = f"http://{server.host}:{server.port}"
+            text = urllib.request.urlopen(f"{base_url}/metrics", timeout=5).read().decode()
+            self.assertIn("sim_steps_total 1", text)
+            self.assertIn("sim_agents_alive 42", text)
+            self.assertIn("sim_gini 0.25", text)
+            self.assertIn("sim_steps_per_second", text)
+            latest = json.loads(urllib.request.urlopen(f"{base_url}/latest", timeout=5).read())
+            self.assertEqual(latest["median_balance"], 100.0)
+
+    def test_websocket_stream(self):
+        with MetricsServer() as server:
+            sock = socket.create_connection((server.host, server.port), timeout=5)
+            key = base64.b64encode(b"0123456789abcdef").decode()
+            sock.sendall(f"GET /stream HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+            response = b""
+            while b"\r\n\r\n" not in response:
+                response += sock.recv(1)
+            self.assertIn(b"101 Switching Protocols", response)
+            while not server._clients:
+                time.sleep(0.01)
+            run_simulation({"num_agents": 5, "simulation_steps": 3}, on_step=server.publish)
+            steps = [json.loads(read_websocket_message(sock))["step"] for _ in range(3)]
+            self.assertEqual(steps, [0, 1, 2])
+            self.assertEqual(server.agents_alive, 5)
+            sock.close()
+
+    def test_stop_with_connected_client(self):
+        unraisable = []
+        original_hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+        try:
+            server = MetricsServer().start()
+            sock = socket.create_connection((server.host, server.port), timeout=5)
+            sock.sendall(b"GET /stream HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: a2V5\r\n\r\n")
+            while not server._clients:
+                time.sleep(0.01)
+            server.stop()
+            gc.collect()
+            sock.close()
+        finally:
+            sys.unraisablehook = original_hook
+        self.assertEqual((server._connections, server._clients), (set(), set()))
+        self.assertEqual(unraisable, [])
+
+if __name__ == '__main__':
+    unittest.main()
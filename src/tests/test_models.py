@@ -18,8 +18,8 @@ Tests cover:
 """
 import unittest
 import numpy as np
-from models import Agent, Resource
-from constants import NUM_RESOURCES, BASE_RESOURCE_COST
+from src.models import Agent, Resource
+from src.constants import NUM_RESOURCES, BASE_RESOURCE_COST
 
 class TestModels(unittest.TestCase):
 
@@ -0,0 +1,87 @@
+"""
+Unit tests for the network module.
+
+This module contains tests for the sparse trading network. It checks the
+CSR construction and both sparse products against dense NumPy equivalents,
+verifies the structure of the generated graphs, and checks that trading
+conserves wealth and only involves living agents.
+
+Tests cover:
+- CSR construction, self-loop removal and duplicate merging
+- matvec and rmatvec against dense matrix products
+- Small-world and scale-free graph generation
+- Conservation and alive masking in trade_transfers
+- Trading as a phase of both simulation engines
+"""
+import unittest
+import numpy as np
+from src.network import CSRGraph, small_world_graph, scale_free_graph, trade_transfers, build_trade_network
+from src.simulation import run_simulation
+
+def dense(graph: CSRGraph) -> np.ndarray:
+    matrix = np.zeros((graph.num_nodes, graph.num_nodes))
+    matrix[graph.rows, graph.indices] = graph.weights
+    return matrix
+
+class TestNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_from_edges(self):
+        graph = CSRGraph.from_edges([0, 0, 1, 2], [1, 1, 2, 2], 4, weights=[1.0, 2.0, 3.0, 4.0])
+        expected = np.zeros((4, 4))
+        expected[0, 1] = expected[1, 0] = 3.0
+        expected[1, 2] = expected[2, 1] = 3.0
+        np.testing.assert_array_equal(dense(graph), expected)
+        np.testing.assert_array_equal(graph.degree(), [1, 2, 1, 0])
+        unit = CSRGraph.from_edges([0, 0], [1, 1], 2, symmetric=False)
+        np.testing.assert_array_equal(dense(unit), [[0.0, 2.0], [0.0, 0.0]])
+
+    def test_products_match_dense(self):
+        sources = self.rng.integers(0, 50, size=200)
+        targets = self.rng.integers(0, 50, size=200)
+        graph = CSRGraph.from_edges(sources, targets, 60, weights=self.rng.uniform(size=200), symmetric=False)
+        x = self.rng.uniform(size=60)
+        np.testing.assert_allclose(graph.matvec(x), dense(graph) @ x)
+        np.testing.assert_allclose(graph.rmatvec(x), dense(graph).T @ x)
+
+    def test_small_world_graph(self):
+        graph = small_world_graph(1000, 6, 0.0, self.rng)
+        np.testing.assert_array_equal(graph.degree(), np.full(1000, 6))
+        rewired = small_world_graph(1000, 6, 0.2, self.rng)
+        self.assertAlmostEqual(rewired.degree().mean(), 6.0, delta=0.2)
+        np.testing.assert_array_equal(dense(rewired), dense(rewired).T)
+
+    def test_scale_free_graph(self):
+        graph = scale_free_graph(5000, 8, 2.5, self.rng)
+        degree = graph.degree()
+        self.assertAlmostEqual(degree.mean(), 8.0, delta=1.0)
+        self.assertGreater(degree.max(), 10 * np.median(degree))
+        with self.assertRaises(ValueError):
+            scale_free_graph(100, 4, 2.0, self.rng)
+
+    def test_trade_transfers(self):
+        graph = small_world_graph(500, 4, 0.1, self.rng)
+        balance = self.rng.uniform(-20, 200, size=500)
+        alive = self.rng.uniform(size=500) < 0.8
+        transfers = trade_transfers(graph, balance, alive, 0.1)
+        self.assertAlmostEqual(transfers.sum(), 0.0, places=9)
+        self.assertTrue(np.all(transfers[~alive] == 0.0))
+        self.assertTrue(np.all(transfers[alive & (balance < 0)] >= 0.0))
+
+    def test_build_trade_network(self):
+        self.assertIsNone(build_trade_network({}))
+        self.assertEqual(build_trade_network({'trade_network': 'small_world', 'num_agents': 30}).num_nodes, 30)
+        with self.assertRaises(ValueError):
+            build_trade_network({'trade_network': 'complete'})
+
+    def test_trading_phase(self):
+        for engine in ('reference', 'vectorized'):
+            params = {'engine': engine, 'seed': 0, 'simulation_steps': 30, 'trade_rate': 0.05}
+            baseline = run_simulation(params)
+            traded = run_simulation(dict(params, trade_network='scale_free'))
+            self.assertGreater(traded['gini_coefficient'], baseline['gini_coefficient'])
+
+if __name__ == '__main__':
+    unittest.main()
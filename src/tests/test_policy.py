@@ -0,0 +1,71 @@
+"""
+Unit tests for the policy module.
+
+This module contains tests for compiling time-varying policy schedules into
+per-step arrays and for the simulation honoring them. It verifies every
+supported schedule form against hand-computed values and checks that a
+scheduled tax rate changes the redistribution of the steps it covers.
+
+Tests cover:
+- Constant, piecewise (step and linear), array and callable schedules
+- Defaults for unscheduled parameters and steps past the end of a run
+- Rejection of malformed schedules
+- Scheduled tax rates in simulation_step and run_simulation
+"""
+import unittest
+import numpy as np
+from src.constants import TAX_RATE, AGENT_EXPENSE_RATE
+from src.models import Agent, Resource
+from src.policy import PolicySchedule, compile_schedule
+from src.simulation import run_simulation, simulation_step
+
+class TestPolicy(unittest.TestCase):
+
+    def test_constant_schedule(self):
+        np.testing.assert_array_equal(compile_schedule(0.03, 4, TAX_RATE), [0.03] * 4)
+
+    def test_step_schedule(self):
+        values = compile_schedule([[2, 0.05], [4, 0.0]], 6, TAX_RATE)
+        np.testing.assert_allclose(values, [TAX_RATE, TAX_RATE, 0.05, 0.05, 0.0, 0.0])
+
+    def test_linear_schedule(self):
+        values = compile_schedule({'points': [[0, 0.0], [4, 0.04]], 'interpolation': 'linear'}, 6, TAX_RATE)
+        np.testing.assert_allclose(values, [0.0, 0.01, 0.02, 0.03, 0.04, 0.04])
+
+    def test_array_and_callable_schedules(self):
+        np.testing.assert_allclose(compile_schedule(np.array([0.1, 0.2]), 4, TAX_RATE), [0.1, 0.2, 0.2, 0.2])
+        np.testing.assert_allclose(compile_schedule(lambda t: 0.01 * t, 3, TAX_RATE), [0.0, 0.01, 0.02])
+        np.testing.assert_allclose(compile_schedule(lambda t: 0.5, 3, TAX_RATE), [0.5] * 3)
+
+    def test_invalid_schedules(self):
+        with self.assertRaises(ValueError):
+            compile_schedule({'points': [[0, 0.1]], 'interpolation': 'cubic'}, 3, TAX_RATE)
+        with self.assertRaises(ValueError):
+            compile_schedule([], 3, TAX_RATE)
+        with self.assertRaises(ValueError):
+            compile_schedule(np.array([]), 3, TAX_RATE)
+
+    def test_policy_schedule_defaults_and_clamping(self):
+        policy = PolicySchedule({'tax_rate': [[1, 0.05]]}, 3)
+        self.assertEqual(policy.at(0)['tax_rate'], TAX_RATE)
+        self.assertEqual(policy.at(10)['tax_rate'], 0.05)
+        self.assertEqual(policy.at(0)['agent_expense_rate'], AGENT_EXPENSE_RATE)
+
+    def test_simulation_step_uses_scheduled_tax_rate(self):
+        params = {'tax_rate': [[1, 0.5]]}
+        policy = PolicySchedule(params, 2)
+        agents = [Agent(i) for i in range(5)]
+        resources = [Resource(i) for i in range(3)]
+        first = simulation_step(agents, resources, 0, params, policy)
+        second = simulation_step(agents, resources, 1, params, policy)
+        self.assertGreater(second['tax_redistribution'], 10 * first['tax_redistribution'])
+
+    def test_run_simulation_with_schedules(self):
+        params = {'num_agents': 10, 'simulation_steps': 10, 'seed': 0,
+                  'agent_expense_rate': {'points': [[0, 0.2], [9, 5.0]], 'interpolation': 'linear'}}
+        scheduled = run_simulation(params)
+        baseline = run_simulation({'num_agents': 10, 'simulation_steps': 10, 'seed': 0})
+        self.assertLess(scheduled['avg_final_balance'], baseline['avg_final_balance'])
+
+if __name__ == '__main__':
+    unittest.main()
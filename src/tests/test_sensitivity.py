@@ -0,0 +1,117 @@
+"""
+Unit tests for the sensitivity module.
+
+This module contains tests for the global sensitivity analysis. The Morris
+and Sobol estimators are checked against analytic test functions with known
+indices, and small analyses are run end to end over run_simulation, both in
+process and through a work queue with local workers.
+
+Tests cover:
+- Structure of Morris trajectories and the Saltelli design
+- Morris elementary effects of a linear function
+- Sobol indices of the Ishigami function
+- Scaling of unit samples to parameter ranges
+- End-to-end analyses, locally and through a work queue
+- Separate results for different runs sharing a queue directory
+- One run per seed for repeated design points, and callable schedules in-process
+"""
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src import experimentation
+from src.sensitivity import (SENSITIVITY_BOUNDS, OUTPUT_METRICS, morris_sample, morris_indices, saltelli_sample,
+                             sobol_indices, scale_samples, evaluate_points, morris_screening, sobol_analysis)
+
+SMALL_RUN = {'engine': 'vectorized', 'num_agents': 20, 'simulation_steps': 10}
+
+def ishigami(samples: np.ndarray) -> np.ndarray:
+    x = -np.pi + 2 * np.pi * samples
+    return np.sin(x[:, 0]) + 7 * np.sin(x[:, 1]) ** 2 + 0.1 * x[:, 2] ** 4 * np.sin(x[:, 0])
+
+class TestSensitivity(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_morris_sample(self):
+        samples = morris_sample(5, 8, 4, self.rng)
+        self.assertEqual(samples.shape, (8 * 6, 5))
+        self.assertTrue(np.all((samples >= 0.0) & (samples <= 1.0)))
+        moves = np.diff(samples.reshape(8, 6, 5), axis=1)
+        np.testing.assert_array_equal(np.count_nonzero(moves, axis=2), np.ones((8, 5)))
+        np.testing.assert_allclose(np.abs(moves).sum(axis=2), np.full((8, 5), 2 / 3))
+        with self.assertRaises(ValueError):
+            morris_sample(5, 8, 3, self.rng)
+
+    def test_morris_indices(self):
+        samples = morris_sample(3, 10, 4, self.rng)
+        outputs = np.stack((samples[:, 0] - 2 * samples[:, 1], samples[:, 2] ** 2), axis=1)
+        indices = morris_indices(samples, outputs, 10)
+        np.testing.assert_allclose(indices['mu'][:, 0], [1.0, -2.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(indices['mu_star'][:, 0], [1.0, 2.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(indices['sigma'][:, 0], 0.0, atol=1e-12)
+        self.assertGreater(indices['sigma'][2, 1], 0.0)
+
+    def test_saltelli_sample(self):
+        samples = saltelli_sample(3, 16, self.rng)
+        self.assertEqual(samples.shape, (16 * 5, 3))
+        a, b, ab = samples[:16], samples[16:32], samples[32:].reshape(3, 16, 3)
+        for i in range(3):
+            np.testing.assert_array_equal(ab[i][:, i], b[:, i])
+            np.testing.assert_array_equal(np.delete(ab[i], i, axis=1), np.delete(a, i, axis=1))
+
+    def test_sobol_indices_ishigami(self):
+        samples = saltelli_sample(3, 20000, self.rng)
+        indices = sobol_indices(ishigami(samples)[:, None], 3)
+        np.testing.assert_allclose(indices['first_order'][:, 0], [0.314, 0.442, 0.0], atol=0.03)
+        np.testing.assert_allclose(indices['total'][:, 0], [0.558, 0.442, 0.244], atol=0.03)
+        constant = sobol_indices(np.ones((5 * 10, 1)), 3)
+        np.testing.assert_array_equal(constant['total'], np.zeros((3, 1)))
+
+    def test_scale_samples(self):
+        points = scale_samples(np.array([[0.0, 0.5], [1.0, 1.0]]), ['num_agents', 'tax_rate'])
+        self.assertEqual(points[0], {'num_agents': SENSITIVITY_BOUNDS['num_agents'][0], 'tax_rate': 0.025})
+        self.assertIsInstance(points[1]['num_agents'], int)
+        self.assertEqual(points[1]['tax_rate'], SENSITIVITY_BOUNDS['tax_rate'][1])
+
+    def test_morris_screening(self):
+        indices = morris_screening(['agent_income', 'tax_rate'], num_trajectories=3, base_params=SMALL_RUN)
+        self.assertEqual(set(indices), {'agent_income', 'tax_rate'})
+        self.assertEqual(set(indices['tax_rate']), set(OUTPUT_METRICS))
+        self.assertGreater(indices['agent_income']['avg_final_balance']['mu'], 0.0)
+
+    def test_sobol_analysis_through_work_queue(self):
+        names = ['agent_income', 'imbalance_strength']
+        local = sobol_analysis(names, num_samples=4, base_params=SMALL_RUN)
+        with tempfile.TemporaryDirectory() as queue_dir:
+            queued = sobol_analysis(names, num_samples=4, base_params=SMALL_RUN, queue_dir=queue_dir, local_workers=2, poll_interval=0.05)
+        for name in names:
+            for metric in OUTPUT_METRICS:
+                for statistic, value in local[name][metric].items():
+                    self.assertAlmostEqual(queued[name][metric][statistic], value)
+
+    def test_shared_queue_keeps_runs_apart(self):
+        points = [{'tax_rate': 0.0}, {'tax_rate': 0.05}]
+        larger = dict(SMALL_RUN, num_agents=40)
+        with tempfile.TemporaryDirectory() as queue_dir:
+            first = evaluate_points(points, SMALL_RUN, queue_dir=queue_dir, local_workers=1, poll_interval=0.05)
+            second = evaluate_points(points, larger, queue_dir=queue_dir, local_workers=1, poll_interval=0.05)
+        np.testing.assert_array_equal(first, evaluate_points(points, SMALL_RUN))
+        np.testing.assert_array_equal(second, evaluate_points(points, larger))
+        self.assertFalse(np.array_equal(first, second))
+
+    def test_repeated_points_share_runs(self):
+        points = [{'bankruptcy_threshold': -10}, {'bankruptcy_threshold': -100}, {'bankruptcy_threshold': -10}]
+        with mock.patch.object(experimentation, 'cached_run_simulation', wraps=experimentation.cached_run_simulation) as run:
+            outputs = evaluate_points(points, SMALL_RUN, seeds=[0, 1])
+        self.assertEqual(run.call_count, 4)
+        np.testing.assert_array_equal(outputs[0], outputs[2])
+        self.assertIn('bankruptcy_threshold', SENSITIVITY_BOUNDS)
+
+    def test_callable_schedule_in_process(self):
+        base_params = dict(SMALL_RUN, tax_rate=lambda steps: 0.01 + 0.0 * steps)
+        np.testing.assert_array_equal(evaluate_points([{'agent_income': 0.5}], base_params), evaluate_points([{'agent_income': 0.5}], dict(SMALL_RUN, tax_rate=0.01)))
+
+if __name__ == '__main__':
+    unittest.main()
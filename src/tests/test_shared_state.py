@@ -0,0 +1,88 @@
+"""
+Unit tests for the shared_state module.
+
+This module contains tests for the shared-memory simulation state. It checks
+that attached views alias the same memory as the creating process, that a
+run stepped in shared memory gives the same results as the array-backed
+engine, and that a separate process can read a live run's state.
+
+Tests cover:
+- Layout, alignment and zero-copy attachment of SharedArrays
+- Equivalence of SharedSimulation with run_vectorized_simulation
+- Consistent snapshots, including after bankruptcies shrink the population
+- Attaching from a spawned process
+- Handing attached blocks back from the resource tracker under their public name
+"""
+import multiprocessing
+import os
+import sys
+import unittest
+from unittest import mock
+import numpy as np
+from src import shared_state
+from src.shared_state import ALIGNMENT, SharedArrays, SharedSimulation, SharedStateReader, attach_population
+from src.vectorized import run_vectorized_simulation
+
+def read_balance_total(handle, results):
+    """Attaches to a shared run from a child process and reports its total balance."""
+    with SharedStateReader(handle) as reader:
+        results.put(float(reader.snapshot()['balance'].sum()))
+
+class TestSharedState(unittest.TestCase):
+
+    def test_shared_arrays(self):
+        with SharedArrays.create({'a': ((3,), np.int8), 'b': ((2, 5), np.float64)}) as shared:
+            offsets = [offset for _, _, _, offset in shared.layout]
+            self.assertTrue(all(offset % ALIGNMENT == 0 for offset in offsets))
+            np.testing.assert_array_equal(shared['b'], np.zeros((2, 5)))
+            attached = SharedArrays.attach(shared.handle)
+            attached['b'][1, 2] = 7.0
+            self.assertEqual(shared['b'][1, 2], 7.0)
+            self.assertEqual(attached['a'].dtype, np.int8)
+            attached.close()
+
+    def test_matches_vectorized_engine(self):
+        params = {'seed': 4, 'simulation_steps': 40, 'trade_network': 'small_world'}
+        expected = run_vectorized_simulation(params)
+        with SharedSimulation(params) as simulation:
+            metrics = simulation.run()
+            self.assertEqual(metrics['gini'], expected['step_metrics']['gini'])
+            self.assertEqual(np.mean(simulation.population.balance), expected['avg_final_balance'])
+
+    def test_snapshot(self):
+        params = {'seed': 2, 'num_agents': 500, 'simulation_steps': 60,
+                  'agent_type_shares': [0.5, 0.5, 0.0, 0.0, 0.0],
+                  'agent_type_bankruptcy_multiplier': [1.0, -20.0, 1.0, 1.0, 1.0]}
+        with SharedSimulation(params) as simulation, SharedStateReader(simulation.handle) as reader:
+            simulation.run()
+            self.assertLess(len(simulation.population), 500)
+            snapshot = reader.snapshot()
+            self.assertEqual(snapshot['step'], 59)
+            np.testing.assert_array_equal(snapshot['agent_id'], simulation.population.agent_id)
+            np.testing.assert_array_equal(snapshot['preference'], simulation.population.preference)
+            np.testing.assert_array_equal(snapshot['price'], simulation.resources.price)
+            population, resources = attach_population(reader.shared)
+            self.assertTrue(np.shares_memory(population.balance, reader.shared['balance']))
+            np.testing.assert_array_equal(population.balance, simulation.population.balance)
+
+    def test_attach_from_another_process(self):
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        with SharedSimulation({'seed': 0, 'num_agents': 200, 'simulation_steps': 5}) as simulation:
+            simulation.run()
+            process = context.Process(target=read_balance_total, args=(simulation.handle, results))
+            process.start()
+            total = results.get(timeout=60)
+            process.join()
+            self.assertAlmostEqual(total, float(simulation.population.balance.sum()))
+
+    @unittest.skipUnless(os.name == "posix" and sys.version_info < (3, 13), "attached blocks are untracked with track=False")
+    def test_attach_unregisters_from_resource_tracker(self):
+        with SharedArrays.create({'a': ((4,), np.float64)}) as shared:
+            with mock.patch.object(shared_state, '_created_blocks', set()), mock.patch.object(shared_state.resource_tracker, 'unregister') as unregister:
+                attached = SharedArrays.attach(shared.handle)
+            attached.close()
+            unregister.assert_called_once_with(f"/{shared.shm.name}", "shared_memory")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,9 +16,9 @@ Tests cover:
 """
 import unittest
 from typing import Dict, Any
-from simulation import run_simulation, simulation_step
-from models import Agent, Resource
-from constants import NUM_AGENTS, NUM_RESOURCES
+from src.simulation import run_simulation, simulation_step
+from src.models import Agent, Resource
+from src.constants import NUM_AGENTS, NUM_RESOURCES
 
 class TestSimulation(unittest.TestCase):
 
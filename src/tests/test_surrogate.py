@@ -0,0 +1,111 @@
+"""
+Unit tests for the surrogate module.
+
+This module contains tests for the Gaussian process surrogate of
+run_simulation. It checks the regression model on known functions and the
+surrogate's training from stored results, its uncertainty-driven requests
+for real simulations and its what-if scans.
+
+Tests cover:
+- GP interpolation accuracy and uncertainty growth away from the data
+- Agreement of the single-point fast path with batch prediction
+- Training from run_experiments results and work queue shards, ignoring
+  shards of other runs in the same queue
+- Real simulations requested by query and refine, including with callable schedules
+- Feasible parameter values from feasible_values
+"""
+import tempfile
+import unittest
+import numpy as np
+from src.surrogate import GaussianProcess, Surrogate
+from src.sensitivity import evaluate_points
+from src.experimentation import run_work_items
+
+SMALL_RUN = {'engine': 'vectorized', 'num_agents': 20, 'simulation_steps': 10}
+
+class TestSurrogate(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_gaussian_process(self):
+        x = self.rng.uniform(size=(40, 2))
+        model = GaussianProcess().fit(x, np.sin(6 * x[:, 0]))
+        test = self.rng.uniform(size=(100, 2))
+        mean, std = model.predict(test)
+        np.testing.assert_allclose(mean, np.sin(6 * test[:, 0]), atol=0.05)
+        self.assertGreater(model.length_scales[1], model.length_scales[0])
+        _, far_std = model.predict(np.array([[3.0, 3.0]]))
+        self.assertGreater(far_std[0], 10 * std.max())
+        one_mean, one_std = model.predict_one(test[0])
+        self.assertAlmostEqual(one_mean, mean[0])
+        self.assertAlmostEqual(one_std, std[0])
+
+    def test_fixed_hyperparameters(self):
+        model = GaussianProcess(length_scales=np.array([0.5]), noise=0.1).fit(np.array([[0.0], [1.0]]), np.array([1.0, 3.0]))
+        np.testing.assert_array_equal(model.length_scales, [0.5])
+        self.assertEqual(model.noise, 0.1)
+
+    def test_from_experiment_results(self):
+        experiment_results = {
+            'tax_rate': [{'param_value': v, 'avg_final_balance': 100 - 400 * v, 'gini_coefficient': 0.2} for v in np.linspace(0.0, 0.05, 6)],
+            'agent_income': [{'param_value': v, 'avg_final_balance': 92 + 20 * (v - 0.5), 'gini_coefficient': 0.2} for v in np.linspace(0.25, 1.0, 6)]
+        }
+        surrogate = Surrogate.from_experiment_results(experiment_results, metrics=['avg_final_balance', 'gini_coefficient'])
+        self.assertEqual(surrogate.names, ['tax_rate', 'agent_income'])
+        self.assertEqual(len(surrogate.x), 12)
+        mean, std = surrogate.predict({'tax_rate': 0.03, 'agent_income': 0.75})['avg_final_balance']
+        self.assertAlmostEqual(mean, 93.0, delta=1.0)
+        self.assertLess(std, 1.0)
+
+    def test_query_and_refine(self):
+        surrogate = Surrogate(['agent_income', 'tax_rate'], base_params=SMALL_RUN)
+        surrogate.simulate([{'agent_income': 0.25, 'tax_rate': 0.0}, {'agent_income': 1.0, 'tax_rate': 0.05}])
+        self.assertEqual(surrogate.num_simulations, 2)
+        point = {'agent_income': 0.6, 'tax_rate': 0.01}
+        self.assertFalse(surrogate.query(point, tolerance=None)['simulated'])
+        answer = surrogate.query(point, tolerance=1e-6)
+        self.assertTrue(answer['simulated'])
+        expected = evaluate_points([point], SMALL_RUN)[0, 0]
+        self.assertAlmostEqual(answer['avg_final_balance'][0], expected)
+        runs = surrogate.refine(max_runs=6, batch_size=3)
+        self.assertEqual(runs, 6)
+        self.assertEqual(len(surrogate.x), 9)
+
+    def test_callable_schedule(self):
+        base_params = dict(SMALL_RUN, demand_multiplier=lambda steps: 0.1 + 0.0 * steps)
+        surrogate = Surrogate(['tax_rate'], base_params=base_params)
+        surrogate.simulate([{'tax_rate': 0.0}, {'tax_rate': 0.05}])
+        self.assertEqual(surrogate.refine(max_runs=2, batch_size=2), 2)
+        np.testing.assert_array_equal(surrogate.y[:2], evaluate_points([{'tax_rate': 0.0}, {'tax_rate': 0.05}], SMALL_RUN))
+
+    def test_feasible_values(self):
+        surrogate = Surrogate(['agent_income'], base_params=SMALL_RUN)
+        surrogate.simulate([{'agent_income': v} for v in np.linspace(0.25, 1.0, 8)])
+        balance = surrogate.y[:, 0]
+        threshold = float(np.median(balance))
+        values = surrogate.feasible_values('agent_income', 'avg_final_balance', lower=threshold, num_points=21)
+        self.assertGreater(len(values), 0)
+        self.assertLess(len(values), 21)
+        self.assertGreater(values.min(), 0.25)
+
+    def test_from_work_queue(self):
+        items = [{'id': f"point-{i}", 'params': dict(SMALL_RUN, tax_rate=rate, seed=0)} for i, rate in enumerate([0.0, 0.02, 0.04])]
+        with tempfile.TemporaryDirectory() as queue_dir:
+            run_work_items(items, queue_dir=queue_dir, local_workers=1, poll_interval=0.05)
+            evaluate_points([{'tax_rate': 0.01}], dict(SMALL_RUN, num_agents=40), queue_dir=queue_dir, local_workers=1, poll_interval=0.05)
+            evaluate_points([{'tax_rate': 0.03, 'agent_income': 0.9}], SMALL_RUN, queue_dir=queue_dir, local_workers=1, poll_interval=0.05)
+            surrogate = Surrogate.from_work_queue(queue_dir, ['tax_rate'], base_params=SMALL_RUN)
+        np.testing.assert_allclose(np.sort(surrogate.x[:, 0]), [0.0, 0.4, 0.8])
+        self.assertIn('gini_coefficient', surrogate.models)
+
+    def test_simulate_through_work_queue(self):
+        with tempfile.TemporaryDirectory() as queue_dir:
+            surrogate = Surrogate(['tax_rate'], base_params=SMALL_RUN, queue_dir=queue_dir, local_workers=1, poll_interval=0.05)
+            surrogate.simulate([{'tax_rate': 0.0}])
+            surrogate.simulate([{'tax_rate': 0.05}])
+        expected = evaluate_points([{'tax_rate': 0.0}, {'tax_rate': 0.05}], SMALL_RUN)
+        np.testing.assert_array_equal(surrogate.y, expected)
+
+if __name__ == '__main__':
+    unittest.main()
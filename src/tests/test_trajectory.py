@@ -0,0 +1,99 @@
+"""
+Unit tests for the trajectory module.
+
+This module contains tests for the headless data pass used by the
+animations. It verifies that recorded trajectories have consistent shapes,
+that balances and alive masks agree with the simulation's own bookkeeping,
+and that positions, colors and interpolation behave as the renderer expects.
+
+Tests cover:
+- Trajectory array shapes and dtypes
+- Bankrupt agents recorded as NaN / not alive
+- Entrants recorded in their own columns, never reviving a bankrupt agent
+- Wealth bracket color codes
+- Position bounds of the random walk
+- Frame interpolation and .npz round trips
+- Fixed-size distribution summaries for population-scale renders
+"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.trajectory import record_trajectory, distribution_summary, wealth_color_codes, interpolate_frame, save_trajectory, load_trajectory, POSITION_BOUNDS, WEALTH_POOR, WEALTH_MIDDLE, WEALTH_RICH
+
+class TestTrajectory(unittest.TestCase):
+
+    def setUp(self):
+        self.trajectory = record_trajectory({'num_agents': 20, 'seed': 1}, num_steps=10)
+
+    def test_shapes(self):
+        self.assertEqual(self.trajectory['balances'].shape, (11, 20))
+        self.assertEqual(self.trajectory['alive'].shape, (11, 20))
+        self.assertEqual(self.trajectory['colors'].dtype, np.int8)
+        self.assertEqual(self.trajectory['positions'].shape, (11, 20, 2))
+        self.assertEqual(len(self.trajectory['step_metrics']), 10)
+
+    def test_alive_matches_step_metrics(self):
+        alive_counts = self.trajectory['alive'].sum(axis=1)
+        self.assertEqual(alive_counts[0], 20)
+        self.assertEqual(list(alive_counts[1:]), [m['agents_alive'] for m in self.trajectory['step_metrics']])
+        self.assertTrue(np.all(np.isnan(self.trajectory['balances'][~self.trajectory['alive']])))
+
+    def test_bankrupt_agents_stay_removed(self):
+        trajectory = record_trajectory({'num_agents': 10, 'seed': 2, 'tax_rate': 0.0, 'agent_expense_rate': 5.0}, num_steps=5)
+        alive = trajectory['alive']
+        self.assertTrue(np.all(alive[1:] <= alive[:-1]))
+
+    def test_entrants_get_their_own_columns(self):
+        params = {'engine': 'vectorized', 'num_agents': 30, 'seed': 0, 'agent_expense_rate': 3.0, 'agent_type_shares': [1, 1, 1, 1, 1], 'agent_entry_rate': 0.05}
+        trajectory = record_trajectory(params, num_steps=200, with_positions=False)
+        alive = trajectory['alive']
+        final_metrics = trajectory['step_metrics'][-1]
+        self.assertGreater(alive.shape[1], 30)
+        self.assertEqual(alive[-1].sum(), final_metrics['agents_alive'])
+        entered = np.argmax(alive, axis=0)
+        for column in range(alive.shape[1]):
+            lifetime = alive[entered[column]:, column]
+            self.assertTrue(np.all(lifetime[1:] <= lifetime[:-1]))
+
+    def test_wealth_color_codes(self):
+        codes = wealth_color_codes(np.array([-10.0, 500.0, 500.5, 1000.0, 1000.5]))
+        self.assertEqual(list(codes), [WEALTH_POOR, WEALTH_POOR, WEALTH_MIDDLE, WEALTH_MIDDLE, WEALTH_RICH])
+
+    def test_positions_within_bounds(self):
+        positions = self.trajectory['positions']
+        for axis, (low, high) in enumerate(POSITION_BOUNDS):
+            self.assertTrue(np.all(positions[..., axis] >= low))
+            self.assertTrue(np.all(positions[..., axis] <= high))
+
+    def test_interpolate_frame(self):
+        array = np.array([[0.0, 10.0], [2.0, 20.0]])
+        np.testing.assert_allclose(interpolate_frame(array, 0.25), [0.5, 12.5])
+        np.testing.assert_allclose(interpolate_frame(array, 5.0), [2.0, 20.0])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "trajectory.npz")
+            save_trajectory(path, self.trajectory)
+            loaded = load_trajectory(path)
+        self.assertEqual(set(loaded), {'balances', 'alive', 'colors', 'prices', 'loads', 'positions'})
+        np.testing.assert_array_equal(loaded['colors'], self.trajectory['colors'])
+
+    def test_distribution_summary(self):
+        summary = distribution_summary(self.trajectory['balances'], self.trajectory['alive'], num_bins=8, num_points=16)
+        self.assertEqual(summary['edges'].shape, (9,))
+        self.assertEqual(summary['counts'].shape, (11, 8))
+        self.assertEqual(summary['quantiles'].shape, (11, 16))
+        np.testing.assert_array_equal(summary['counts'].sum(axis=1), summary['alive_count'])
+        np.testing.assert_allclose(summary['density'].sum(axis=1), 1.0)
+        self.assertTrue(np.all(np.diff(summary['quantiles'], axis=1) >= 0))
+
+    def test_summary_size_is_independent_of_population(self):
+        trajectory = record_trajectory({'num_agents': 500, 'seed': 3}, num_steps=2, with_positions=False)
+        self.assertNotIn('positions', trajectory)
+        summary = distribution_summary(trajectory['balances'], trajectory['alive'], num_bins=8, num_points=16)
+        self.assertEqual(summary['counts'].shape, (3, 8))
+        self.assertEqual(summary['quantiles'].shape, (3, 16))
+
+if __name__ == '__main__':
+    unittest.main()
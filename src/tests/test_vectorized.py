@@ -0,0 +1,150 @@
+"""
+Unit tests for the vectorized module.
+
+This module contains tests for the array-backed simulation engine. It checks
+the vectorized allocation against a request-by-request implementation of
+the reference semantics, verifies that the per-type tables are gathered for
+the right agents, and compares whole runs with the reference engine.
+
+Tests cover:
+- Allocation amounts and payments against a sequential implementation
+- Population initialization, type assignment and removal
+- Per-type income, expense and bankruptcy thresholds
+- Bankruptcy thresholds that follow the bankruptcy_threshold parameter
+- Run results and agreement with the reference engine
+- Float32 state and the float32/float64 drift check
+- Agent entry into freed slots with reused IDs
+- Per-step Gini and median through the incremental inequality tracker
+"""
+import unittest
+import numpy as np
+from src.config import effective_config
+from src.simulation import run_simulation
+from src.vectorized import Population, ResourcePool, TypeTable, allocate_requests, precision_drift
+
+def sequential_allocation(balance, demand, price, availability, order):
+    agent_idx, resource_idx = np.nonzero(demand > 0)
+    remaining = availability.copy()
+    allocated = np.zeros(len(price))
+    for j in order:
+        agent, resource = agent_idx[j], resource_idx[j]
+        amount = min(demand[agent, resource], max(remaining[resource], 0.0))
+        remaining[resource] -= amount
+        allocated[resource] += amount
+        cost = amount * price[resource]
+        if balance[agent] >= cost:
+            balance[agent] -= cost
+    return allocated
+
+class TestVectorized(unittest.TestCase):
+
+    def test_allocation_matches_sequential_service(self):
+        rng = np.random.default_rng(0)
+        balance = rng.uniform(0, 3, size=200)
+        demand = np.where(rng.uniform(size=(200, 3)) < 0.7, rng.uniform(0, 1, size=(200, 3)), 0.0)
+        price = np.array([1.0, 2.0, 1.5])
+        availability = np.array([40.0, 200.0, 10.0])
+        expected_balance = balance.copy()
+        order = np.random.default_rng(7).permutation(np.count_nonzero(demand))
+        expected = sequential_allocation(expected_balance, demand, price, availability, order)
+        allocated = allocate_requests(balance, demand, price, availability, np.random.default_rng(7))
+        np.testing.assert_allclose(allocated, expected)
+        np.testing.assert_allclose(balance, expected_balance)
+
+    def test_allocation_without_requests(self):
+        balance = np.ones(4)
+        allocated = allocate_requests(balance, np.zeros((4, 3)), np.ones(3), np.ones(3), np.random.default_rng(0))
+        np.testing.assert_array_equal(allocated, np.zeros(3))
+        np.testing.assert_array_equal(balance, np.ones(4))
+
+    def test_population_initialize_and_keep(self):
+        config = effective_config({'num_agents': 1000, 'agent_type_shares': [0.5, 0.5, 0.0, 0.0, 0.0]})
+        population = Population.initialize(config, np.random.default_rng(0))
+        self.assertEqual(len(population), 1000)
+        self.assertEqual(set(np.unique(population.type_code)), {0, 1})
+        self.assertEqual(population.balance[0], 2 * config['initial_ctx_balance'])
+        population.keep(population.type_code == 0)
+        self.assertTrue(np.all(population.type_code == 0))
+        self.assertEqual(len(population.agent_id), len(population))
+
+    def test_per_type_tables(self):
+        params = {'engine': 'vectorized', 'num_agents': 200, 'simulation_steps': 1, 'seed': 0, 'initial_imbalance': False,
+                  'agent_type_shares': [0.5, 0.5, 0.0, 0.0, 0.0],
+                  'agent_type_bankruptcy_multiplier': [1.0, -20.0, 1.0, 1.0, 1.0]}
+        results = run_simulation(params)
+        self.assertGreater(results['num_bankruptcies'], 50)
+        self.assertLess(results['num_bankruptcies'], 150)
+
+    def test_bankruptcy_threshold_param(self):
+        params = {'engine': 'vectorized', 'num_agents': 100, 'simulation_steps': 1, 'seed': 0}
+        self.assertEqual(run_simulation(params)['num_bankruptcies'], 0)
+        raised = run_simulation(dict(params, bankruptcy_threshold=100))['num_bankruptcies']
+        self.assertGreater(raised, 20)
+        self.assertEqual(raised, run_simulation(dict(params, agent_type_bankruptcy_multiplier=[-2.0, 1.0, 1.0, 1.0, 1.0]))['num_bankruptcies'])
+        types = TypeTable(effective_config({'bankruptcy_threshold': 20}))
+        np.testing.assert_allclose(types.bankruptcy_threshold, [20.0, 12.0, 20.0, 40.0, 32.0])
+
+    def test_run_matches_reference_engine(self):
+        reference = [run_simulation({'seed': seed, 'simulation_steps': 50})['avg_final_balance'] for seed in range(5)]
+        vectorized = [run_simulation({'engine': 'vectorized', 'seed': seed, 'simulation_steps': 50})['avg_final_balance'] for seed in range(5)]
+        self.assertAlmostEqual(np.mean(vectorized), np.mean(reference), delta=1.0)
+
+    def test_mixed_population_runs(self):
+        results = run_simulation({'engine': 'vectorized', 'seed': 1, 'num_agents': 500, 'simulation_steps': 20, 'agent_type_shares': [1, 1, 1, 1, 1]})
+        self.assertEqual(results['step_metrics']['step'], 19)
+        self.assertIn('gini_coefficient', results)
+
+    def test_float32_state(self):
+        config = effective_config({'precision': 'float32'})
+        population = Population.initialize(config, np.random.default_rng(0))
+        self.assertEqual(population.balance.dtype, np.float32)
+        self.assertEqual(population.preference.dtype, np.float32)
+        self.assertEqual(ResourcePool(config).price.dtype, np.float32)
+        with self.assertRaises(ValueError):
+            Population.initialize(effective_config({'precision': 'float16'}), np.random.default_rng(0))
+
+    def test_precision_drift(self):
+        report = precision_drift({'num_agents': 200, 'simulation_steps': 50, 'agent_type_shares': [1, 1, 1, 1, 1]}, seeds=[0, 1])
+        self.assertTrue(report['within_tolerance'])
+        self.assertEqual(len(report['gini_coefficient']['float32']), 2)
+        self.assertNotEqual(report['avg_final_balance']['float32'], report['avg_final_balance']['float64'])
+        self.assertLess(report['avg_final_balance']['drift'], 1e-4)
+
+    def test_spawn_reuses_freed_slots(self):
+        config = effective_config({'num_agents': 10})
+        rng = np.random.default_rng(0)
+        population = Population.initialize(config, rng)
+        buffer = population.buffers['balance']
+        population.keep(population.agent_id % 4 != 1)
+        self.assertEqual(population.num_free, 3)
+        self.assertEqual(population.spawn(5, config, rng), 3)
+        self.assertEqual(len(population), 10)
+        np.testing.assert_array_equal(np.sort(population.agent_id), np.arange(10))
+        np.testing.assert_array_equal(population.balance[-3:], config['initial_ctx_balance'])
+        self.assertTrue(np.shares_memory(population.balance, buffer))
+        self.assertEqual((population.num_removed, population.num_entered, population.num_free), (3, 3, 0))
+        np.testing.assert_array_equal(population.in_network(), population.agent_id % 4 != 1)
+
+    def test_agent_entry(self):
+        params = {'engine': 'vectorized', 'seed': 0, 'num_agents': 200, 'simulation_steps': 600, 'agent_expense_rate': 1.0, 'agent_type_shares': [1, 1, 1, 1, 1]}
+        shrinking = run_simulation(params)
+        self.assertLess(shrinking['step_metrics']['agents_alive'], 100)
+        self.assertEqual(shrinking['num_bankruptcies'], 200 - shrinking['step_metrics']['agents_alive'])
+        churned = run_simulation(dict(params, agent_entry_rate=0.02))
+        self.assertEqual(churned['step_metrics']['agents_alive'], 200)
+        self.assertGreater(churned['num_bankruptcies'], 50)
+        self.assertAlmostEqual(churned['step_metrics']['bankruptcy_rate'], 200 / (200 + churned['num_bankruptcies']))
+
+    def test_tracked_inequality_metrics(self):
+        params = {'engine': 'vectorized', 'seed': 0, 'num_agents': 300, 'simulation_steps': 300, 'agent_expense_rate': 1.5, 'agent_entry_rate': 0.02}
+        exact, tracked = [], []
+        run_simulation(params, on_step=exact.append)
+        results = run_simulation(dict(params, inequality_bins=4096), on_step=tracked.append)
+        self.assertGreater(results['num_bankruptcies'], 0)
+        self.assertEqual(len(tracked), len(exact))
+        for expected, actual in zip(exact, tracked):
+            self.assertAlmostEqual(actual['gini'], expected['gini'], delta=1e-3)
+            self.assertAlmostEqual(actual['median_balance'], expected['median_balance'], delta=1e-2 * max(1.0, abs(expected['median_balance'])))
+
+if __name__ == '__main__':
+    unittest.main()
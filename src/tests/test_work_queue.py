@@ -0,0 +1,73 @@
+"""
+Unit tests for the work_queue module.
+
+This module contains tests for the file-based work queue used to distribute
+parameter sweeps. It verifies that items are claimed exactly once, that
+result shards are written atomically, and that claims abandoned by crashed
+workers are re-leased after their heartbeat expires.
+
+Tests cover:
+- Enqueueing and de-duplication of work items
+- Atomic claiming and completion
+- Stale lease detection and re-leasing
+- Conversion of NumPy values to JSON
+"""
+import os
+import tempfile
+import time
+import unittest
+import numpy as np
+from src.work_queue import WorkQueue, to_jsonable
+
+class TestWorkQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.queue = WorkQueue(self.tmp_dir.name, lease_seconds=5.0)
+        self.items = [{'id': f"tax_rate-{i:04d}-0000", 'params': {'tax_rate': 0.01 * i}} for i in range(3)]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_enqueue_skips_duplicates(self):
+        self.assertEqual(self.queue.enqueue(self.items), 3)
+        self.assertEqual(self.queue.enqueue(self.items), 0)
+        self.assertEqual(self.queue.num_pending(), 3)
+
+    def test_claim_and_complete(self):
+        self.queue.enqueue(self.items)
+        claimed_ids = []
+        while True:
+            claimed = self.queue.claim("worker-a")
+            if claimed is None:
+                break
+            claim_path, item = claimed
+            claimed_ids.append(item['id'])
+            self.queue.complete(claim_path, item, {'num_bankruptcies': np.int64(1)})
+        self.assertEqual(sorted(claimed_ids), [item['id'] for item in self.items])
+        self.assertTrue(self.queue.is_complete(claimed_ids))
+        self.assertEqual(self.queue.num_claimed(), 0)
+        shards = self.queue.load_results()
+        self.assertEqual(len(shards), 3)
+        self.assertEqual(shards[0]['result']['num_bankruptcies'], 1)
+        self.assertEqual(self.queue.enqueue(self.items), 0)
+
+    def test_requeue_stale(self):
+        self.queue.enqueue(self.items[:1])
+        claim_path, item = self.queue.claim("crashed-worker")
+        self.assertEqual(self.queue.requeue_stale(), 0)
+        stale_time = time.time() - 10.0
+        os.utime(claim_path, (stale_time, stale_time))
+        self.assertEqual(self.queue.requeue_stale(), 1)
+        self.assertEqual(self.queue.num_pending(), 1)
+        self.assertEqual(self.queue.num_claimed(), 0)
+        _, reclaimed = self.queue.claim("worker-b")
+        self.assertEqual(reclaimed['id'], item['id'])
+
+    def test_to_jsonable(self):
+        value = to_jsonable({'a': np.float64(1.5), 'b': [np.int64(2), np.array([1.0, 2.0])]})
+        self.assertEqual(value, {'a': 1.5, 'b': [2, [1.0, 2.0]]})
+        self.assertIsInstance(value['a'], float)
+
+if __name__ == '__main__':
+    unittest.main()
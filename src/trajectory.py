@@ -0,0 +1,206 @@
+"""
+Headless trajectory recording for the simulation animations.
+
+This module runs the simulation without any rendering and records everything
+an animation needs into compact NumPy arrays indexed by frame and agent ID.
+Renderers then only interpolate over these arrays, so the cost of a render
+scales with the number of frames rather than with per-step object creation,
+and the simulation itself never has to wait for the renderer.
+
+Recorded arrays (T steps, n agents, including agents that entered during the
+run; an entrant gets its own column even when it reuses a bankrupt agent's ID):
+- balances: (T + 1, n) float64, NaN before an agent enters and once it has gone bankrupt
+- alive: (T + 1, n) bool
+- prices, loads: (T + 1, num_resources) float64 resource prices and loads
+- colors: (T + 1, n) int8 wealth bracket codes (see wealth_color_codes)
+- positions: (T + 1, n, 2) float32 random-walk screen positions
+
+For population-scale visualizations, distribution_summary reduces the
+balance array to fixed-size per-frame histograms and quantile curves, so
+rendering cost no longer depends on the number of agents at all.
+
+Trajectories can be saved to and loaded from ``.npz`` files so that the data
+pass and the render can run in separate processes.
+"""
+import random
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+
+from .config import effective_config
+from .constants import NUM_AGENTS, NUM_RESOURCES, SIMULATION_STEPS, INITIAL_IMBALANCE, IMBALANCE_STRENGTH, ENGINE
+from .helpers import get_agent_balances, get_resource_load_and_prices
+from .models import Resource
+from .network import build_trade_network
+from .policy import PolicySchedule
+from .simulation import initialize_agents, simulation_step
+from .vectorized import Population, ResourcePool, TypeTable, inequality_tracker, vectorized_step
+
+WEALTH_COLOR_THRESHOLDS: Tuple[float, float] = (500.0, 1000.0)
+WEALTH_POOR: int = 0
+WEALTH_MIDDLE: int = 1
+WEALTH_RICH: int = 2
+INITIAL_POSITION_BOUNDS: Tuple[Tuple[float, float], Tuple[float, float]] = ((-4.0, 4.0), (-2.0, 2.0))
+POSITION_BOUNDS: Tuple[Tuple[float, float], Tuple[float, float]] = ((-6.0, 6.0), (-3.0, 3.0))
+MOVE_STEP: float = 0.5
+DEFAULT_HISTOGRAM_BINS: int = 60
+DEFAULT_CLOUD_POINTS: int = 2000
+
+def wealth_color_codes(balances: np.ndarray) -> np.ndarray:
+    """Maps balances to WEALTH_POOR (<= 500), WEALTH_MIDDLE (<= 1000) or WEALTH_RICH."""
+    return np.searchsorted(WEALTH_COLOR_THRESHOLDS, balances, side='left').astype(np.int8)
+
+def random_walk_positions(num_agents: int, num_steps: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Generates clipped random-walk screen positions for every agent and frame.
+
+    Args:
+        num_agents (int): The number of agents.
+        num_steps (int): The number of simulation steps; num_steps + 1 frames are generated.
+        rng (np.random.Generator): The random number generator to draw moves from.
+
+    Returns:
+        np.ndarray: A (num_steps + 1, num_agents, 2) float32 array of x/y positions.
+    """
+    low = np.array([bounds[0] for bounds in POSITION_BOUNDS])
+    high = np.array([bounds[1] for bounds in POSITION_BOUNDS])
+    positions = np.empty((num_steps + 1, num_agents, 2), dtype=np.float32)
+    positions[0] = rng.uniform([b[0] for b in INITIAL_POSITION_BOUNDS], [b[1] for b in INITIAL_POSITION_BOUNDS], size=(num_agents, 2))
+    moves = rng.uniform(-MOVE_STEP, MOVE_STEP, size=(num_steps, num_agents, 2))
+    for step in range(num_steps):
+        positions[step + 1] = np.clip(positions[step] + moves[step], low, high)
+    return positions
+
+def record_trajectory(params: Dict[str, Any], num_steps: Optional[int] = None, with_positions: bool = True) -> Dict[str, Any]:
+    """
+    Runs the simulation headlessly and records a per-frame trajectory.
+
+    Args:
+        params (Dict[str, Any]): Simulation parameters, as accepted by run_simulation, including
+            'engine': 'vectorized' for population-scale runs.
+        num_steps (Optional[int]): Number of steps to record; defaults to the run's simulation_steps.
+        with_positions (bool): Whether to generate per-agent screen positions; population-scale
+            renders only need the balances.
+
+    Returns:
+        Dict[str, Any]: The trajectory arrays ('balances', 'alive', 'colors', 'prices', 'loads' and,
+            if requested, 'positions') plus the list of per-step metrics under 'step_metrics'.
+    """
+    seed = params.get('seed')
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+    num_agents = params.get('num_agents', NUM_AGENTS)
+    if num_steps is None:
+        num_steps = params.get('simulation_steps', SIMULATION_STEPS)
+
+    policy = PolicySchedule(params, num_steps)
+    balances = np.full((num_steps + 1, num_agents), np.nan)
+    step_metrics = []
+    if params.get('engine', ENGINE) == 'vectorized':
+        config = effective_config(params)
+        rng = np.random.default_rng(seed)
+        population = Population.initialize(config, rng)
+        resource_pool, types = ResourcePool(config), TypeTable(config)
+        network = build_trade_network(config, rng=rng)
+        tracker = inequality_tracker(config, population)
+        prices, loads = np.empty((num_steps + 1, config['num_resources'])), np.empty((num_steps + 1, config['num_resources']))
+        balances[0] = population.balance
+        prices[0], loads[0] = resource_pool.price, resource_pool.load
+        column = np.arange(num_agents)
+        num_columns = num_agents
+        for step in range(num_steps):
+            num_entered = population.num_entered
+            step_metrics.append(vectorized_step(population, resource_pool, types, config, step, policy, rng, network, tracker))
+            entered = population.num_entered - num_entered
+            if entered:
+                if num_columns + entered > balances.shape[1]:
+                    balances = np.concatenate((balances, np.full((num_steps + 1, max(balances.shape[1], entered)), np.nan)), axis=1)
+                column[population.agent_id[-entered:]] = np.arange(num_columns, num_columns + entered)
+                num_columns += entered
+            balances[step + 1, column[population.agent_id]] = population.balance
+            prices[step + 1], loads[step + 1] = resource_pool.price, resource_pool.load
+        balances = balances[:, :num_columns]
+    else:
+        agents = initialize_agents(num_agents, params.get('initial_imbalance', INITIAL_IMBALANCE), params.get('imbalance_strength', IMBALANCE_STRENGTH))
+        resources = [Resource(i) for i in range(NUM_RESOURCES)]
+        network = build_trade_network(params, num_agents)
+        prices, loads = np.empty((num_steps + 1, NUM_RESOURCES)), np.empty((num_steps + 1, NUM_RESOURCES))
+        balances[0] = get_agent_balances(agents)
+        prices[0], loads[0] = get_resource_load_and_prices(resources)
+        for step in range(num_steps):
+            step_metrics.append(simulation_step(agents, resources, step, params, policy, network))
+            agent_ids = [agent.agent_id for agent in agents]
+            balances[step + 1, agent_ids] = get_agent_balances(agents)
+            prices[step + 1], loads[step + 1] = get_resource_load_and_prices(resources)
+
+    alive = ~np.isnan(balances)
+    trajectory = {
+        'balances': balances,
+        'alive': alive,
+        'colors': np.where(alive, wealth_color_codes(balances), WEALTH_POOR).astype(np.int8),
+        'prices': prices,
+        'loads': loads,
+        'step_metrics': step_metrics
+    }
+    if with_positions:
+        trajectory['positions'] = random_walk_positions(balances.shape[1], num_steps, np.random.default_rng(seed))
+    return trajectory
+
+def distribution_summary(balances: np.ndarray, alive: np.ndarray, num_bins: int = DEFAULT_HISTOGRAM_BINS, num_points: int = DEFAULT_CLOUD_POINTS) -> Dict[str, np.ndarray]:
+    """
+    Reduces a recorded balance array to fixed-size per-frame distribution summaries.
+
+    Args:
+        balances (np.ndarray): A (T + 1, n) balance array, NaN for removed agents.
+        alive (np.ndarray): The matching (T + 1, n) alive mask.
+        num_bins (int): Number of histogram bins, shared by every frame.
+        num_points (int): Number of evenly spaced quantiles per frame, used as a point cloud.
+
+    Returns:
+        Dict[str, np.ndarray]: 'edges' (num_bins + 1), per-frame 'counts' and 'density' (T + 1, num_bins),
+            'quantile_levels' (num_points), per-frame 'quantiles' (T + 1, num_points) and 'alive_count' (T + 1).
+    """
+    num_frames = len(balances)
+    alive_count = alive.sum(axis=1)
+    if alive.any():
+        low, high = float(np.nanmin(balances)), float(np.nanmax(balances))
+    else:
+        low, high = 0.0, 1.0
+    if high <= low:
+        high = low + 1.0
+    edges = np.linspace(low, high, num_bins + 1)
+    counts = np.zeros((num_frames, num_bins), dtype=np.int64)
+    quantile_levels = (np.arange(num_points) + 0.5) / num_points
+    quantiles = np.full((num_frames, num_points), np.nan)
+    for frame in range(num_frames):
+        frame_balances = balances[frame][alive[frame]]
+        if not len(frame_balances):
+            continue
+        counts[frame] = np.histogram(frame_balances, bins=edges)[0]
+        quantiles[frame] = np.quantile(frame_balances, quantile_levels)
+    density = counts / np.maximum(alive_count, 1)[:, None]
+    return {
+        'edges': edges,
+        'counts': counts,
+        'density': density,
+        'quantile_levels': quantile_levels,
+        'quantiles': quantiles,
+        'alive_count': alive_count
+    }
+
+def interpolate_frame(array: np.ndarray, frame: float) -> np.ndarray:
+    """Linearly interpolates a per-frame array at a fractional frame index."""
+    frame = min(max(frame, 0.0), len(array) - 1)
+    lower = int(np.floor(frame))
+    upper = min(lower + 1, len(array) - 1)
+    weight = frame - lower
+    return (1 - weight) * array[lower] + weight * array[upper]
+
+def save_trajectory(path: str, trajectory: Dict[str, Any]) -> None:
+    """Saves the trajectory arrays (without step metrics) to a compressed .npz file."""
+    np.savez_compressed(path, **{key: value for key, value in trajectory.items() if isinstance(value, np.ndarray)})
+
+def load_trajectory(path: str) -> Dict[str, np.ndarray]:
+    """Loads trajectory arrays saved by save_trajectory."""
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
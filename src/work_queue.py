@@ -0,0 +1,186 @@
+"""
+File-based work queue for distributing parameter sweeps across machines.
+
+This module implements a lease-based work queue on top of a shared directory
+(for example an NFS mount or a local directory shared by several worker
+processes). It relies only on atomic ``os.rename``/``os.replace`` within a
+single filesystem, so it needs no server, database or lock manager.
+
+Queue layout:
+- ``pending/<item_id>.json``: work items waiting to be claimed
+- ``claimed/<item_id>.<worker_id>.json``: items leased by a worker; the file
+  modification time acts as the lease heartbeat
+- ``results/<item_id>.json``: one result shard per completed item
+
+Workers that crash leave their claim behind; once its heartbeat is older than
+the lease timeout, ``requeue_stale`` moves it back to ``pending`` so another
+worker can pick it up.
+"""
+import json
+import logging
+import os
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+DEFAULT_LEASE_SECONDS: float = 60.0
+
+def to_jsonable(value: Any) -> Any:
+    """Converts NumPy scalars and arrays (possibly nested) into JSON-serializable values."""
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Writes JSON to a temporary file and renames it into place."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(to_jsonable(data), f)
+    os.replace(tmp_path, path)
+
+class WorkQueue:
+    """
+    Represents a work queue stored in a shared directory.
+    """
+    def __init__(self, root: str, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Initializes the queue, creating its directories if needed.
+
+        Args:
+            root (str): The shared queue directory.
+            lease_seconds (float): Seconds without a heartbeat after which a claim is considered stale.
+        """
+        self.root: Path = Path(root)
+        self.lease_seconds: float = lease_seconds
+        self.pending_dir: Path = self.root / "pending"
+        self.claimed_dir: Path = self.root / "claimed"
+        self.results_dir: Path = self.root / "results"
+        for directory in (self.pending_dir, self.claimed_dir, self.results_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _claimed_ids(self) -> set:
+        """Returns the ids of all currently claimed items."""
+        return {path.name.split(".", 1)[0] for path in self.claimed_dir.glob("*.json")}
+
+    def enqueue(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Adds work items to the queue, skipping items that are already queued or done.
+
+        Args:
+            items (List[Dict[str, Any]]): Work items, each with a unique 'id'.
+
+        Returns:
+            int: The number of items added.
+        """
+        claimed = self._claimed_ids()
+        added = 0
+        for item in items:
+            item_id = item["id"]
+            if item_id in claimed or (self.results_dir / f"{item_id}.json").exists() or (self.pending_dir / f"{item_id}.json").exists():
+                continue
+            _write_json_atomic(self.pending_dir / f"{item_id}.json", item)
+            added += 1
+        return added
+
+    def claim(self, worker_id: str) -> Optional[Tuple[Path, Dict[str, Any]]]:
+        """
+        Atomically claims the next pending item.
+
+        Args:
+            worker_id (str): An identifier for the claiming worker. Must not contain '.'.
+
+        Returns:
+            Optional[Tuple[Path, Dict[str, Any]]]: The claim file and the work item, or None if nothing is pending.
+        """
+        for pending_path in sorted(self.pending_dir.glob("*.json")):
+            claim_path = self.claimed_dir / f"{pending_path.stem}.{worker_id}.json"
+            try:
+                os.rename(pending_path, claim_path)
+            except FileNotFoundError:
+                continue
+            os.utime(claim_path)
+            with open(claim_path) as f:
+                return claim_path, json.load(f)
+        return None
+
+    def heartbeat(self, claim_path: Path) -> None:
+        """Renews the lease on a claimed item."""
+        try:
+            os.utime(claim_path)
+        except FileNotFoundError:
+            pass
+
+    def complete(self, claim_path: Path, item: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Writes the result shard for an item and releases its claim."""
+        _write_json_atomic(self.results_dir / f"{item['id']}.json", {"item": item, "result": result})
+        try:
+            os.remove(claim_path)
+        except FileNotFoundError:
+            pass
+
+    def requeue_stale(self) -> int:
+        """
+        Moves claims whose heartbeat is older than the lease timeout back to pending.
+
+        Returns:
+            int: The number of items re-leased.
+        """
+        now = time.time()
+        requeued = 0
+        for claim_path in self.claimed_dir.glob("*.json"):
+            item_id = claim_path.name.split(".", 1)[0]
+            try:
+                if now - claim_path.stat().st_mtime < self.lease_seconds:
+                    continue
+                if (self.results_dir / f"{item_id}.json").exists():
+                    os.remove(claim_path)
+                    continue
+                os.rename(claim_path, self.pending_dir / f"{item_id}.json")
+            except FileNotFoundError:
+                continue
+            logging.info(f"Re-leasing stale work item {item_id}")
+            requeued += 1
+        return requeued
+
+    def num_pending(self) -> int:
+        """Returns the number of pending items."""
+        return sum(1 for _ in self.pending_dir.glob("*.json"))
+
+    def num_claimed(self) -> int:
+        """Returns the number of claimed items."""
+        return sum(1 for _ in self.claimed_dir.glob("*.json"))
+
+    def is_complete(self, item_ids: List[str]) -> bool:
+        """Checks whether every given item has a result shard."""
+        return all((self.results_dir / f"{item_id}.json").exists() for item_id in item_ids)
+
+    def load_results(self, item_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Returns result shards as dicts with 'item' and 'result' keys.
+
+        Args:
+            item_ids (Optional[List[str]]): Only load the shards of these items, skipping any
+                without a result; None loads every shard in the queue.
+
+        Returns:
+            List[Dict[str, Any]]: The shards, sorted by item ID.
+        """
+        if item_ids is None:
+            shard_paths = sorted(self.results_dir.glob("*.json"))
+        else:
+            shard_paths = [self.results_dir / f"{item_id}.json" for item_id in sorted(set(item_ids))]
+        shards = []
+        for shard_path in shard_paths:
+            try:
+                with open(shard_path) as f:
+                    shards.append(json.load(f))
+            except FileNotFoundError:
+                continue
+        return shards